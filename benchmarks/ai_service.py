@@ -0,0 +1,69 @@
+"""
+Benchmark: KI-Dienst mit Prozess-Pool unter Last.
+
+Simuliert viele gleichzeitige Singleplayer-Spiele. Der "menschliche" Spieler
+zieht sofort (leichte KI im Hauptprozess), die Server-KI wird über den
+AIService angefragt. Ausgegeben werden Durchsatz (KI-Züge/s) und Latenzen.
+
+Aufruf: python3 benchmarks/ai_service.py [spiele] [züge] [worker]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.ai import AI
+from python_game.ai_service import AIService, apply_action
+from python_game.game import Game
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+async def play_match(service, index, turns):
+    random.seed(index)
+    difficulty = DIFFICULTIES[index % len(DIFFICULTIES)]
+    game = Game(game_mode="singleplayer", ai_difficulty=difficulty, headless=True)
+    human = AI(game.players[0], "easy")
+    human.debug = False
+    human.set_game(game)
+    for _ in range(turns):
+        if game._check_game_over():
+            break
+        with contextlib.redirect_stdout(io.StringIO()):
+            human.make_turn()
+            game.end_turn()
+        if game._check_game_over():
+            break
+        action = await service.request(game, difficulty)
+        with contextlib.redirect_stdout(io.StringIO()):
+            apply_action(game, action)
+            game.end_turn()
+
+async def run(matches, turns, workers, batch_size):
+    service = AIService(max_workers=workers, batch_size=batch_size)
+    start = time.perf_counter()
+    await asyncio.gather(*(play_match(service, index, turns) for index in range(matches)))
+    elapsed = time.perf_counter() - start
+    service.shutdown()
+    stats = service.stats()
+    stats["elapsed"] = elapsed
+    return stats
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 4
+    print(f"{matches} Spiele, {turns} Züge, {workers} Worker")
+    for batch_size in (1, 8):
+        stats = asyncio.run(run(matches, turns, workers, batch_size))
+        print(f"Bündelgröße {batch_size}: {stats['requests'] / stats['elapsed']:.0f} KI-Züge/s, "
+              f"{stats['batches']} Worker-Aufrufe, {stats['cache_hits']} Cache-Treffer, "
+              f"p50 {stats['latency_p50'] * 1000:.1f} ms, p95 {stats['latency_p95'] * 1000:.1f} ms, "
+              f"p99 {stats['latency_p99'] * 1000:.1f} ms, Deadline verpasst: {stats['deadline_misses']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: Kosten für das Erzeugen von Brettern und Spielen.
+
+Vergleicht das Erzeugen eines Bretts (geteiltes Terrain-Layout mit Fliegengewichten)
+mit dem bisherigen Aufbau, der pro Feld ein eigenes Terrain-Objekt samt Farb- und
+Symboltabellen anlegt, und misst zusätzlich komplette headless Spiele.
+
+Aufruf: python3 benchmarks/board_construction.py [anzahl]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.board import Board
+from python_game.game import Game
+from python_game.terrain import TerrainType
+
+class LegacyTerrain:
+    """Bisheriges Terrain: jedes Objekt baut seine Farb- und Symboltabellen selbst."""
+    def __init__(self, terrain_type):
+        self.terrain_type = terrain_type
+        self.color = {TerrainType.GRASS: (34, 139, 34), TerrainType.MOUNTAIN: (128, 128, 128),
+                      TerrainType.WATER: (0, 0, 255), TerrainType.FOREST: (0, 100, 0),
+                      TerrainType.HEALING: (135, 206, 235)}.get(terrain_type, (34, 139, 34))
+        self.symbol = {TerrainType.GRASS: "", TerrainType.MOUNTAIN: "X", TerrainType.WATER: "",
+                       TerrainType.FOREST: "", TerrainType.HEALING: "+"}.get(terrain_type, "")
+
+def legacy_board(size):
+    grid = [[None for _ in range(size)] for _ in range(size)]
+    terrain = [[LegacyTerrain(TerrainType.GRASS) for _ in range(size)] for _ in range(size)]
+    for x, y, terrain_type in ((4, 4, TerrainType.MOUNTAIN), (3, 3, TerrainType.MOUNTAIN), (5, 5, TerrainType.MOUNTAIN),
+                               (2, 2, TerrainType.WATER), (6, 6, TerrainType.WATER), (6, 2, TerrainType.WATER),
+                               (2, 6, TerrainType.WATER), (4, 1, TerrainType.FOREST), (4, 7, TerrainType.FOREST),
+                               (1, 4, TerrainType.FOREST), (7, 4, TerrainType.FOREST), (4, 0, TerrainType.HEALING),
+                               (4, 8, TerrainType.HEALING)):
+        terrain[y][x] = LegacyTerrain(terrain_type)
+    return grid, terrain
+
+def per_second(function, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return count / (time.perf_counter() - start)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for size in (9, 32):
+        legacy = per_second(lambda: legacy_board(size), max(1, count // (size // 9) ** 2))
+        shared = per_second(lambda: Board(size), count)
+        print(f"Brett {size}x{size}: bisher {legacy:,.0f}/s, geteiltes Layout {shared:,.0f}/s ({shared / legacy:.1f}x)")
+    games = per_second(lambda: Game(headless=True), max(1, count // 10))
+    print(f"Headless Spiele (Standardkarte): {games:,.0f}/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: Eröffnungsbuch und Endspieltabellen (books.py).
+
+Misst pro Abfrage
+- einen Buchzug in der Startstellung (Keyframe, Hash, Slot lesen),
+- einen Tabellenzug in einem Endspiel eine gegen eine Einheit (zwei Bytes lesen),
+- einen Tabellenzug in einem Endspiel zwei gegen eine Einheit (einen Block entpacken, alle Folgestellungen lesen),
+- den normalen Zug der KI "hard" in derselben Stellung ohne Buch und Tabelle (ohne Kopierzeit).
+Zusätzlich: Größe der Dateien und Zeit zum Einblenden.
+
+Aufruf: python3 benchmarks/books.py [aufrufe]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game import books
+from python_game.ai import AI
+from python_game.ai_service import restore_game, snapshot_game
+from python_game.game import Game
+
+def measure(function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def endgame_position(keep):
+    """
+    Endspiel mit den Einheiten keep (unit_ids pro Spieler), alle Spezialfähigkeiten verbraucht, der
+    Schwertkämpfer von Spieler 2 steht in der Ecke (0, 0). Bogenschütze gegen Schwertkämpfer gewinnt
+    in 5 Halbzügen, Schwertkämpfer und Bogenschütze gegen Schwertkämpfer schlagen in 5 Halbzügen.
+    """
+    game = Game(headless=True)
+    board = game.board
+    for player, kept in zip(game.players, keep):
+        for unit in list(player.units):
+            if unit.unit_id not in kept:
+                board.grid[unit.position[1]][unit.position[0]] = None
+                player.remove_unit(unit)
+            else:
+                unit.special_ability_used = True
+    board.move_unit(game.players[1].get_unit(3), 0, 0)
+    return game
+
+def heuristic_turn(snapshot, turn=True):
+    game = restore_game(snapshot)
+    if not turn:
+        return
+    ai = AI(game.players[game.current_turn], "hard")
+    ai.debug = False
+    ai.use_books = False
+    ai.set_game(game)
+    ai.make_turn()
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    start = time.perf_counter()
+    table = books.get_endgame_table()
+    table_2v1 = books.get_endgame_2v1()
+    book = books.get_opening_book()
+    loaded = (time.perf_counter() - start) * 1000
+    if table is None or table_2v1 is None or book is None:
+        print("Dateien fehlen, zuerst erzeugen: python3 -m python_game.books")
+        return
+    print(f"Eingeblendet in {loaded:.2f} ms: Tabelle {len(table.data)} Bytes, zwei gegen eins "
+          f"{len(table_2v1.data)} Bytes, Buch {len(book.data)} Bytes")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        opening = Game(headless=True)
+        endgame = endgame_position(((1,), (3,)))
+        endgame_2v1 = endgame_position(((0, 1), (3,)))
+    print(f"Startstellung: {books.book_move(opening)[1]}, Endspiel: {table.probe(endgame)}, "
+          f"zwei gegen eins: {table_2v1.probe(endgame_2v1)}")
+
+    print(f"{'Stellung':>12} {'Buch/Tabelle µs':>16} {'KI hard µs':>11}")
+    for name, game in (("Start", opening), ("Endspiel", endgame), ("2 gegen 1", endgame_2v1)):
+        snapshot = snapshot_game(game)
+        lookup = measure(lambda: books.book_move(game), calls)
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Zug ohne Buch auf einer Kopie der Stellung, abzüglich der Zeit für die Kopie
+            search = measure(lambda: heuristic_turn(snapshot), max(1, calls // 100)) \
+                - measure(lambda: heuristic_turn(snapshot, turn=False), max(1, calls // 100))
+        print(f"{name:>12} {lookup:>16.1f} {search:>11.1f}")
+
+if __name__ == "__main__":
+    main()
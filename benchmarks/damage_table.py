@@ -0,0 +1,55 @@
+"""
+Benchmark: vorberechnete Schadenstabelle (combat.DAMAGE_TABLE).
+
+Misst pro Vorhersage
+- den Tabellenzugriff (combat.lookup_damage),
+- die Berechnung über Modifikator, Schild und Terrain (combat.damage_taken mit base_damage),
+- Game.predict_attack ohne Cache (Reichweite, Sichtlinie, Pfeilregen und Schaden).
+
+Aufruf: python3 benchmarks/damage_table.py [aufrufe]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.combat import ATTACK, DAMAGE_TABLE, base_damage, damage_taken, lookup_damage
+from python_game.game import Game
+
+def measure(function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e9
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(headless=True)
+    board = game.board
+    pairs = [(attacker, target) for attacker in game.players[0].units for target in game.players[1].units]
+
+    def table():
+        for attacker, target in pairs:
+            lookup_damage(board, attacker, target)
+
+    def formula():
+        for attacker, target in pairs:
+            damage_taken(target, base_damage(attacker, target, ATTACK), board)
+
+    def prediction():
+        game._prediction_cache.clear()
+        for attacker, target in pairs:
+            game.predict_attack(attacker, target)
+
+    print(f"Tabelle: {len(DAMAGE_TABLE)} Einträge")
+    print(f"{'Variante':>18} {'ns pro Paar':>12}")
+    for name, function in (("Tabelle", table), ("Berechnung", formula), ("predict_attack", prediction)):
+        elapsed = measure(function, max(1, calls // len(pairs))) / len(pairs)
+        print(f"{name:>18} {elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: Stellungsdatenbank (dataset.py).
+
+Zeichnet einige Selbstspiele auf und misst
+- das Aufzeichnen (GameRecorder: Stellung erfassen, Datensätze packen),
+- das Schreiben vieler Datensätze in Shards (ShardWriter),
+- das Lesen in Blöcken über numpy.memmap (ohne Kopie) und
+- zufällige Stichproben (sample), jeweils in Datensätzen pro Sekunde.
+
+Aufruf: python3 benchmarks/dataset.py [datensätze]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+
+from python_game.ai import AI
+from python_game.dataset import DRAW, Dataset, GameRecorder, ShardWriter
+from python_game.game import Game
+
+def record_games(games):
+    """Selbstspiele (hard gegen medium) aufzeichnen: (Datensätze, Anzahl, Sekunden für das Aufzeichnen)."""
+    chunks = []
+    count = 0
+    recording = 0.0
+    for seed in range(games):
+        with contextlib.redirect_stdout(io.StringIO()):
+            random.seed(seed)
+            game = Game(headless=True, map_seed=seed)
+            ais = [AI(game.players[0], "hard"), AI(game.players[1], "medium")]
+            for ai in ais:
+                ai.debug = False
+                ai.set_game(game)
+            recorder = GameRecorder(game, seed, seed)
+            for _ in range(200):
+                if game._check_game_over():
+                    break
+                start = time.perf_counter()
+                recorder.before_turn()
+                recording += time.perf_counter() - start
+                ais[game.current_turn].make_turn()
+                recorder.after_turn()
+                game.end_turn()
+        start = time.perf_counter()
+        chunks.append(recorder.records(DRAW))
+        recording += time.perf_counter() - start
+        count += len(recorder._positions)
+    return b"".join(chunks), count, recording
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    records, count, recording = record_games(20)
+    print(f"Aufzeichnen: {count / recording:,.0f} Stellungen/s ({len(records) // count} Bytes pro Datensatz)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = ShardWriter(directory, "benchmark", records_per_shard=total // 4)
+        start = time.perf_counter()
+        while writer.records_written < total:
+            writer.write(records)
+        writer.close()
+        elapsed = time.perf_counter() - start
+        print(f"Schreiben: {writer.records_written / elapsed:,.0f} Datensätze/s, "
+              f"{writer.records_written * writer.record_size / elapsed / 1e6:.0f} MB/s")
+
+        dataset = Dataset(directory)
+        print(f"Datensatz: {len(dataset):,} Datensätze in {len(dataset.shards)} Shards")
+        start = time.perf_counter()
+        hp = 0
+        for batch in dataset.batches(4096):
+            hp += int(batch["unit_hp"].sum(dtype=numpy.int64))
+        elapsed = time.perf_counter() - start
+        print(f"Blöcke lesen: {len(dataset) / elapsed:,.0f} Datensätze/s")
+
+        rng = numpy.random.default_rng(1)
+        batches = 200
+        start = time.perf_counter()
+        for _ in range(batches):
+            dataset.sample(1024, rng)
+        elapsed = time.perf_counter() - start
+        print(f"Stichproben (1024): {batches * 1024 / elapsed:,.0f} Datensätze/s")
+        del dataset, batch
+
+if __name__ == "__main__":
+    main()
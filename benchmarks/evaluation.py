@@ -0,0 +1,75 @@
+"""
+Benchmark: inkrementelle Stellungsbewertung (evaluation.IncrementalEvaluator).
+
+Misst auf großen Spielen im Modus "multi" die Bewertung aller Einheiten eines Spielers
+- von Grund auf (jede Einheit gegen alle Gegner, wie bisher AI._evaluate_unit_position),
+- inkrementell nach einer einzelnen Bewegung (nur die bewegte Einheit und ihre Paare),
+- inkrementell ohne Änderung (nur Zustandsvergleich).
+Vor der Messung wird geprüft, dass beide Varianten dieselben Werte liefern.
+
+Aufruf: python3 benchmarks/evaluation.py [wiederholungen]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from multi_unit_turn import large_game
+from python_game.ai import AI
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(1)
+    print(f"{'Einheiten':>10} {'voll ms':>9} {'nach Zug ms':>12} {'unverändert ms':>15} {'neu bewertet':>13}")
+    for units_per_side, size in ((16, 32), (64, 64), (256, 128)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = large_game(units_per_side, size, 1)
+        ai = AI(game.players[0], "hard")
+        ai.debug = False
+        ai.set_game(game)
+        units = list(game.players[0].units)
+        evaluator = game.evaluator
+
+        for unit in units:
+            if evaluator.evaluate(unit) != ai._evaluate_unit_position_full(unit):
+                raise RuntimeError(f"Abweichung bei Einheit {unit.unit_id}")
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for unit in units:
+                ai._evaluate_unit_position_full(unit)
+        full = (time.perf_counter() - start) / repeats * 1000
+
+        moved = 0
+        incremental = 0.0
+        before = evaluator.units_recomputed
+        for _ in range(repeats):
+            unit = rng.choice(units)
+            targets = game.board.get_reachable_positions(unit)
+            if targets:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    game.board.move_unit(unit, *rng.choice(targets))
+                moved += 1
+            start = time.perf_counter()
+            evaluator.refresh()
+            for unit in units:
+                evaluator.score(unit)
+            incremental += time.perf_counter() - start
+        incremental = incremental / repeats * 1000
+        recomputed = (evaluator.units_recomputed - before) / max(1, moved)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            evaluator.refresh()
+            for unit in units:
+                evaluator.score(unit)
+        unchanged = (time.perf_counter() - start) / repeats * 1000
+        print(f"{2 * units_per_side:>10} {full:>9.2f} {incremental:>12.2f} {unchanged:>15.3f} {recomputed:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: Verlauf mit Rückgängig/Wiederholen (history.py).
+
+Spielt einige Partien (hard gegen medium) und misst
+- Rückgängig und Wiederholen über den ganzen Verlauf, pro Schritt,
+- einen Suchzug (alle Aktionen plus Passen) per make/unmake auf dem Spiel selbst
+  gegenüber Kopien per snapshot_game/restore_game (wie bisher in der Suche).
+
+Aufruf: python3 benchmarks/history.py [partien]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.actions import apply_action, legal_actions
+from python_game.ai import AI
+from python_game.ai_service import restore_game, snapshot_game
+from python_game.game import Game
+
+def play(seed):
+    random.seed(seed)
+    game = Game(headless=True, map_seed=seed)
+    ais = [AI(game.players[0], "hard"), AI(game.players[1], "medium")]
+    for ai in ais:
+        ai.debug = False
+        ai.set_game(game)
+    for _ in range(200):
+        if game._check_game_over():
+            break
+        ais[game.current_turn].make_turn()
+        game.end_turn()
+    return game
+
+def search_make_unmake(game):
+    history = game.history
+    with history.simulation():
+        for action in legal_actions(game) + [None]:
+            history.make(action)
+            history.unmake()
+
+def search_copies(game):
+    snapshot = snapshot_game(game)
+    for action in legal_actions(game) + [None]:
+        copy = restore_game(snapshot)
+        if action is not None:
+            apply_action(copy, action)
+        copy.end_turn()
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    undo = redo = 0.0
+    steps = 0
+    make_unmake = copies = 0.0
+    searches = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(games):
+            game = play(seed)
+            history = game.history
+            steps += len(history.undo_stack)
+            start = time.perf_counter()
+            while history.can_undo():
+                history.undo()
+            undo += time.perf_counter() - start
+            start = time.perf_counter()
+            while history.can_redo():
+                history.redo()
+            redo += time.perf_counter() - start
+
+            # Suchzüge in jeder zehnten Stellung der Partie
+            while history.can_undo():
+                if len(history.undo_stack) % 10 == 0 and not game._check_game_over():
+                    start = time.perf_counter()
+                    search_make_unmake(game)
+                    make_unmake += time.perf_counter() - start
+                    start = time.perf_counter()
+                    search_copies(game)
+                    copies += time.perf_counter() - start
+                    searches += 1
+                history.undo()
+    print(f"{steps} Schritte: Rückgängig {undo / steps * 1e6:.1f} µs, Wiederholen {redo / steps * 1e6:.1f} µs pro Schritt")
+    print(f"Suchzug ({searches} Stellungen): make/unmake {make_unmake / searches * 1000:.2f} ms, "
+          f"Kopien {copies / searches * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
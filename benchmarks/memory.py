@@ -0,0 +1,93 @@
+"""
+Benchmark: Speicherbedarf lebender Spiele.
+
+Misst mit tracemalloc
+- Bytes pro Einheit und Typ (Einheiten mit __slots__, ohne __dict__),
+- Bytes pro lebendem Standardspiel (headless, 9x9, 6 Einheiten),
+- Bytes pro lebendem großen Spiel (Modus "multi", erzeugte Karte, viele Einheiten),
+- remove_unit im Register des Spielers gegen list.remove (bisherige Einheitenliste).
+Gemeinsam genutzte Daten (Terrain-Analyse, Terrain-Flyweights) werden vorher geladen
+und zählen daher nicht zum einzelnen Spiel.
+
+Aufruf: python3 benchmarks/memory.py [spiele]
+"""
+import contextlib
+import gc
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from multi_unit_turn import large_game
+from python_game.game import Game
+from python_game.player import Player
+from python_game.units import Swordsman, Archer, Rider
+
+def bytes_per_object(create, count):
+    """Durchschnittlich belegte Bytes pro lebendem Objekt aus create()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Die Liste selbst nicht mitzählen
+    return (after - before - sys.getsizeof(objects)) / count
+
+def remove_timing(units_count, repeats):
+    player = Player(1, "Player 1")
+    units = []
+    for unit_id in range(units_count):
+        unit = Swordsman(player)
+        unit.unit_id = unit_id
+        units.append(unit)
+    removal_order = list(units)
+    random.Random(1).shuffle(removal_order)  # Einheiten fallen in beliebiger Reihenfolge
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for unit in units:
+            player.add_unit(unit)
+        for unit in removal_order:
+            player.remove_unit(unit)
+    registry = (time.perf_counter() - start) / repeats * 1e3
+    start = time.perf_counter()
+    for _ in range(repeats):
+        legacy = []
+        for unit in units:
+            legacy.append(unit)
+        for unit in removal_order:
+            legacy.remove(unit)  # Wie früher: Suche in der Liste, O(n)
+    legacy_time = (time.perf_counter() - start) / repeats * 1e3
+    return registry, legacy_time
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    player = Player(1, "Player 1")
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Gemeinsame Daten vorab laden (Analyse-Caches, Flyweights, Importe)
+        Game(headless=True)
+        large_game(64, 64, 1)
+
+        print_lines = []
+        for unit_class in (Swordsman, Archer, Rider):
+            size = bytes_per_object(lambda: unit_class(player), 10000)
+            print_lines.append(f"{unit_class.__name__:>10}: {size:7.0f} Bytes pro Einheit")
+        small = bytes_per_object(lambda: Game(headless=True), games)
+        large = bytes_per_object(lambda: large_game(64, 64, 1), max(1, games // 20))
+
+    for line in print_lines:
+        print(line)
+    print(f"Standardspiel 9x9, 6 Einheiten:      {small / 1024:8.1f} KiB pro Spiel")
+    print(f"Großes Spiel 64x64, 128 Einheiten:   {large / 1024:8.1f} KiB pro Spiel")
+    print(f"{'Einheiten':>10} {'Register ms':>12} {'list.remove ms':>15}")
+    for units_count in (100, 1000, 5000):
+        registry, legacy = remove_timing(units_count, 5)
+        print(f"{units_count:>10} {registry:>12.2f} {legacy:>15.2f}")
+
+if __name__ == "__main__":
+    main()
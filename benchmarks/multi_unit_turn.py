@@ -0,0 +1,88 @@
+"""
+Benchmark: KI im Modus "multi" (jede Einheit zieht und handelt pro Zug) mit großen Armeen.
+
+Stellt pro Seite viele Einheiten auf eine größere, prozedural erzeugte Karte und misst die Zeit pro KI-Zug
+- für die gemeinsame Planung (AI.make_turn mit geteilten Lagekarten) und
+- für den Einzelablauf, der für jede Einheit die Einheitenwahl und Bewertung des Modus
+  "single" wiederholt und dabei jedes Mal alle Gegner neu durchsucht.
+
+Aufruf: python3 benchmarks/multi_unit_turn.py [einheiten_pro_seite] [züge]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.ai import AI
+from python_game.game import Game
+from python_game.units import Swordsman, Archer, Rider
+
+def large_game(units_per_side, size, seed):
+    """Spiel im Modus "multi" mit units_per_side Einheiten pro Spieler auf einer erzeugten size x size Karte."""
+    rng = random.Random(seed)
+    game = Game(headless=True, turn_mode="multi", map_seed=seed, board_size=size)
+    board = game.board
+    unit_id = 0
+    for index, player in enumerate(game.players):
+        for unit in player.units:
+            board.grid[unit.position[1]][unit.position[0]] = None
+        player.clear_units()
+        rows = (0, 1) if index == 0 else (size - 1, size - 2)
+        cells = [(x, y) for y in rows for x in range(size)]
+        rng.shuffle(cells)
+        for x, y in cells[:units_per_side]:
+            unit = rng.choice([Swordsman, Archer, Rider])(player)
+            unit.unit_id = unit_id
+            unit_id += 1
+            player.add_unit(unit)
+            board.place_unit(unit, x, y)
+    return game
+
+def per_unit_turn(ai):
+    """Einzelablauf: für jede Einheit erneut Einheitenwahl und Bewertung wie im Modus "single"."""
+    remaining = [unit for unit in ai.player.units if unit.position is not None]
+    while remaining and not ai.game._check_game_over():
+        unit = ai._select_unit(remaining) or remaining[0]  # "hard" liefert bei nur negativen Bewertungen None
+        remaining.remove(unit)
+        ai._execute_unit_turn(unit)
+
+def play(units_per_side, size, turns, joint):
+    game = large_game(units_per_side, size, seed=1)
+    random.seed(1)
+    ais = [AI(player, "hard") for player in game.players]
+    for ai in ais:
+        ai.debug = False
+        ai.set_game(game)
+    elapsed = 0.0
+    played = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(turns):
+            if game._check_game_over():
+                break
+            ai = ais[game.current_turn]
+            start = time.perf_counter()
+            if joint:
+                ai.make_turn()
+            else:
+                per_unit_turn(ai)
+            elapsed += time.perf_counter() - start
+            played += 1
+            game.end_turn()
+    remaining = [len(player.units) for player in game.players]
+    return elapsed / max(1, played) * 1000, played, remaining
+
+def main():
+    units_per_side = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    size = max(9, units_per_side)
+    print(f"{units_per_side} Einheiten pro Seite, Brett {size}x{size}, {turns} Züge")
+    for label, joint in (("Einzelablauf", False), ("Gemeinsame Planung", True)):
+        per_turn, played, remaining = play(units_per_side, size, turns, joint)
+        print(f"{label}: {per_turn:.1f} ms pro Zug ({played} Züge, übrige Einheiten {remaining})")
+
+if __name__ == "__main__":
+    main()
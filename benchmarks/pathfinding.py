@@ -0,0 +1,83 @@
+"""
+Benchmark: gewichtete Wegfindung (pathfinding) auf großen Karten.
+
+Misst auf zufälligen Brettern mit Terrain und Einheiten
+- die Dijkstra-Flutfüllung mit dem Spielbudget und mit einem Budget über das ganze Brett,
+- die bisherige Breitensuche mit list.pop(0) (ungewichtet) zum Vergleich,
+- A* zu zufälligen Zielen gegen eine Flutfüllung über das ganze Brett.
+
+Aufruf: python3 benchmarks/pathfinding.py [aufrufe_pro_größe]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from reachability import random_board
+from python_game.pathfinding import flood_fill, find_path
+
+def bfs_pop_front(board, unit, max_distance):
+    """Bisherige Breitensuche aus Board.get_reachable_positions (ohne Terrain-Kosten)."""
+    start_x, start_y = unit.position
+    reachable = set()
+    visited = set()
+    queue = [(start_x, start_y, 0)]
+    while queue:
+        x, y, distance = queue.pop(0)
+        if (x, y) in visited:
+            continue
+        visited.add((x, y))
+        if distance >= max_distance:
+            continue
+        if distance > 0:
+            reachable.add((x, y))
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                new_x, new_y = x + dx, y + dy
+                if not (0 <= new_x < board.size and 0 <= new_y < board.size):
+                    continue
+                if board.grid[new_y][new_x] is not None:
+                    continue
+                if (new_x, new_y) not in visited:
+                    queue.append((new_x, new_y, distance + 1))
+    return list(reachable)
+
+def measure(function, calls):
+    start = time.perf_counter()
+    for index in range(calls):
+        function(index)
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(1)
+    print(f"{'Größe':>6} {'Spiel µs':>9} {'Brett µs':>10} {'BFS pop(0) µs':>14} {'A* µs':>8} {'Dijkstra→Ziel µs':>17}")
+    for size in (64, 128, 256):
+        board, units = random_board(size, rng)
+        whole_board = size * 4
+        repeats = max(1, calls * 64 // size // 8)
+        goals = [(rng.randrange(size), rng.randrange(size)) for _ in range(repeats)]
+
+        game_budget = measure(lambda index: flood_fill(board, units[index % len(units)]), calls)
+        board_budget = measure(lambda index: flood_fill(board, units[index % len(units)], whole_board), repeats)
+        bfs = measure(lambda index: bfs_pop_front(board, units[index % len(units)], whole_board), repeats)
+
+        # A* und Dijkstra müssen dieselben Wegkosten finden
+        for index, goal in enumerate(goals):
+            unit = units[index % len(units)]
+            path = find_path(board, unit, goal)
+            field = flood_fill(board, unit, whole_board)
+            if (path is None) != (goal not in field.costs) and goal != unit.position:
+                raise RuntimeError(f"Abweichung bei {unit.__class__.__name__} nach {goal}")
+        astar = measure(lambda index: find_path(board, units[index % len(units)], goals[index]), repeats)
+        dijkstra = measure(lambda index: flood_fill(board, units[index % len(units)], whole_board).path_to(*goals[index]),
+                           repeats)
+        print(f"{size:>6} {game_budget:>9.1f} {board_budget:>10.0f} {bfs:>14.0f} {astar:>8.0f} {dijkstra:>17.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: Erreichbarkeit per Bewegungsschablone gegen den vollständigen Brett-Scan.
+
+Erzeugt zufällige Bretter verschiedener Größe mit Terrain und Einheiten,
+prüft, dass beide Verfahren dieselben Felder liefern, und misst die Laufzeit.
+
+Aufruf: python3 benchmarks/reachability.py [aufrufe_pro_größe]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.board import Board
+from python_game.player import Player
+from python_game.terrain import TerrainType, TERRAIN_CODE
+from python_game.unit_defs import MOVE_ORTHOGONAL, MOVE_DIAGONAL
+from python_game.units import Swordsman, Archer, Rider
+
+def reachable_full_scan(board, unit):
+    """Bisheriges Verfahren: jedes Feld des Bretts gegen die Rautenregeln prüfen."""
+    start_x, start_y = unit.position
+    reachable = set()
+    movement_penalty = board.terrain[start_y][start_x].get_movement_penalty(unit)
+    orthogonal_range = max(0, MOVE_ORTHOGONAL[unit.type_index] - movement_penalty)
+    diagonal_range = max(0, MOVE_DIAGONAL[unit.type_index] - movement_penalty)
+    for x in range(board.size):
+        for y in range(board.size):
+            if (x, y) == (start_x, start_y):
+                continue
+            dist_x = abs(start_x - x)
+            dist_y = abs(start_y - y)
+            if dist_x == 0:
+                is_reachable = dist_y <= orthogonal_range
+            elif dist_y == 0:
+                is_reachable = dist_x <= orthogonal_range
+            elif dist_x == dist_y:
+                is_reachable = dist_x <= diagonal_range
+            else:
+                is_reachable = dist_x + dist_y <= orthogonal_range and max(dist_x, dist_y) <= diagonal_range
+            if is_reachable and board._is_path_clear(start_x, start_y, x, y) and board.terrain[y][x].is_passable(unit):
+                reachable.add((x, y))
+    return list(reachable)
+
+def random_board(size, rng):
+    board = Board(size)
+    terrain_types = [TerrainType.GRASS] * 6 + [TerrainType.MOUNTAIN, TerrainType.WATER, TerrainType.FOREST, TerrainType.HEALING]
+    board.set_terrain_codes(TERRAIN_CODE[rng.choice(terrain_types)] for _ in range(size * size))
+    players = [Player(1, "Player 1"), Player(2, "Player 2")]
+    units = []
+    for _ in range(max(6, size * size // 10)):
+        unit = rng.choice([Swordsman, Archer, Rider])(rng.choice(players))
+        x, y = rng.randrange(size), rng.randrange(size)
+        if board.grid[y][x] is None:
+            board.grid[y][x] = unit
+            unit.position = (x, y)
+            units.append(unit)
+    return board, units
+
+def measure(function, board, units, calls):
+    start = time.perf_counter()
+    for index in range(calls):
+        function(board, units[index % len(units)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(1)
+    print(f"{'Größe':>6} {'Scan µs':>9} {'Schablone µs':>13} {'Faktor':>7}")
+    for size in (9, 16, 32, 64):
+        board, units = random_board(size, rng)
+        for unit in units:
+            expected = reachable_full_scan(board, unit)
+            actual = board.get_reachable_positions_rhombus(unit, unit.movement_speed)
+            if expected != actual:
+                raise RuntimeError(f"Abweichung bei {unit.__class__.__name__} auf {unit.position}")
+        scan = measure(reachable_full_scan, board, units, max(1, calls // (size // 9 or 1)))
+        stencil = measure(lambda board, unit: board.get_reachable_positions_rhombus(unit, unit.movement_speed),
+                          board, units, calls)
+        print(f"{size:>6} {scan:>9.1f} {stencil:>13.1f} {scan / stencil:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: Zuschauer-Verteilung mit vielen simulierten Zuschauern.
+
+Spielt ein KI-gegen-KI-Spiel und verteilt jede Zustandsänderung an N Zuschauer.
+Ein Teil der Zuschauer ist langsam und holt nur selten ab (wird per Keyframe
+resynchronisiert). Gezeigt wird, dass die Kodierkosten pro Update konstant
+bleiben und nur die Verteilung mit der Zuschauerzahl wächst.
+
+Aufruf: python3 benchmarks/spectator_fanout.py [max_zuschauer]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.ai import AI
+from python_game.game import Game
+from python_game.protocol import DeltaApplier, capture_units
+from python_game.spectators import SpectatorHub
+
+SLOW_FRACTION = 0.1  # Anteil langsamer Zuschauer
+SLOW_INTERVAL = 40   # Langsame Zuschauer holen nur alle n Updates ab
+QUEUE_LIMIT = 16
+CHECKED_SPECTATORS = 20  # So viele Zuschauer wenden die Frames wirklich an
+
+class _ApplierView:
+    def __init__(self, applier):
+        self.players = applier.players
+
+def run(spectator_count, seed=1, max_turns=120):
+    random.seed(seed)
+    game = Game(game_mode="singleplayer", ai_difficulty="medium", headless=True)
+    opponent = AI(game.players[0], "medium")
+    opponent.set_game(game)
+
+    hub = SpectatorHub(game, queue_limit=QUEUE_LIMIT)
+    spectators = []
+    for index in range(spectator_count):
+        slow = index % int(1 / SLOW_FRACTION) == 0
+        applier = DeltaApplier(game.board.size, game.board.terrain_seed) if index < CHECKED_SPECTATORS else None
+        spectators.append((hub.subscribe(), slow, applier))
+
+    encode_time = 0.0
+    fanout_time = 0.0
+    # Encoder zeitlich messen, um Kodierung und Verteilung getrennt auszuweisen
+    encode = hub.encoder.encode
+    def timed_encode(force_keyframe=False):
+        nonlocal encode_time
+        start = time.perf_counter()
+        frame = encode(force_keyframe)
+        encode_time += time.perf_counter() - start
+        return frame
+    hub.encoder.encode = timed_encode
+
+    def on_change(_game):
+        nonlocal fanout_time
+        start = time.perf_counter()
+        hub.update()
+        for subscriber, slow, applier in spectators:
+            if slow and hub.updates % SLOW_INTERVAL:
+                continue
+            for frame in hub.take(subscriber):
+                if applier is not None and not applier.apply(frame.data):
+                    raise RuntimeError("Sequenzlücke trotz Keyframe-Resynchronisation")
+        fanout_time += time.perf_counter() - start
+
+    game.add_listener(on_change)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(max_turns):
+            if game._check_game_over():
+                break
+            (opponent if game.current_turn == 0 else game.ai).make_turn()
+            game.end_turn()
+
+    # Alle Zuschauer holen ein letztes Mal ab und müssen dann den Spielstand kennen
+    expected = capture_units(game)
+    mismatches = 0
+    for subscriber, _, applier in spectators:
+        for frame in hub.take(subscriber):
+            if applier is not None:
+                applier.apply(frame.data)
+        if applier is not None and capture_units(_ApplierView(applier)) != expected:
+            mismatches += 1
+
+    return {
+        "spectators": spectator_count,
+        "updates": hub.frames_published,
+        "encodes": hub.encoder.frames_encoded + hub.keyframes_built,
+        "encode_us": encode_time / max(1, hub.frames_published) * 1e6,
+        "fanout_us": (fanout_time - encode_time) / max(1, hub.frames_published) * 1e6,
+        "drops": sum(subscriber.dropped for subscriber, _, _ in spectators),
+        "mismatches": mismatches
+    }
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    counts = [count for count in (1, 10, 100, 1000, 10000, 100000) if count <= limit]
+    print(f"{'Zuschauer':>10} {'Updates':>8} {'Kodiert':>8} {'Kodierung µs':>13} {'Verteilung µs':>14} {'Drops':>7} {'Fehler':>7}")
+    for count in counts:
+        result = run(count)
+        print(f"{result['spectators']:>10} {result['updates']:>8} {result['encodes']:>8} "
+              f"{result['encode_us']:>13.1f} {result['fanout_us']:>14.1f} {result['drops']:>7} {result['mismatches']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: Startzeit von main_gui.py und run_game.py.
+
+Misst in frischen Prozessen
+- die Importzeit (python -X importtime) der Einstiegsmodule,
+- die Zeit bis zum ersten angezeigten Menü-Frame von main_gui
+  (mit dem SDL-Dummy-Treiber, also ohne echtes Fenster),
+- welche python_game-Module bis dahin geladen wurden.
+
+Aufruf: python3 benchmarks/startup.py [wiederholungen]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_FRAME_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import pygame
+pygame_loaded = time.perf_counter()
+import main_gui
+main_gui_loaded = time.perf_counter()
+original_flip = pygame.display.flip
+def flip():
+    original_flip()
+    now = time.perf_counter()
+    modules = sorted(name for name in sys.modules if name.startswith("python_game."))
+    print(f"FIRST_FRAME {now - start:.4f} {pygame_loaded - start:.4f} {main_gui_loaded - pygame_loaded:.4f} "
+          f"{now - main_gui_loaded:.4f} {','.join(modules)}")
+    raise SystemExit
+pygame.display.flip = flip
+main_gui.main()
+"""
+
+def _environment():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    return env
+
+def import_time(module):
+    """Kumulierte Importzeit eines Moduls in Sekunden (laut -X importtime)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_DIR, env=_environment(), capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    return None
+
+def first_frame():
+    result = subprocess.run([sys.executable, "-c", FIRST_FRAME_SNIPPET],
+                            cwd=PROJECT_DIR, env=_environment(), capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("FIRST_FRAME"):
+            parts = line.split(" ")
+            phases = [float(value) for value in parts[1:5]]
+            return phases, parts[5].split(",") if len(parts) > 5 and parts[5] else []
+    raise RuntimeError(result.stderr)
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for module in ("main_gui", "run_game", "python_game.game"):
+        times = [import_time(module) for _ in range(repeats)]
+        print(f"Import {module}: {statistics.median(times) * 1000:.1f} ms (Median aus {repeats})")
+
+    results = [first_frame() for _ in range(repeats)]
+    labels = ["Erster Menü-Frame gesamt", "  davon import pygame", "  davon import main_gui", "  davon main() bis Frame"]
+    for index, label in enumerate(labels):
+        median = statistics.median(phases[index] for phases, _ in results)
+        print(f"{label}: {median * 1000:.1f} ms (Median aus {repeats})")
+    print("Geladene Module bis dahin: " + ", ".join(results[0][1]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: prozedurale Karten und gecachte Terrain-Analyse.
+
+Misst pro Kartengröße
+- das Erzeugen der Karte (inklusive Symmetrie- und Zusammenhangsprüfung),
+- die vollständige Analyse (Sichtlinien-Tabelle, Engstellen, Distanz- und Anziehungskarten),
+- das Laden der Analyse aus dem Festplatten-Cache (neuer Prozess, leerer Speicher-Cache),
+- das Holen aus dem Speicher-Cache (weitere Spiele auf derselben Karte).
+
+Aufruf: python3 benchmarks/terrain_analysis.py [seeds_pro_größe]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game import terrain_analysis
+from python_game.board import Board
+from python_game.terrain_analysis import analyze, get_analysis
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cache_dir = tempfile.mkdtemp(prefix="terrain_cache_")
+    print(f"{'Größe':>6} {'Karte ms':>9} {'Analyse ms':>11} {'Festplatte ms':>14} {'Speicher ms':>12} {'Engstellen':>11}")
+    for size in (9, 32, 64, 128):
+        generate = compute = load = memory = 0.0
+        chokepoints = 0
+        for seed in range(seeds):
+            board, elapsed = timed(lambda: Board(size, terrain_seed=seed))
+            generate += elapsed
+            analysis, elapsed = timed(lambda: analyze(board))
+            compute += elapsed
+            chokepoints += len(analysis.chokepoints)
+            get_analysis(board, cache_dir)  # Schreibt den Festplatten-Cache
+            terrain_analysis._memory_cache.clear()  # Wie ein neuer Prozess
+            _, elapsed = timed(lambda: get_analysis(board, cache_dir))
+            load += elapsed
+            _, elapsed = timed(lambda: get_analysis(board, cache_dir))
+            memory += elapsed
+        print(f"{size:>6} {generate / seeds:>9.1f} {compute / seeds:>11.1f} {load / seeds:>14.2f} "
+              f"{memory / seeds:>12.3f} {chokepoints / seeds:>11.1f}")
+
+if __name__ == "__main__":
+    main()
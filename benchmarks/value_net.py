@@ -0,0 +1,93 @@
+"""
+Benchmark: Bewertungsnetz (value_net.py).
+
+Misst
+- Merkmale + Netz für Stellungen aus Selbstspielen, in Stellungen pro Sekunde je Blockgröße,
+- die Suche über einen Halbzug (alle Aktionen und Passen per make/unmake, gemeinsam bewertet) pro Zug,
+- den normalen Zug der KI "hard" in denselben Stellungen (ohne Kopierzeit).
+
+Aufruf: python3 benchmarks/value_net.py [wiederholungen]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_game.ai import AI
+from python_game.ai_service import restore_game, snapshot_game
+from python_game.game import Game
+from python_game.value_net import featurize, game_records, load_value_net
+
+def sample_positions(count):
+    """Stellungen aus Spielen hard gegen medium (Kopien, jede zehnte Stellung)."""
+    positions = []
+    seed = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(positions) < count:
+            random.seed(seed)
+            game = Game(headless=True, map_seed=seed)
+            ais = [AI(game.players[0], "hard"), AI(game.players[1], "medium")]
+            for ai in ais:
+                ai.debug = False
+                ai.set_game(game)
+            for turn in range(200):
+                if game._check_game_over() or len(positions) >= count:
+                    break
+                if turn % 10 == 0:
+                    positions.append(restore_game(snapshot_game(game)))
+                ais[game.current_turn].make_turn()
+                game.end_turn()
+            seed += 1
+    return positions
+
+def heuristic_turn(game, turn=True):
+    copy = restore_game(snapshot_game(game))
+    if not turn:
+        return
+    ai = AI(copy.players[copy.current_turn], "hard")
+    ai.debug = False
+    ai.use_books = False
+    ai.set_game(copy)
+    ai.make_turn()
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    net = load_value_net()
+    if net is None:
+        print("Netz fehlt, zuerst trainieren: python3 -m python_game.train_value")
+        return
+    positions = sample_positions(256)
+    records = game_records(positions)
+
+    print(f"{'Block':>6} {'Stellungen/s':>13}")
+    for batch_size in (1, 16, 64, 256):
+        batches = [records[start:start + batch_size] for start in range(0, len(records), batch_size)]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for batch in batches:
+                net.forward(featurize(batch))
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>6} {repeats * len(records) / elapsed:>13,.0f}")
+
+    games = positions[:64]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for game in games:
+            net.best_action(game)
+        search = (time.perf_counter() - start) / len(games) * 1000
+        start = time.perf_counter()
+        for game in games:
+            heuristic_turn(game)
+        heuristic = time.perf_counter() - start
+        start = time.perf_counter()
+        for game in games:
+            heuristic_turn(game, turn=False)
+        heuristic = (heuristic - (time.perf_counter() - start)) / len(games) * 1000
+    print(f"Netz, ein Halbzug Suche: {search:.2f} ms/Zug, KI hard: {heuristic:.2f} ms/Zug")
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,34 @@
+import logging
 import pygame
 import sys
-import os
-from python_game.game import Game
+from python_game.assets import AssetManager
+from python_game.fonts import get_font
 from python_game.menu import Menu, GameState
 from python_game.game_ui import GameUI
+from python_game.renderer import Layout, BoardRenderer
 from python_game.units import Swordsman
 
 # --- Konstanten ---
 BOARD_SIZE = 9
-SQUARE_SIZE = 60
-BOARD_WIDTH = BOARD_SIZE * SQUARE_SIZE
-BOARD_HEIGHT = BOARD_SIZE * SQUARE_SIZE
+SQUARE_SIZE = 60  # Startgröße, wird beim Ändern der Fenstergröße neu berechnet
 UI_HEIGHT = 150
-WINDOW_WIDTH = BOARD_WIDTH
-WINDOW_HEIGHT = BOARD_HEIGHT + UI_HEIGHT
-GRID_COLOR = (80, 80, 80)  # Dunkleres Grau
-PLAYER1_COLOR = (0, 150, 255)  # Blau
-PLAYER2_COLOR = (255, 50, 50)   # Rot
+WINDOW_WIDTH = BOARD_SIZE * SQUARE_SIZE
+WINDOW_HEIGHT = BOARD_SIZE * SQUARE_SIZE + UI_HEIGHT
 HIGHLIGHT_COLOR = (255, 255, 0) # Gelb
 REACHABLE_COLOR = (255, 255, 255)  # Weiß für erreichbare Felder
 ATTACKABLE_COLOR = (255, 0, 0)  # Rot für angreifbare Felder
+FPS = 60  # Bildrate, solange Animationen laufen
+IDLE_TIMEOUT_MS = 500  # Maximale Wartezeit auf Events im Leerlauf
+MOVEMENT_RULES = "rhombus"  # "weighted": kürzeste Wege mit Terrain-Kosten
+TURN_MODE = "single"  # "multi": jede Einheit zieht und handelt pro Zug, Zugende per Button oder Enter
+MAP_SEED = None  # Zahl: prozedural erzeugte Karte (gleicher Seed, gleiche Karte), None: Standardkarte
+AI_VALUE_NET = False  # True: die KI wählt im Modus "single" mit dem Bewertungsnetz (data/value_net.npz, braucht NumPy)
 
-# Farben für Einheitentypen als Fallback
-UNIT_COLORS = {
-    "Swordsman": (200, 200, 200), # Grau
-    "Archer": (0, 255, 0),       # Grün
-    "Rider": (255, 165, 0)      # Orange
-}
+# Bilder werden nur einmal geladen; skalierte Varianten pro Kachelgröße gecached
+ASSET_CACHE_DIR = None  # z.B. ".cache/assets", um skalierte Bilder auf der Festplatte abzulegen
+asset_manager = AssetManager(cache_dir=ASSET_CACHE_DIR)
 
-def load_unit_images():
-    """Lädt die Bilder für die Einheiten und skaliert sie."""
-    images = {}
-    image_names = {
-        "Swordsman": "swordsman.png",
-        "Archer": "archer.png",
-        "Rider": "rider.png"
-    }
-    for unit_name, file_name in image_names.items():
-        path = os.path.join("assets", "images", file_name)
-        try:
-            image = pygame.image.load(path).convert_alpha()
-            images[unit_name] = pygame.transform.scale(image, (SQUARE_SIZE, SQUARE_SIZE))
-        except pygame.error:
-            print(f"Warnung: Bild für '{unit_name}' nicht gefunden unter '{path}'.")
-            images[unit_name] = None
-    return images
-
-def draw_grid(screen):
-    """Zeichnet das Gitter."""
-    for x in range(0, BOARD_WIDTH, SQUARE_SIZE):
-        pygame.draw.line(screen, GRID_COLOR, (x, 0), (x, BOARD_HEIGHT))
-    for y in range(0, BOARD_HEIGHT, SQUARE_SIZE):
-        pygame.draw.line(screen, GRID_COLOR, (0, y), (BOARD_WIDTH, y))
-
-def draw_highlights(screen, game, selected_pos, attack_mode):
+def draw_highlights(surface, game, selected_pos, attack_mode, renderer):
     """Zeichnet Highlights für erreichbare und angreifbare Felder."""
     if not selected_pos:
         return
@@ -62,134 +37,170 @@ def draw_highlights(screen, game, selected_pos, attack_mode):
     if not selected_unit:
         return
         
+    square_size = renderer.square_size
     if attack_mode:
         # Zeige angreifbare Felder in Rot
-        attackable_positions = game.board.get_attackable_positions(selected_unit)
-        for x, y in attackable_positions:
-            rect = pygame.Rect(x * SQUARE_SIZE, y * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-            overlay = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
-            overlay.set_alpha(80)  # Niedrigere Alpha für bessere Sichtbarkeit
-            overlay.fill(ATTACKABLE_COLOR)
-            screen.blit(overlay, rect.topleft)
-            pygame.draw.rect(screen, ATTACKABLE_COLOR, rect, 3)  # Dickerer Rahmen
+        positions = game.board.get_attackable_positions(selected_unit)
+        overlay = renderer.get_overlay(ATTACKABLE_COLOR, 80)  # Niedrigere Alpha für bessere Sichtbarkeit
     else:
-        # Zeige erreichbare Felder in Weiß (Rautenform)
-        reachable_positions = game.board.get_reachable_positions_rhombus(selected_unit, selected_unit.movement_speed)
-        for x, y in reachable_positions:
-            rect = pygame.Rect(x * SQUARE_SIZE, y * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-            overlay = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
-            overlay.set_alpha(60)  # Niedrigere Alpha für bessere Sichtbarkeit
-            overlay.fill(REACHABLE_COLOR)
-            screen.blit(overlay, rect.topleft)
-            pygame.draw.rect(screen, REACHABLE_COLOR, rect, 3)  # Dickerer Rahmen
+        # Zeige erreichbare Felder in Weiß (nur mit verbleibender Bewegung)
+        positions = game.get_reachable_positions(selected_unit) if game.can_move(selected_unit) else []
+        overlay = renderer.get_overlay(REACHABLE_COLOR, 60)
+    for x, y in positions:
+        surface.blit(overlay, (x * square_size, y * square_size))
 
-def draw_board(screen, board):
-    """Zeichnet das Spielfeld mit Terrain."""
-    for y in range(board.size):
-        for x in range(board.size):
-            # Berechne Position auf dem Bildschirm
-            screen_x = x * SQUARE_SIZE
-            screen_y = y * SQUARE_SIZE
-            
-            # Zeichne Terrain-Hintergrund
-            terrain = board.get_terrain_at(x, y)
-            terrain_color = terrain.color
-            
-            # Zeichne Terrain-Hintergrund
-            pygame.draw.rect(screen, terrain_color, 
-                           (screen_x, screen_y, SQUARE_SIZE, SQUARE_SIZE))
-            
-            # Zeichne Terrain-Symbol
-            if terrain.symbol:
-                font = pygame.font.Font(None, 36)
-                text = font.render(terrain.symbol, True, (255, 255, 255))
-                text_rect = text.get_rect(center=(screen_x + SQUARE_SIZE // 2, 
-                                                screen_y + SQUARE_SIZE // 2))
-                screen.blit(text, text_rect)
-            
-            # Zeichne Gitterlinien
-            pygame.draw.rect(screen, GRID_COLOR, 
-                           (screen_x, screen_y, SQUARE_SIZE, SQUARE_SIZE), 1)
+def draw_board(surface, board, renderer):
+    """Zeichnet das Spielfeld mit Terrain (vorgerendert pro Feldgröße)."""
+    renderer.draw_terrain(surface, board)
 
-def draw_units(screen, board, unit_images, game):
+def draw_units(surface, board, game, renderer):
     """Zeichnet die Einheiten auf dem Brett."""
+    square_size = renderer.square_size
+    shielded_units = []
     for y in range(board.size):
         for x in range(board.size):
             unit = board.get_unit_at(x, y)
             if unit:
-                rect = pygame.Rect(x * SQUARE_SIZE, y * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-                unit_name = unit.__class__.__name__
-                image = unit_images.get(unit_name)
-
-                if image:
-                    # Bild zeichnen
-                    screen.blit(image, rect.topleft)
-                else:
-                    # Fallback: Farbiges Rechteck zeichnen
-                    base_color = UNIT_COLORS.get(unit_name, (255, 255, 255))
-                    pygame.draw.rect(screen, base_color, rect.inflate(-8, -8))
-                
-                player_color = PLAYER1_COLOR if unit.player.id == 1 else PLAYER2_COLOR
-                pygame.draw.rect(screen, player_color, rect, 4)
+                surface.blit(renderer.get_unit_sprite(unit), (x * square_size, y * square_size))
                 
-                # Zeichne Schild-Animation für Lanzenträger
+                # Schild-Animation für Lanzenträger vormerken
                 if isinstance(unit, Swordsman) and unit.shield_active and not unit.shield_used:
-                    from python_game.animations import ShieldAnimation
-                    shield_anim = ShieldAnimation((x, y))
-                    shield_anim.draw(screen, SQUARE_SIZE)
+                    shielded_units.append(unit)
 
-def draw_selection(screen, selected_pos):
+    # Schild-Effekte bleiben im AnimationManager über Frames hinweg erhalten
+    game.animation_manager.draw_shields(surface, square_size, shielded_units)
+
+def draw_selection(surface, selected_pos, square_size):
     """Hebt das ausgewählte Feld hervor."""
     if selected_pos:
         x, y = selected_pos
-        rect = pygame.Rect(x * SQUARE_SIZE, y * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-        pygame.draw.rect(screen, HIGHLIGHT_COLOR, rect, 4)
+        rect = pygame.Rect(x * square_size, y * square_size, square_size, square_size)
+        pygame.draw.rect(surface, HIGHLIGHT_COLOR, rect, 4)
+
+def wait_for_events(timeout_ms):
+    """Blockiert bis zum nächsten Event (oder Timeout) und gibt alle anstehenden Events zurück."""
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+def create_game(game_mode="multiplayer", ai_difficulty="medium"):
+    """Erstellt ein neues Spiel. Der Regelkern wird erst hier importiert, damit das Menü schneller erscheint."""
+    from python_game.game import Game
+    return Game(game_mode=game_mode, ai_difficulty=ai_difficulty, movement_rules=MOVEMENT_RULES, turn_mode=TURN_MODE,
+                map_seed=MAP_SEED, board_size=BOARD_SIZE, ai_value_net=AI_VALUE_NET)
+
+def finish_action(game, unit):
+    """
+    Nach einer erfolgreichen Aktion: beendet den Zug, wenn der Spieler nichts mehr tun kann.
+    Gibt die neue Auswahl zurück (im Modus "multi" bleibt eine Einheit mit Restbudget ausgewählt).
+    """
+    if game.is_turn_exhausted():
+        game.end_turn()
+        return None
+    if unit.position is not None and unit.has_turn_budget():
+        return unit.position
+    return None
+
+def handle_history_key(game, event):
+    """
+    Strg+Z nimmt im Hot-Seat die letzte Aktion zurück (samt Zugwechsel), Strg+Y oder
+    Strg+Umschalt+Z wiederholt sie. Gibt True zurück, wenn sich das Spiel geändert hat.
+    """
+    if game.game_mode != "multiplayer" or event.type != pygame.KEYDOWN or not event.mod & pygame.KMOD_CTRL:
+        return False
+    if event.key == pygame.K_z and not event.mod & pygame.KMOD_SHIFT:
+        return game.history.undo_action()
+    if event.key in (pygame.K_y, pygame.K_z):
+        return game.history.redo_action()
+    return False
+
+def is_ai_turn(game, game_over):
+    """Prüft, ob im Singleplayer die KI am Zug ist."""
+    return (game is not None and not game_over and game.game_mode == "singleplayer"
+            and game.current_turn == 1 and game.ai is not None)
 
 def main():
     """Haupt-Funktion für das Spiel mit GUI."""
-    pygame.init()
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    # Spielmeldungen (Angriffe, Heilung, ...) wie bisher auf der Konsole ausgeben
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Nur Grafik und Schrift initialisieren (pygame.init() öffnet z.B. auch das Audiogerät)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
     pygame.display.set_caption("Blade Horse Bow")
     clock = pygame.time.Clock()
     
+    # Layout und Render-Caches hängen von der aktuellen Fenstergröße ab
+    layout = Layout(BOARD_SIZE, UI_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT)
+    renderer = BoardRenderer(asset_manager, layout.square_size)
+    
     # Initialisiere Menü und UI
-    menu = Menu(WINDOW_WIDTH, WINDOW_HEIGHT)
-    game_ui = GameUI(WINDOW_WIDTH, WINDOW_HEIGHT, BOARD_SIZE, SQUARE_SIZE)
+    menu = Menu(layout.width, layout.height)
+    game_ui = GameUI(layout.width, layout.height, BOARD_SIZE, layout.square_size, layout.board_x)
     
     # Spielzustand
     game_state = GameState.MAIN_MENU
     game = None
-    unit_images = None
     selected_pos = None
     game_over = False
     special_mode = False  # Spezialfähigkeiten-Modus
     attack_mode = False  # Angriffsmodus
 
     running = True
+    redraw = True  # Erzwingt ein Neuzeichnen (Start, Zustandswechsel, Fenstergröße)
+    was_active = False
+    paused_background = None
     while running:
-        events = pygame.event.get()
+        # Volle Bildrate nur während Animationen oder wenn die KI am Zug ist,
+        # sonst blockieren bis ein Event eintrifft (spart Strom im Leerlauf)
+        active = game_state == GameState.PLAYING and game is not None and (
+            game.animation_manager.needs_frames() or is_ai_turn(game, game_over))
+        if was_active and not active:
+            redraw = True  # Das letzte Animationsbild (z.B. Treffer-Markierung) nicht stehen lassen
+        was_active = active
+        if active or redraw:
+            events = pygame.event.get()
+        else:
+            events = wait_for_events(IDLE_TIMEOUT_MS)
+        previous_state = game_state
+        drawn = False
         
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 
+            # Fenstergröße geändert: Layout neu berechnen, Caches nur einmal verwerfen
+            if event.type == pygame.VIDEORESIZE:
+                screen = pygame.display.get_surface()
+                if layout.update(event.w, event.h):
+                    renderer.set_square_size(layout.square_size)
+                menu.resize(layout.width, layout.height)
+                game_ui.resize(layout.width, layout.height, layout.square_size, layout.board_x)
+                redraw = True
+                
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                redraw = True
+                
             # ESC-Taste für Pause-Menü
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 if game_state == GameState.PLAYING:
+                    paused_background = screen.copy()
                     game_state = GameState.PAUSED
                 elif game_state == GameState.PAUSED:
                     game_state = GameState.PLAYING
 
         # Zustandsbehandlung
         if game_state == GameState.MAIN_MENU:
-            menu.draw_main_menu(screen)
+            if menu.needs_redraw(events, game_state) or redraw:
+                menu.draw_main_menu(screen)
+                drawn = True
             action = menu.handle_main_menu_events(events)
             
             if action == 'singleplayer_menu':
                 game_state = GameState.SINGLEPLAYER_MENU
             elif action == 'multiplayer':
-                game = Game(game_mode="multiplayer")
-                unit_images = load_unit_images()
+                game = create_game(game_mode="multiplayer")
                 game_state = GameState.PLAYING
                 selected_pos = None
                 game_over = False
@@ -199,15 +210,16 @@ def main():
                 running = False
                 
         elif game_state == GameState.SINGLEPLAYER_MENU:
-            menu.draw_singleplayer_menu(screen)
+            if menu.needs_redraw(events, game_state) or redraw:
+                menu.draw_singleplayer_menu(screen)
+                drawn = True
             action = menu.handle_singleplayer_menu_events(events)
             
             if action == 'main_menu':
                 game_state = GameState.MAIN_MENU
             elif action and action.startswith('singleplayer_'):
                 difficulty = action.split('_')[1]
-                game = Game(game_mode="singleplayer", ai_difficulty=difficulty)
-                unit_images = load_unit_images()
+                game = create_game(game_mode="singleplayer", ai_difficulty=difficulty)
                 game_state = GameState.PLAYING
                 selected_pos = None
                 game_over = False
@@ -216,15 +228,24 @@ def main():
                 
         elif game_state == GameState.PLAYING:
             # KI-Zug für Singleplayer
-            if game and game.game_mode == "singleplayer" and game.current_turn == 1:
+            if is_ai_turn(game, game_over):
                 # KI ist am Zug
-                if game.ai:
-                    print(f"KI (Schwierigkeit: {game.ai.difficulty}) ist am Zug...")
-                    # Kleine Verzögerung für bessere Spielbarkeit
-                    pygame.time.wait(1000)  # 1 Sekunde warten
-                    game.ai.make_turn()
-                    game.end_turn()
-                    continue
+                print(f"KI (Schwierigkeit: {game.ai.difficulty}) ist am Zug...")
+                # Kleine Verzögerung für bessere Spielbarkeit
+                pygame.time.wait(1000)  # 1 Sekunde warten
+                game.ai.make_turn()
+                game.end_turn()
+                redraw = True
+                continue
+            
+            # Rückgängig/Wiederholen (nicht während Bewegungs- oder Angriffsanimationen)
+            if not game.animation_manager.needs_frames():
+                for event in events:
+                    if handle_history_key(game, event):
+                        selected_pos = None
+                        special_mode = False
+                        attack_mode = False
+                        game_over = False  # Wird beim Zeichnen neu geprüft
             
             # Spiellogik
             # Erlaube Mausklicks auch während der Pfeilregen-Animation
@@ -234,13 +255,28 @@ def main():
             
             if allow_clicks:
                 for event in events:
+                    # Zug manuell beenden (Modus "multi")
+                    if (event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN
+                            and game.turn_mode == "multi"):
+                        game.end_turn()
+                        selected_pos = None
+                        special_mode = False
+                        attack_mode = False
+                        continue
+
                     if event.type == pygame.MOUSEBUTTONDOWN:
                         mouse_pos = pygame.mouse.get_pos()
                         
                         # Prüfe UI-Clicks (nur für aktuellen Spieler)
                         current_player = game.players[game.current_turn]
                         ui_action = game_ui.handle_click(mouse_pos)
-                        if ui_action == "attack" and selected_pos and not special_mode:
+                        if ui_action == "end_turn":
+                            game.end_turn()
+                            selected_pos = None
+                            special_mode = False
+                            attack_mode = False
+                            continue
+                        elif ui_action == "attack" and selected_pos and not special_mode:
                             # Prüfe, ob die ausgewählte Einheit dem aktuellen Spieler gehört
                             selected_unit = game.board.get_unit_at(selected_pos[0], selected_pos[1])
                             if selected_unit and selected_unit.player == current_player:
@@ -254,8 +290,9 @@ def main():
                                 attack_mode = False
                         
                         # Prüfe Spielfeld-Clicks (nur wenn Maus über dem Brett ist)
-                        if mouse_pos[1] < BOARD_HEIGHT:
-                            clicked_x, clicked_y = mouse_pos[0] // SQUARE_SIZE, mouse_pos[1] // SQUARE_SIZE
+                        clicked_cell = layout.screen_to_cell(mouse_pos)
+                        if clicked_cell:
+                            clicked_x, clicked_y = clicked_cell
                             current_player = game.players[game.current_turn]
 
                             if selected_pos:
@@ -274,9 +311,7 @@ def main():
                                     # Spezialfähigkeiten-Modus
                                     success, message = game.attempt_special_ability(selected_unit, clicked_x, clicked_y)
                                     print(message)
-                                    if success:
-                                        game.end_turn()  # Beende Zug nach Spezialfähigkeit
-                                    selected_pos = None
+                                    selected_pos = finish_action(game, selected_unit) if success else None
                                     special_mode = False
                                     attack_mode = False
                                 elif attack_mode:
@@ -284,9 +319,7 @@ def main():
                                     if target_unit and target_unit.player != current_player:
                                         success, message = game.attempt_attack(selected_unit, clicked_x, clicked_y)
                                         print(message)
-                                        if success:
-                                            game.end_turn()
-                                        selected_pos = None
+                                        selected_pos = finish_action(game, selected_unit) if success else None
                                         attack_mode = False
                                     else:
                                         # Klick auf leeres Feld oder eigene Einheit - wechsle zu Bewegung
@@ -296,15 +329,11 @@ def main():
                                     if target_unit and target_unit.player != current_player: # Angriff
                                         success, message = game.attempt_attack(selected_unit, clicked_x, clicked_y)
                                         print(message)
-                                        if success:
-                                            game.end_turn()
-                                        selected_pos = None
+                                        selected_pos = finish_action(game, selected_unit) if success else None
                                     elif not target_unit: # Bewegung
                                         success, message = game.attempt_move(selected_unit, clicked_x, clicked_y)
                                         print(message)
-                                        if success:
-                                            game.end_turn()
-                                        selected_pos = None
+                                        selected_pos = finish_action(game, selected_unit) if success else None
                                     elif target_unit and target_unit.player == current_player: # Andere eigene Einheit ausgewählt
                                         selected_pos = (clicked_x, clicked_y)
                                         special_mode = False
@@ -321,18 +350,22 @@ def main():
                                     special_mode = False
                                     attack_mode = False
 
-            # Rendering
-            if game:
+            # Rendering (nur bei Events, laufenden Animationen oder erzwungenem Neuzeichnen)
+            if game and (events or active or redraw):
+                drawn = True
                 screen.fill((0, 0, 0))
-                draw_board(screen, game.board)
-                draw_units(screen, game.board, unit_images, game)
-                draw_selection(screen, selected_pos)
+                board_surface = renderer.get_board_surface(game.board)
+                draw_board(board_surface, game.board, renderer)
+                draw_units(board_surface, game.board, game, renderer)
+                draw_selection(board_surface, selected_pos, layout.square_size)
                 
-                # Animationen zeichnen
-                game.animation_manager.update_and_draw(screen, SQUARE_SIZE)
+                # Animationen zeichnen (ein gemeinsamer Zeitstempel pro Frame)
+                frame_time = game.animation_manager.clock.now()
+                game.animation_manager.update_and_draw(board_surface, layout.square_size, frame_time)
                 
                 # Highlights über den Einheiten zeichnen (aber mit niedrigerer Alpha für bessere Sichtbarkeit)
-                draw_highlights(screen, game, selected_pos, attack_mode)
+                draw_highlights(board_surface, game, selected_pos, attack_mode, renderer)
+                screen.blit(board_surface, (layout.board_x, layout.board_y))
                 
                 # UI zeichnen
                 selected_unit = None
@@ -347,17 +380,17 @@ def main():
                 
                 # Spezialfähigkeiten-Modus Anzeige
                 if special_mode and selected_unit:
-                    font = pygame.font.Font(None, 24)
+                    font = get_font(24)
                     special_text = f"Spezialfähigkeit: {selected_unit.__class__.__name__}"
                     text_surface = font.render(special_text, True, (255, 255, 0))
-                    screen.blit(text_surface, (20, WINDOW_HEIGHT - 30))
+                    screen.blit(text_surface, (20, layout.height - 30))
                 
                 # Angriffsmodus Anzeige
                 if attack_mode and selected_unit:
-                    font = pygame.font.Font(None, 24)
+                    font = get_font(24)
                     attack_text = f"Angriff: {selected_unit.__class__.__name__}"
                     text_surface = font.render(attack_text, True, (255, 0, 0))
-                    screen.blit(text_surface, (20, WINDOW_HEIGHT - 30))
+                    screen.blit(text_surface, (20, layout.height - 30))
 
                 # Spielende prüfen
                 if not game_over and game._check_game_over():
@@ -366,22 +399,25 @@ def main():
                     print(f"Game Over! {winner.name} wins!")
 
                 if game_over:
-                    font = pygame.font.Font(None, 36)
+                    font = get_font(36)
                     winner = game.players[0] if not game.players[1].units else game.players[1]
                     text = font.render(f"{winner.name} hat gewonnen!", True, (255, 255, 255))
-                    text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+                    text_rect = text.get_rect(center=(layout.width // 2, layout.height // 2))
                     screen.blit(text, text_rect)
                 
         elif game_state == GameState.PAUSED:
-            # Pause-Menü zeichnen (über dem Spiel)
-            menu.draw_pause_menu(screen)
+            # Pause-Menü zeichnen (über dem zuletzt gezeichneten Spielbild)
+            if menu.needs_redraw(events, game_state) or redraw:
+                if paused_background is not None:
+                    screen.blit(paused_background, (0, 0))
+                menu.draw_pause_menu(screen)
+                drawn = True
             action = menu.handle_pause_menu_events(events)
             
             if action == 'continue':
                 game_state = GameState.PLAYING
             elif action == 'restart':
-                game = Game()
-                unit_images = load_unit_images()
+                game = create_game()
                 selected_pos = None
                 game_over = False
                 special_mode = False
@@ -390,8 +426,12 @@ def main():
             elif action == 'main_menu':
                 game_state = GameState.MAIN_MENU
 
-        pygame.display.flip()
-        clock.tick(60)
+        # Nach einem Zustandswechsel sofort neu zeichnen
+        redraw = game_state != previous_state
+        if drawn:
+            pygame.display.flip()
+        if active:
+            clock.tick(FPS)
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,66 @@
+# Kompakte Aktionsobjekte (Spiel -> KI-Dienst, Server, Aufzeichnung).
+# Felder wie bisher beim Tupel (Aktion, Einheitenposition, Ziel); Entpacken per
+# op, unit_position, target = action funktioniert weiterhin.
+
+from .units import Swordsman
+
+MOVE = "move"
+ATTACK = "attack"
+SPECIAL = "special"
+
+class Action:
+    __slots__ = ("op", "unit_position", "target")
+
+    def __init__(self, op, unit_position, target):
+        self.op = op  # MOVE, ATTACK oder SPECIAL
+        self.unit_position = unit_position  # (x, y) der Einheit vor der Aktion
+        self.target = target  # (x, y) des Ziels
+
+    def __iter__(self):
+        return iter((self.op, self.unit_position, self.target))
+
+    def __eq__(self, other):
+        if isinstance(other, Action):
+            other = tuple(other)
+        return tuple(self) == other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"Action({self.op!r}, {self.unit_position!r}, {self.target!r})"
+
+def apply_action(game, action):
+    """Wendet eine Aktion (KI-Dienst, Eröffnungsbuch) für den Spieler am Zug an. None bedeutet Passen."""
+    if action is None:
+        return False, "KI passt."
+    op, (unit_x, unit_y), (target_x, target_y) = action
+    unit = game.board.get_unit_at(unit_x, unit_y)
+    if unit is None or unit.player != game.players[game.current_turn]:
+        return False, "Ungültige KI-Aktion."
+    if op == MOVE:
+        return game.attempt_move(unit, target_x, target_y)
+    if op == ATTACK:
+        return game.attempt_attack(unit, target_x, target_y)
+    return game.attempt_special_ability(unit, target_x, target_y)
+
+def legal_actions(game):
+    """Alle Aktionen des Spielers am Zug im Modus "single" (ohne Passen) in fester Reihenfolge."""
+    player = game.players[game.current_turn]
+    board = game.board
+    enemies = sorted(unit.position for other in game.players if other is not player
+                     for unit in other.units if unit.position is not None)
+    actions = []
+    for unit in sorted(player.units, key=lambda unit: unit.unit_id):
+        if unit.position is None:
+            continue
+        for target in sorted(game.get_reachable_positions(unit)):
+            if board.get_unit_at(*target) is None:
+                actions.append(Action(MOVE, unit.position, target))
+        for target in sorted(board.get_attackable_positions(unit)):
+            actions.append(Action(ATTACK, unit.position, target))
+        if not unit.special_ability_used:
+            # Schild ohne Ziel, Pfeilregen und Sturmangriff auf gegnerische Einheiten
+            for target in ([unit.position] if isinstance(unit, Swordsman) else enemies):
+                actions.append(Action(SPECIAL, unit.position, target))
+    return actions
@@ -1,12 +1,87 @@
 import random
 from .units import Swordsman, Archer, Rider
+from .unit_defs import ATTACK_RANGE, TYPE_ADVANTAGE_BONUS, AI_SELECT_BONUS, THREAT_RANGE
+from .evaluation import OFF_BOARD_SCORE, unit_term, threat_term, attack_term
+from .ai_weights import DEFAULT_WEIGHTS
+from .actions import apply_action
+
+NO_ENEMY_DISTANCE = 1000  # Distanz, wenn kein Gegner mehr auf dem Brett steht
+
+class TurnContext:
+    """
+    Lagekarten für einen Zug im Modus "multi". Werden einmal pro Zug berechnet und von allen
+    eigenen Einheiten geteilt, statt für jede Einheit alle Gegner neu zu durchsuchen.
+    Eigene Bewegungen ändern die Karten nicht, nur besiegte Gegner (enemy_removed).
+    """
+
+    def __init__(self, board, player, players):
+        self.size = board.size
+        self.enemies = [unit for other in players if other != player
+                        for unit in other.units if unit.position is not None]
+        # threat[y][x]: Anzahl der Gegner, die das Feld bedrohen (THREAT_RANGE)
+        self.threat = [[0] * self.size for _ in range(self.size)]
+        for enemy in self.enemies:
+            self._add_threat(enemy.position, enemy.type_index, 1)
+        self._enemy_distance = None
+
+    @property
+    def enemy_distance(self):
+        """enemy_distance[y][x]: Chebyshev-Distanz zum nächsten Gegner (nach Änderungen neu berechnet)."""
+        if self._enemy_distance is None:
+            self._enemy_distance = self._compute_enemy_distance()
+        return self._enemy_distance
+
+    def _add_threat(self, position, type_index, amount):
+        x, y = position
+        threat_range = THREAT_RANGE[type_index]
+        for threat_y in range(max(0, y - threat_range), min(self.size, y + threat_range + 1)):
+            row = self.threat[threat_y]
+            for threat_x in range(max(0, x - threat_range), min(self.size, x + threat_range + 1)):
+                row[threat_x] += amount
+
+    def _compute_enemy_distance(self):
+        """Breitensuche von allen Gegnern gleichzeitig mit 8 Nachbarn (ergibt die Chebyshev-Distanz)."""
+        size = self.size
+        distance = [[NO_ENEMY_DISTANCE] * size for _ in range(size)]
+        frontier = []
+        for enemy in self.enemies:
+            x, y = enemy.position
+            distance[y][x] = 0
+            frontier.append((x, y))
+        step = 0
+        while frontier:
+            step += 1
+            next_frontier = []
+            for x, y in frontier:
+                for next_y in (y - 1, y, y + 1):
+                    if not 0 <= next_y < size:
+                        continue
+                    row = distance[next_y]
+                    for next_x in (x - 1, x, x + 1):
+                        if 0 <= next_x < size and row[next_x] > step:
+                            row[next_x] = step
+                            next_frontier.append((next_x, next_y))
+            frontier = next_frontier
+        return distance
+
+    def enemy_removed(self, enemy, position):
+        """Aktualisiert die Karten, nachdem ein Gegner auf position besiegt wurde."""
+        if enemy in self.enemies:
+            self.enemies.remove(enemy)
+            self._add_threat(position, enemy.type_index, -1)
+            self._enemy_distance = None
 
 class AI:
-    def __init__(self, player, difficulty="medium"):
+    def __init__(self, player, difficulty="medium", weights=None, value_net=None):
         self.player = player
         self.difficulty = difficulty
+        self.weights = weights or DEFAULT_WEIGHTS  # ai_weights.AIWeights
         self.game = None
         self.debug = True  # Debug-Modus aktivieren
+        # Eröffnungsbuch und Endspieltabelle (books.py) nur für "hard"
+        self.use_books = difficulty == "hard"
+        # Gelernte Stellungsbewertung (value_net.ValueNet): ersetzt im Modus "single" die Heuristik
+        self.value_net = value_net
         
     def set_game(self, game):
         """Setzt das Spiel-Objekt für die KI."""
@@ -26,6 +101,19 @@ class AI:
             self._debug_print("FEHLER: Keine verfügbaren Einheiten!")
             return False
             
+        if self.game.turn_mode == "multi":
+            # Alle Einheiten handeln: gemeinsam planen
+            return self._make_joint_turn(available_units)
+            
+        if self.use_books and self._play_from_books():
+            return True
+        if self.value_net is not None:
+            # Das Netz kennt nur die Brettgröße, auf der es trainiert wurde
+            if self.value_net.board_size == self.game.board.size:
+                return self._play_from_value_net()
+            self._debug_print(f"Bewertungsnetz ({self.value_net.board_size}x{self.value_net.board_size}) "
+                              f"passt nicht zum Brett, nutze die Heuristik")
+            
         # Wähle eine Einheit basierend auf der Schwierigkeit
         selected_unit = self._select_unit(available_units)
         if not selected_unit:
@@ -39,6 +127,178 @@ class AI:
         
         return True
         
+    def _play_from_books(self):
+        """Spielt den Zug aus Eröffnungsbuch oder Endspieltabelle, falls die Stellung dort steht."""
+        from .books import book_move
+        found, action = book_move(self.game)
+        if not found:
+            return False
+        if action is None:
+            self._debug_print("Endspieltabelle: Passen")
+            return True
+        success, message = apply_action(self.game, action)
+        self._debug_print(f"Buchzug {action}: {message}")
+        return success
+
+    def _play_from_value_net(self):
+        """Spielt die Aktion mit der besten gelernten Bewertung nach einem Halbzug."""
+        action = self.value_net.best_action(self.game)
+        if action is None:
+            self._debug_print("Bewertungsnetz: Passen")
+            return True
+        success, message = apply_action(self.game, action)
+        self._debug_print(f"Bewertungsnetz {action}: {message}")
+        return success
+        
+    def _make_joint_turn(self, units):
+        """Plant und führt die Aktionen aller Einheiten eines Zugs aus (Modus "multi")."""
+        context = TurnContext(self.game.board, self.player, self.game.players)
+        for unit in self._order_units_for_turn(units, context):
+            if not context.enemies:
+                break
+            if unit.position is None:
+                continue
+            self._execute_joint_unit_turn(unit, context)
+        return True
+
+    def _order_units_for_turn(self, units, context):
+        """Einheiten, die sofort angreifen können, zuerst; danach die Einheiten nahe am Gegner."""
+        if self.difficulty == "easy":
+            ordered = list(units)
+            random.shuffle(ordered)
+            return ordered
+
+        def priority(unit):
+            x, y = unit.position
+            distance = context.enemy_distance[y][x]
+            in_range = distance <= self._get_attack_range(unit)
+            return (not in_range, distance, -AI_SELECT_BONUS[unit.type_index])
+        return sorted(units, key=priority)
+
+    def _execute_joint_unit_turn(self, unit, context):
+        """Aktion und Bewegung einer Einheit: erst handeln, wenn möglich, sonst erst ziehen und dann handeln."""
+        acted = self._execute_joint_action(unit, context)
+        if self.game.can_move(unit) and context.enemies:
+            target = self._find_joint_movement_target(unit, context, can_act_after=not acted)
+            if target:
+                success, message = self.game.attempt_move(unit, target[0], target[1])
+                self._debug_print(f"{unit.__class__.__name__} bewegt nach {target}: {success} - {message}")
+        if not acted and context.enemies:
+            self._execute_joint_action(unit, context)
+
+    def _execute_joint_action(self, unit, context):
+        """Spezialfähigkeit oder Angriff mit den geteilten Lagekarten. Gibt True zurück, wenn gehandelt wurde."""
+        if not self.game.can_act(unit):
+            return False
+        actions_before = unit.actions_left
+        if not unit.special_ability_used and self._should_use_special_ability_in_context(unit, context):
+            before = [(enemy, enemy.position) for enemy in context.enemies]
+            self._use_special_ability(unit)
+            self._remove_defeated(before, context)
+            if unit.actions_left < actions_before:
+                return True
+
+        target = self._find_joint_attack_target(unit, context)
+        if target is None:
+            return False
+        position = target.position
+        success, message = self.game.attempt_attack(unit, position[0], position[1])
+        self._debug_print(f"{unit.__class__.__name__} greift {position} an: {success} - {message}")
+        if success and target.health == 0:
+            context.enemy_removed(target, position)
+        return success
+
+    def _remove_defeated(self, enemies_before, context):
+        """Entfernt durch Spezialfähigkeiten besiegte Gegner aus den Lagekarten."""
+        for enemy, position in enemies_before:
+            if enemy.health == 0:
+                context.enemy_removed(enemy, position)
+
+    def _should_use_special_ability_in_context(self, unit, context):
+        if isinstance(unit, Swordsman):
+            # Schild verwenden, wenn in Gefahr (Bedrohungskarte statt Gegnersuche)
+            x, y = unit.position
+            return context.threat[y][x] > 0
+        return self._should_use_special_ability(unit)
+
+    def _find_joint_attack_target(self, unit, context):
+        """Bestes Ziel in Reichweite; tödliche Treffer zuerst, damit spätere Einheiten andere Ziele wählen."""
+        x, y = unit.position
+        attack_range = self._get_attack_range(unit)
+        if context.enemy_distance[y][x] > attack_range:
+            return None
+        candidates = []
+        for enemy in context.enemies:
+            dist_x = abs(x - enemy.position[0])
+            dist_y = abs(y - enemy.position[1])
+            if max(dist_x, dist_y) > attack_range:
+                continue
+            prediction = self.game.predict_attack(unit, enemy)
+            if not prediction.can_attack:
+                continue
+            candidates.append((enemy, prediction))
+        if not candidates:
+            return None
+        if self.difficulty == "easy":
+            return random.choice(candidates)[0]
+
+        best_target = None
+        best_score = None
+        for enemy, prediction in candidates:
+            score = self.weights.attack_in_range
+            if prediction.lethal:
+                score += self.weights.lethal
+            if enemy.health < enemy.max_health * 0.5:
+                score += self.weights.attack_vulnerable
+            score += self._get_type_advantage_bonus(unit, enemy)
+            score += prediction.damage / max(1, enemy.health)  # Anteil der verbleibenden HP
+            if best_score is None or score > best_score:
+                best_score = score
+                best_target = enemy
+        return best_target
+
+    def _find_joint_movement_target(self, unit, context, can_act_after):
+        """Bewertet die erreichbaren Felder über die Lagekarten (kein Durchlauf über alle Gegner pro Feld)."""
+        reachable = self.game.get_reachable_positions(unit)
+        if not reachable:
+            return None
+        if self.difficulty == "easy":
+            return random.choice(reachable)
+
+        attack_range = self._get_attack_range(unit)
+        x, y = unit.position
+        has_enemies_in_range = context.enemy_distance[y][x] <= attack_range
+        center = self.game.board.size // 2
+        # Statische Terrain-Analyse der Karte (einmal pro Karte berechnet)
+        analysis = self.game.board.analysis
+        # Verwundete suchen Heilquellen
+        healing_weight = self.weights.healing_wounded if unit.health < unit.max_health * 0.5 else self.weights.healing
+        # Annäherung: Abstand höchstens Größe - 1, der Bonus bleibt also positiv
+        approach_base = self.game.board.size + 1
+        best_position = None
+        best_score = None
+        for target_x, target_y in reachable:
+            score = 0
+            distance = context.enemy_distance[target_y][target_x]
+            if not has_enemies_in_range:
+                score += (approach_base - distance) * self.weights.approach
+            score += analysis.forest_attraction[target_y][target_x] * self.weights.forest
+            score += analysis.healing_attraction[target_y][target_x] * healing_weight
+            if self.difficulty == "hard" and (target_x, target_y) in analysis.chokepoints:
+                score += self.weights.chokepoint  # Engstellen halten
+            score += (self.game.board.size - 1 - abs(target_x - center) - abs(target_y - center)) * self.weights.center
+            threatened = context.threat[target_y][target_x] > 0
+            if has_enemies_in_range and not threatened:
+                score += self.weights.safety
+            if can_act_after and distance <= attack_range:
+                score += self.weights.act_after_move  # Nach dem Zug noch angreifen
+            elif self.difficulty == "hard" and threatened:
+                score -= context.threat[target_y][target_x]
+            if best_score is None or score > best_score:
+                best_score = score
+                best_position = (target_x, target_y)
+        return best_position
+
     def _debug_print(self, message):
         """Gibt Debug-Nachrichten aus."""
         if self.debug:
@@ -73,17 +333,14 @@ class AI:
             score = 0
             
             # HP-Bonus
-            score += unit.health / unit.max_health * 10
+            score += unit.health / unit.max_health * self.weights.medium_hp
             
             # Spezialfähigkeit verfügbar
             if not unit.special_ability_used:
-                score += 5
+                score += self.weights.medium_special
                 
-            # Einheitentyp-Bonus
-            if isinstance(unit, Archer):
-                score += 3  # Bogenschützen sind wertvoll
-            elif isinstance(unit, Rider):
-                score += 2  # Reiter sind schnell
+            # Einheitentyp-Bonus (Bogenschützen sind wertvoll, Reiter schnell)
+            score += AI_SELECT_BONUS[unit.type_index]
                 
             if score > best_score:
                 best_score = score
@@ -96,8 +353,11 @@ class AI:
         best_unit = None
         best_score = -1
         
+        # Bewertungen werden inkrementell gehalten: einmal auffrischen, dann nur lesen
+        evaluator = self.game.get_evaluator(self.weights)
+        evaluator.refresh()
         for unit in units:
-            score = self._evaluate_unit_position(unit)
+            score = evaluator.score(unit)
             
             if score > best_score:
                 best_score = score
@@ -106,128 +366,27 @@ class AI:
         return best_unit
         
     def _evaluate_unit_position(self, unit):
-        """Bewertet die Position und den Zustand einer Einheit."""
+        """Bewertet die Position und den Zustand einer Einheit (siehe evaluation.IncrementalEvaluator)."""
+        return self.game.get_evaluator(self.weights).evaluate(unit)
+
+    def _evaluate_unit_position_full(self, unit):
+        """Dieselbe Bewertung ohne Zwischenspeicher, alle Gegner werden neu geprüft (zum Vergleich)."""
         if not unit.position:
-            return -1000
-            
-        score = 0
-        
-        # Basis-Score basierend auf HP
-        score += unit.health / unit.max_health * 15
-        
-        # Spezialfähigkeit verfügbar
-        if not unit.special_ability_used:
-            score += 8
-            
-        # Position bewerten
-        x, y = unit.position
-        score += self._evaluate_position(x, y, unit)
-        
-        # Bedrohung durch Gegner bewerten
-        score += self._evaluate_threats(unit)
-        
-        # Chancen für Angriffe bewerten
-        score += self._evaluate_attack_opportunities(unit)
-        
-        return score
-        
-    def _evaluate_position(self, x, y, unit):
-        """Bewertet die Position einer Einheit."""
-        score = 0
-        
-        # Terrain-Bonus
-        terrain = self.game.board.get_terrain_at(x, y)
-        if terrain.terrain_type.value == "forest":
-            score += 3  # Wald gibt Verteidigungsbonus
-        elif terrain.terrain_type.value == "healing":
-            score += 2  # Heilquelle ist gut
-            
-        # Zentrale Position (für Kontrolle)
-        center_distance = abs(x - 4) + abs(y - 4)
-        score += (8 - center_distance) * 0.5
-        
-        return score
-        
-    def _evaluate_threats(self, unit):
-        """Bewertet Bedrohungen für die Einheit."""
-        score = 0
-        x, y = unit.position
-        
-        # Prüfe alle gegnerischen Einheiten
-        for enemy_player in self.game.players:
-            if enemy_player == self.player:
-                continue
-                
-            for enemy_unit in enemy_player.units:
-                if not enemy_unit.position:
-                    continue
-                    
-                # Berechne Distanz
-                dist_x = abs(x - enemy_unit.position[0])
-                dist_y = abs(y - enemy_unit.position[1])
-                distance = max(dist_x, dist_y)
-                
-                # Bedrohung basierend auf Distanz und Einheitentyp
-                if isinstance(enemy_unit, Archer) and distance <= 6:
-                    score -= 10  # Bogenschütze in Reichweite
-                elif isinstance(enemy_unit, Rider) and distance <= 4:
-                    score -= 8   # Reiter in Reichweite
-                elif isinstance(enemy_unit, Swordsman) and distance <= 2:
-                    score -= 6   # Lanzenträger in Reichweite
-                    
-        return score
-        
-    def _evaluate_attack_opportunities(self, unit):
-        """Bewertet Angriffsmöglichkeiten der Einheit."""
-        score = 0
-        
-        # Prüfe alle gegnerischen Einheiten
-        for enemy_player in self.game.players:
-            if enemy_player == self.player:
-                continue
-                
-            for enemy_unit in enemy_player.units:
-                if not enemy_unit.position:
-                    continue
-                    
-                # Berechne Distanz
-                dist_x = abs(unit.position[0] - enemy_unit.position[0])
-                dist_y = abs(unit.position[1] - enemy_unit.position[1])
-                distance = max(dist_x, dist_y)
-                
-                # Angriffsmöglichkeit basierend auf Reichweite
-                attack_range = self._get_attack_range(unit)
-                if distance <= attack_range:
-                    score += 5
-                    
-                    # Bonus für verwundbare Gegner
-                    if enemy_unit.health < enemy_unit.max_health * 0.5:
-                        score += 3
-                        
-                    # Bonus für effektive Einheitenpaarungen
-                    score += self._get_type_advantage_bonus(unit, enemy_unit)
-                    
+            return OFF_BOARD_SCORE
+        enemies = [enemy for enemy_player in self.game.players if enemy_player != self.player
+                   for enemy in enemy_player.units if enemy.position]
+        score = unit_term(self.game.board, unit, self.weights)
+        score += sum(threat_term(unit, enemy, self.weights) for enemy in enemies)
+        score += sum(attack_term(unit, enemy, self.weights) for enemy in enemies)
         return score
         
     def _get_attack_range(self, unit):
         """Gibt die Angriffsreichweite einer Einheit zurück."""
-        if isinstance(unit, Swordsman):
-            return 2
-        elif isinstance(unit, Archer):
-            return 6
-        elif isinstance(unit, Rider):
-            return 1
-        return 1
+        return ATTACK_RANGE[unit.type_index]
         
     def _get_type_advantage_bonus(self, unit, enemy_unit):
         """Gibt Bonus für effektive Einheitenpaarungen."""
-        if isinstance(unit, Swordsman) and isinstance(enemy_unit, Rider):
-            return 3  # Lanzenträger ist stark gegen Reiter
-        elif isinstance(unit, Archer) and isinstance(enemy_unit, Swordsman):
-            return 3  # Bogenschütze ist stark gegen Lanzenträger
-        elif isinstance(unit, Rider) and isinstance(enemy_unit, Archer):
-            return 3  # Reiter ist stark gegen Bogenschütze
-        return 0
+        return TYPE_ADVANTAGE_BONUS[unit.type_index][enemy_unit.type_index]
         
     def _execute_unit_turn(self, unit):
         """Führt einen Zug für eine Einheit aus."""
@@ -342,11 +501,7 @@ class AI:
                 distance = max(dist_x, dist_y)
                 
                 # Bedrohung basierend auf Einheitentyp und Reichweite
-                if isinstance(enemy_unit, Archer) and distance <= 6:
-                    return True
-                elif isinstance(enemy_unit, Rider) and distance <= 4:
-                    return True
-                elif isinstance(enemy_unit, Swordsman) and distance <= 2:
+                if distance <= THREAT_RANGE[enemy_unit.type_index]:
                     return True
         return False
         
@@ -391,7 +546,7 @@ class AI:
         self._debug_print(f"Prüfe bessere Positionen für {unit.__class__.__name__}")
         
         # Einfache Implementierung: Bewege dich zu Heilquellen oder Wäldern
-        reachable = self.game.board.get_reachable_positions_rhombus(unit, unit.movement_speed)
+        reachable = self.game.get_reachable_positions(unit)
         self._debug_print(f"Erreichbare Positionen: {len(reachable)}")
         
         for x, y in reachable:
@@ -401,7 +556,7 @@ class AI:
                 return True
                 
         # Wenn keine speziellen Terrain verfügbar sind, bewege dich zum Zentrum
-        center_x, center_y = 4, 4
+        center_x = center_y = self.game.board.size // 2
         if (center_x, center_y) in reachable:
             self._debug_print(f"Zentrum erreichbar: ({center_x}, {center_y})")
             return True
@@ -504,16 +659,16 @@ class AI:
                 # Bonus für Positionen mit Gegnern
                 target_unit = self.game.board.get_unit_at(x, y)
                 if target_unit and target_unit.player != self.player:
-                    score += 5
+                    score += self.weights.attack_in_range
                     
                     # Bonus für verwundbare Gegner
                     if target_unit.health < target_unit.max_health * 0.5:
-                        score += 3
+                        score += self.weights.attack_vulnerable
                         
                 # Bonus für gute Positionen
                 terrain = self.game.board.get_terrain_at(x, y)
                 if terrain.terrain_type.value == "forest":
-                    score += 2
+                    score += self.weights.charge_forest
                     
                 if score > best_score:
                     best_score = score
@@ -543,11 +698,11 @@ class AI:
                     score = 0
                     
                     # Basis-Score für Angriff
-                    score += 5
+                    score += self.weights.attack_in_range
                     
                     # Bonus für verwundbare Gegner
                     if enemy_unit.health < enemy_unit.max_health * 0.5:
-                        score += 3
+                        score += self.weights.attack_vulnerable
                         
                     # Bonus für effektive Einheitenpaarungen
                     score += self._get_type_advantage_bonus(unit, enemy_unit)
@@ -560,7 +715,7 @@ class AI:
         
     def _find_best_movement_target(self, unit):
         """Findet die beste Bewegungszielposition."""
-        reachable = self.game.board.get_reachable_positions_rhombus(unit, unit.movement_speed)
+        reachable = self.game.get_reachable_positions(unit)
         best_position = None
         best_score = -1
         
@@ -573,24 +728,25 @@ class AI:
             # Priorität 1: Wenn keine Gegner in Reichweite sind, ziehe zu den nächsten Gegnern
             if not has_enemies_in_range:
                 closest_enemy_distance = self._get_closest_enemy_distance(x, y)
-                # Je näher an Gegnern, desto besser
-                score += (10 - closest_enemy_distance) * 2
+                # Je näher an Gegnern, desto besser (Abstand höchstens Größe - 1)
+                score += (self.game.board.size + 1 - closest_enemy_distance) * self.weights.approach
                 self._debug_print(f"Position ({x}, {y}): {score} Punkte (Nähe zu Gegnern)")
             
             # Priorität 2: Terrain-Bonus
             terrain = self.game.board.get_terrain_at(x, y)
             if terrain.terrain_type.value == "forest":
-                score += 3  # Verteidigungsbonus
+                score += self.weights.forest  # Verteidigungsbonus
             elif terrain.terrain_type.value == "healing":
-                score += 2  # Heilung
+                score += self.weights.healing  # Heilung
                 
             # Priorität 3: Position-Bonus (näher zum Zentrum)
-            center_distance = abs(x - 4) + abs(y - 4)
-            score += (8 - center_distance) * 0.5
+            center = self.game.board.size // 2
+            center_distance = abs(x - center) + abs(y - center)
+            score += (self.game.board.size - 1 - center_distance) * self.weights.center
             
             # Priorität 4: Sicherheitsbonus (weg von Gegnern, wenn bereits in Reichweite)
             if has_enemies_in_range and not self._is_position_threatened(x, y):
-                score += 2
+                score += self.weights.safety
                 
             if score > best_score:
                 best_score = score
@@ -635,11 +791,7 @@ class AI:
                 distance = max(dist_x, dist_y)
                 
                 # Bedrohung basierend auf Einheitentyp und Reichweite
-                if isinstance(enemy_unit, Archer) and distance <= 6:
-                    return True
-                elif isinstance(enemy_unit, Rider) and distance <= 4:
-                    return True
-                elif isinstance(enemy_unit, Swordsman) and distance <= 2:
+                if distance <= THREAT_RANGE[enemy_unit.type_index]:
                     return True
         return False
         
@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .ai import AI
+from .actions import apply_action  # Server und Benchmarks importieren apply_action von hier
+from .game import Game
+from .protocol import UNIT_CLASSES, FLAG_SPECIAL_USED, FLAG_SHIELD_ACTIVE, FLAG_SHIELD_USED, \
+    capture_units, encode_keyframe, decode_frame
+from .units import Swordsman
+
+# KI-Dienst für den Server: KI-Züge laufen in einem Prozess-Pool.
+# Jede Anfrage besteht aus einem Stellungs-Snapshot (Keyframe des Protokolls),
+# der Schwierigkeit und einer Deadline. Anfragen werden nach Deadline abgearbeitet,
+# günstige Schwierigkeiten gebündelt und Ergebnisse pro Stellung gecached.
+
+CHEAP_DIFFICULTIES = ("easy", "medium")
+DEFAULT_DEADLINES = {"easy": 0.5, "medium": 1.0, "hard": 3.0}  # Sekunden
+
+def snapshot_game(game):
+    """
+    Serialisiert die Stellung als Keyframe (Sequenz 0, damit gleiche Stellungen gleiche Bytes ergeben).
+    Die Karte (Brettgröße und Seed) gehört dazu: gleiche Einheiten auf verschiedenen Karten sind verschiedene Stellungen.
+    """
+    board = game.board
+    return encode_keyframe(0, game.current_turn, capture_units(game), board.size, board.terrain_seed)
+
+def restore_game(snapshot):
+    """Baut aus einem Snapshot ein headless Spiel auf (auf der Karte aus dem Snapshot)."""
+    _, _, (turn, units, board_size, map_seed) = decode_frame(snapshot)
+    game = Game(game_mode="multiplayer", headless=True, map_seed=map_seed, board_size=board_size, history_depth=0)
+    board = game.board
+    for player in game.players:
+        for unit in player.units:
+            board.grid[unit.position[1]][unit.position[0]] = None
+        player.clear_units()
+    game.current_turn = turn
+
+    for unit_id, (type_code, owner, x, y, hp, flags, storm) in sorted(units.items()):
+        player = game.players[owner]
+        unit = UNIT_CLASSES[type_code](player)
+        unit.unit_id = unit_id
+        unit.health = hp
+        unit.special_ability_used = bool(flags & FLAG_SPECIAL_USED)
+        if isinstance(unit, Swordsman):
+            unit.shield_active = bool(flags & FLAG_SHIELD_ACTIVE)
+            unit.shield_used = bool(flags & FLAG_SHIELD_USED)
+        player.add_unit(unit)
+        # Direkt setzen statt place_unit: Heilung wurde bereits angewendet
+        board.grid[y][x] = unit
+        unit.position = (x, y)
+        if storm is not None:
+            unit.arrow_storm_target = storm
+            game.delayed_arrow_storm_effects.append(('arrow_storm', unit, None))
+            game.last_arrow_storm_player = player.id
+    return game
+
+def think(snapshot, difficulty):
+    """
+    Berechnet den KI-Zug für eine Stellung. Gibt eine Action oder None zurück.
+    Arbeitet nur auf einer eigenen Kopie und schreibt nichts auf stdout: läuft auch parallel in Threads.
+    """
+    game = restore_game(snapshot)
+    ai = AI(game.players[game.current_turn], difficulty)
+    ai.debug = False
+    ai.set_game(game)
+    ai.make_turn()
+    return game.last_action
+
+def think_batch(requests):
+    """Berechnet mehrere günstige KI-Züge in einem Worker-Aufruf."""
+    return [think(snapshot, difficulty) for difficulty, snapshot in requests]
+
+class AIRequest:
+    __slots__ = ("key", "deadline", "submitted", "futures")
+
+    def __init__(self, key, deadline, submitted):
+        self.key = key  # (Schwierigkeit, Snapshot)
+        self.deadline = deadline
+        self.submitted = submitted
+        self.futures = []  # Gleiche Stellungen teilen sich eine Berechnung
+
+class AIService:
+    """
+    Plant KI-Anfragen nach Deadline auf einen Prozess-Pool ein.
+    Alle Methoden laufen in der Event-Loop; nur think/think_batch laufen im Worker.
+    """
+    def __init__(self, executor=None, max_workers=4, batch_size=8, cache_size=4096, latency_window=1000):
+        if executor is None:
+            # spawn statt fork: Worker sollen keine Sockets der Event-Loop erben
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.executor = executor
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (Schwierigkeit, Snapshot) -> Aktion (LRU)
+        self._queue = []  # Heap aus (Deadline, Nummer, AIRequest)
+        self._pending = {}  # Schlüssel -> AIRequest (wartend oder in Arbeit)
+        self._order = itertools.count()
+        self._in_flight = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._started = time.monotonic()
+        # Zähler
+        self.requests = 0
+        self.cache_hits = 0
+        self.completed = 0
+        self.batches = 0
+        self.deadline_misses = 0
+
+    async def request(self, game, difficulty, deadline=None):
+        """Fordert einen KI-Zug für die aktuelle Stellung an. Gibt die Aktion zurück (siehe apply_action)."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self.requests += 1
+        key = (difficulty, snapshot_game(game))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            self._latencies.append(0.0)
+            return self._cache[key]
+
+        request = self._pending.get(key)
+        if request is None:
+            if deadline is None:
+                deadline = now + DEFAULT_DEADLINES.get(difficulty, 1.0)
+            request = AIRequest(key, deadline, now)
+            self._pending[key] = request
+            heapq.heappush(self._queue, (deadline, next(self._order), request))
+        future = loop.create_future()
+        request.futures.append(future)
+        self._pump()
+        return await future
+
+    def _pump(self):
+        """Startet Arbeit, solange Worker frei sind (früheste Deadline zuerst)."""
+        loop = asyncio.get_running_loop()
+        while self._queue and self._in_flight < self.max_workers:
+            _, _, first = heapq.heappop(self._queue)
+            batch = [first]
+            if first.key[0] in CHEAP_DIFFICULTIES:
+                # Weitere günstige Anfragen in Deadline-Reihenfolge anhängen
+                skipped = []
+                while self._queue and len(batch) < self.batch_size:
+                    entry = heapq.heappop(self._queue)
+                    if entry[2].key[0] in CHEAP_DIFFICULTIES:
+                        batch.append(entry[2])
+                    else:
+                        skipped.append(entry)
+                for entry in skipped:
+                    heapq.heappush(self._queue, entry)
+            self._in_flight += 1
+            self.batches += 1
+            work = loop.run_in_executor(self.executor, think_batch, [request.key for request in batch])
+            work.add_done_callback(lambda done, batch=batch: self._finish(batch, done))
+
+    def _finish(self, batch, done):
+        self._in_flight -= 1
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        results = done.result() if error is None else [None] * len(batch)
+        for request, action in zip(batch, results):
+            self._pending.pop(request.key, None)
+            if error is None:
+                self._remember(request.key, action)
+            self.completed += 1
+            self._latencies.append(now - request.submitted)
+            if now > request.deadline:
+                self.deadline_misses += 1
+            for future in request.futures:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(action)
+        self._pump()
+
+    def _remember(self, key, action):
+        self._cache[key] = action
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def latency_percentile(self, percent):
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def stats(self):
+        """Zähler für Durchsatz und Latenz (Sekunden)."""
+        elapsed = max(1e-9, time.monotonic() - self._started)
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "completed": self.completed,
+            "batches": self.batches,
+            "queued": len(self._queue),
+            "in_flight": self._in_flight,
+            "deadline_misses": self.deadline_misses,
+            "moves_per_second": (self.completed + self.cache_hits) / elapsed,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "latency_p99": self.latency_percentile(99)
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+import json
+import os
+from .unit_defs import UNIT_TYPES
+
+# Gewichte der KI-Bewertung aus data/ai_weights.json (beim Import geladen).
+# Die Gewichte bilden einen Vektor in der Reihenfolge WEIGHT_NAMES; der Tuner
+# (python -m python_game.tuner) optimiert diesen Vektor und schreibt die Datei neu.
+
+AI_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ai_weights.json")
+
+# Bewertung für "hard" (evaluation.py): Einheit, Feld, Angriffsmöglichkeiten, Bedrohung pro Gegnertyp;
+# Feld- und Angriffsgewichte gelten auch für die Ziel- und Feldwahl der KI (ai.py), dazu kommen
+# Heilquellen für Verwundete, Wald am Ziel eines Sturmangriffs, tödliche Treffer, Annäherung (pro Feld),
+# Engstellen, sichere Felder und Felder, von denen aus nach dem Zug noch ein Angriff möglich ist
+HARD_WEIGHTS = ["hp", "special", "forest", "healing", "healing_wounded", "center", "attack_in_range",
+                "attack_vulnerable", "charge_forest", "lethal", "approach", "chokepoint", "safety",
+                "act_after_move"] + [f"threat_{name}" for name in UNIT_TYPES]
+# Einheitenwahl für "medium"
+MEDIUM_WEIGHTS = ["medium_hp", "medium_special"]
+WEIGHT_NAMES = HARD_WEIGHTS + MEDIUM_WEIGHTS
+
+class AIWeights:
+    """Ein vollständiger Gewichtssatz; die Bewertung liest die Attribute direkt."""
+
+    def __init__(self, values):
+        missing = [name for name in WEIGHT_NAMES if name not in values]
+        unknown = [name for name in values if name not in WEIGHT_NAMES]
+        if missing or unknown:
+            raise ValueError(f"Ungültige KI-Gewichte (fehlend: {missing}, unbekannt: {unknown})")
+        self.values = {name: values[name] for name in WEIGHT_NAMES}
+        self.hp = values["hp"]
+        self.special = values["special"]
+        self.forest = values["forest"]
+        self.healing = values["healing"]
+        self.healing_wounded = values["healing_wounded"]  # statt healing bei weniger als 50% HP
+        self.center = values["center"]
+        self.attack_in_range = values["attack_in_range"]
+        self.attack_vulnerable = values["attack_vulnerable"]
+        self.charge_forest = values["charge_forest"]
+        self.lethal = values["lethal"]
+        self.approach = values["approach"]  # pro Feld näher am nächsten Gegner
+        self.chokepoint = values["chokepoint"]
+        self.safety = values["safety"]  # unbedrohtes Feld, wenn schon Gegner in Reichweite sind
+        self.act_after_move = values["act_after_move"]
+        self.threat_penalty = [values[f"threat_{name}"] for name in UNIT_TYPES]  # [Typindex des Gegners]
+        self.medium_hp = values["medium_hp"]
+        self.medium_special = values["medium_special"]
+
+    def to_vector(self, names=WEIGHT_NAMES):
+        return [self.values[name] for name in names]
+
+    def with_vector(self, vector, names=WEIGHT_NAMES):
+        """Neuer Gewichtssatz, in dem die Gewichte names durch vector ersetzt sind."""
+        values = dict(self.values)
+        values.update(zip(names, vector))
+        return AIWeights(values)
+
+def load_weights(path=AI_WEIGHTS_PATH):
+    with open(path, encoding="utf-8") as weights_file:
+        return AIWeights(json.load(weights_file)["weights"])
+
+def save_weights(weights, path=AI_WEIGHTS_PATH, info=None):
+    """Schreibt die Gewichte (atomar) im Format von data/ai_weights.json; info: optionale Tuning-Angaben."""
+    data = {"weights": weights.values}
+    if info:
+        data["tuning"] = info
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as weights_file:
+        json.dump(data, weights_file, indent=2)
+        weights_file.write("\n")
+    os.replace(temporary_path, path)
+
+DEFAULT_WEIGHTS = load_weights()
@@ -1,43 +1,80 @@
-import pygame
 import math
 import time
 
+# pygame wird erst beim ersten Zeichnen importiert: Konsole, Server und
+# Simulationen brauchen keine Grafik und starten so deutlich schneller
+pygame = None
+
+def _load_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as pygame_module
+        pygame = pygame_module
+    return pygame
+
+class AnimationClock:
+    """Echtzeit-Uhr für Animationen."""
+    def now(self):
+        return time.monotonic()
+
+class SimulatedClock(AnimationClock):
+    """Manuell gesteuerte Uhr, z.B. für Tests ohne Fenster."""
+    def __init__(self, start=0.0):
+        self.current = start
+
+    def now(self):
+        return self.current
+
+    def advance(self, seconds):
+        self.current += seconds
+        return self.current
+
 class Animation:
     def __init__(self, duration=0.5):
-        self.start_time = time.time()
+        self.start_time = None  # Wird vom AnimationManager gesetzt
         self.duration = duration
         self.finished = False
+        self.progress = 0.0
 
-    def update(self):
-        current_time = time.time()
-        elapsed = current_time - self.start_time
+    def update(self, now):
+        """Berechnet den Fortschritt (0.0 - 1.0) zum Zeitpunkt now."""
+        if self.start_time is None:
+            self.start_time = now
+        elapsed = now - self.start_time
         if elapsed >= self.duration:
             self.finished = True
-            return 1.0
-        return elapsed / self.duration
+            self.progress = 1.0
+        else:
+            self.progress = elapsed / self.duration
+        return self.progress
 
 class MovementAnimation(Animation):
-    def __init__(self, start_pos, end_pos, unit, duration=0.8):
+    def __init__(self, start_pos, end_pos, unit, duration=0.8, path=None):
         super().__init__(duration)
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.unit = unit
         self.current_pos = start_pos
+        # Wegpunkte inklusive Start und Ziel; ohne Weg geradlinig
+        self.waypoints = [start_pos] + list(path) if path else [start_pos, end_pos]
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
-        progress = self.update()
-        
-        # Interpoliere zwischen Start- und Endposition
-        start_x = self.start_pos[0] * square_size + square_size // 2
-        start_y = self.start_pos[1] * square_size + square_size // 2
-        end_x = self.end_pos[0] * square_size + square_size // 2
-        end_y = self.end_pos[1] * square_size + square_size // 2
-        
-        current_x = start_x + (end_x - start_x) * progress
-        current_y = start_y + (end_y - start_y) * progress
+        progress = self.progress
+        
+        # Interpoliere entlang der Wegpunkte (gleiche Zeit pro Abschnitt)
+        segments = len(self.waypoints) - 1
+        position = progress * segments
+        index = min(int(position), segments - 1)
+        local_progress = position - index
+        start = self.waypoints[index]
+        end = self.waypoints[index + 1]
+        start_x = start[0] * square_size + square_size // 2
+        start_y = start[1] * square_size + square_size // 2
+        end_x = end[0] * square_size + square_size // 2
+        end_y = end[1] * square_size + square_size // 2
+        
+        current_x = start_x + (end_x - start_x) * local_progress
+        current_y = start_y + (end_y - start_y) * local_progress
         
         # Zeichne die Einheit an der aktuellen Position
         unit_rect = pygame.Rect(current_x - square_size // 2, current_y - square_size // 2, square_size, square_size)
@@ -64,10 +101,7 @@ class MeleeAttackAnimation(Animation):
         self.angle = math.atan2(dy, dx)
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
-        progress = self.update()
+        progress = self.progress
         
         # Startposition in Pixeln (Mittelpunkt der Figur)
         center_x = self.start_pos[0] * square_size + square_size // 2
@@ -115,10 +149,7 @@ class ArrowAnimation(Animation):
         self.angle = math.atan2(dy, dx)
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
-        progress = self.update()
+        progress = self.progress
         
         # Startposition in Pixeln
         start_x = self.start_pos[0] * square_size + square_size // 2
@@ -163,10 +194,7 @@ class HitAnimation(Animation):
         self.target_pos = target_pos
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
-        progress = self.update()
+        progress = self.progress
         
         # Fade-out Effekt (1.0 -> 0.0)
         alpha = 1.0 - progress
@@ -183,15 +211,13 @@ class HitAnimation(Animation):
         pygame.draw.rect(screen, color, rect)
 
 class ArrowStormAnimation(Animation):
-    def __init__(self, target_pos, color=(255, 0, 0)):
+    def __init__(self, target_pos, color=(255, 0, 0), board_size=9):
         super().__init__(duration=float('inf'))  # Unendliche Dauer
         self.target_pos = target_pos
         self.color = color
+        self.board_size = board_size
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
         # 3x3 Bereich um das Ziel markieren (dauerhaft)
         target_x, target_y = self.target_pos
         for dx in [-1, 0, 1]:
@@ -200,7 +226,7 @@ class ArrowStormAnimation(Animation):
                 y = target_y + dy
                 
                 # Prüfe Grenzen
-                if 0 <= x < 9 and 0 <= y < 9:  # 9x9 Spielfeld
+                if 0 <= x < self.board_size and 0 <= y < self.board_size:
                     rect = pygame.Rect(x * square_size, y * square_size, square_size, square_size)
                     
                     # Semi-transparente rote Markierung
@@ -223,9 +249,6 @@ class ShieldAnimation(Animation):
         self.color = (0, 255, 0)  # Grün
         
     def draw(self, screen, square_size):
-        if self.finished:
-            return
-            
         # Zeichne einen grünen Ring um die Einheit
         x, y = self.unit_pos
         center_x = x * square_size + square_size // 2
@@ -238,23 +261,86 @@ class ShieldAnimation(Animation):
         # Innerer Ring für besseren Effekt
         pygame.draw.circle(screen, self.color, (center_x, center_y), radius - 3, 1)
         
-    def update(self):
+    def update(self, now):
         """Überschreibe update, damit die Animation nicht automatisch endet"""
+        if self.start_time is None:
+            self.start_time = now
         return 0.0
 
 class AnimationManager:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else AnimationClock()
         self.animations = []
+        self.shield_animations = {}  # Dauerhafte Schild-Effekte pro Einheit
         
     def add_animation(self, animation):
+        animation.start_time = self.clock.now()
         self.animations.append(animation)
-        
-    def update_and_draw(self, screen, square_size):
-        # Alle Animationen aktualisieren und zeichnen
-        for animation in self.animations[:]:
-            animation.draw(screen, square_size)
+
+    def update(self, now=None):
+        """Schreitet alle Animationen mit einem gemeinsamen Zeitstempel fort."""
+        if now is None:
+            now = self.clock.now()
+        to_draw = []
+        running = []
+        for animation in self.animations:
             if animation.finished:
-                self.animations.remove(animation)
+                continue  # Manuell beendet (z.B. Pfeilregen)
+            animation.update(now)
+            to_draw.append(animation)
+            if not animation.finished:
+                running.append(animation)
+        # Beendete Animationen in einem Durchlauf entfernen
+        self.animations = running
+        return to_draw
+
+    def update_and_draw(self, screen, square_size, now=None):
+        # Alle Animationen aktualisieren und zeichnen (letzter Frame wird noch gezeichnet)
+        _load_pygame()
+        for animation in self.update(now):
+            animation.draw(screen, square_size)
+
+    def draw_shields(self, screen, square_size, shielded_units):
+        """Zeichnet die Schild-Effekte und behält deren Zustand über Frames hinweg."""
+        _load_pygame()
+        current = {}
+        for unit in shielded_units:
+            shield_anim = self.shield_animations.get(id(unit))
+            if shield_anim is None:
+                shield_anim = ShieldAnimation(unit.position)
+                shield_anim.start_time = self.clock.now()
+            shield_anim.unit_pos = unit.position
+            shield_anim.draw(screen, square_size)
+            current[id(unit)] = shield_anim
+        self.shield_animations = current
                 
     def is_animating(self):
-        return len(self.animations) > 0 
\ No newline at end of file
+        return len(self.animations) > 0
+
+    def needs_frames(self):
+        """Gibt True zurück, solange zeitabhängige Animationen laufen (dauerhafte Markierungen zählen nicht)."""
+        return any(animation.duration != float('inf') for animation in self.animations)
+
+class NullAnimationManager:
+    """Animations-Manager ohne Wirkung für Spiele ohne Darstellung (Server, Simulation)."""
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else AnimationClock()
+        self.animations = []
+
+    def add_animation(self, animation):
+        pass
+
+    def update(self, now=None):
+        return []
+
+    def update_and_draw(self, screen, square_size, now=None):
+        pass
+
+    def draw_shields(self, screen, square_size, shielded_units):
+        pass
+
+    def is_animating(self):
+        return False
+
+    def needs_frames(self):
+        return False
@@ -0,0 +1,99 @@
+import os
+import pygame
+
+# Pfade relativ zum Paket (nicht zum Arbeitsverzeichnis) auflösen
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(PACKAGE_DIR)
+
+def resolve_asset_path(*parts):
+    """Gibt den absoluten Pfad einer Datei im assets-Ordner zurück."""
+    return os.path.join(PROJECT_DIR, "assets", *parts)
+
+IMAGE_DIR = resolve_asset_path("images")
+
+UNIT_IMAGE_FILES = {
+    "Swordsman": "swordsman.png",
+    "Archer": "archer.png",
+    "Rider": "rider.png"
+}
+
+class AssetManager:
+    """Lädt jedes Bild nur einmal in einen Textur-Atlas und cached skalierte Varianten."""
+
+    def __init__(self, image_dir=IMAGE_DIR, image_files=None, cache_dir=None):
+        self.image_dir = image_dir
+        self.image_files = image_files if image_files is not None else UNIT_IMAGE_FILES
+        self.cache_dir = cache_dir  # Optional: skalierte Bilder auf der Festplatte ablegen
+        self.atlas = None
+        self.regions = {}  # Name -> Rect im Atlas
+        self._scaled = {}  # (Name, Kachelgröße) -> Surface
+        self._source_stamps = {}  # Name -> Änderungszeit der Quelldatei
+
+    def _build_atlas(self):
+        """Lädt alle Bilder und packt sie nebeneinander in einen Atlas."""
+        images = {}
+        for name, file_name in self.image_files.items():
+            path = os.path.join(self.image_dir, file_name)
+            try:
+                images[name] = pygame.image.load(path)
+                self._source_stamps[name] = int(os.path.getmtime(path))
+            except (pygame.error, FileNotFoundError):
+                print(f"Warnung: Bild für '{name}' nicht gefunden unter '{path}'.")
+
+        width = sum(image.get_width() for image in images.values())
+        height = max((image.get_height() for image in images.values()), default=0)
+        self.atlas = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+
+        x = 0
+        for name, image in images.items():
+            self.atlas.blit(image, (x, 0))
+            self.regions[name] = pygame.Rect(x, 0, image.get_width(), image.get_height())
+            x += image.get_width()
+
+        if pygame.display.get_surface() is not None:
+            self.atlas = self.atlas.convert_alpha()
+
+    def _cache_path(self, name, tile_size):
+        stamp = self._source_stamps.get(name, 0)
+        return os.path.join(self.cache_dir, f"{name.lower()}_{tile_size}_{stamp}.png")
+
+    def get_image(self, name, tile_size):
+        """Gibt das Bild einer Einheit in der gewünschten Kachelgröße zurück (oder None)."""
+        key = (name, tile_size)
+        if key in self._scaled:
+            return self._scaled[key]
+
+        if self.atlas is None:
+            self._build_atlas()
+        if name not in self.regions:
+            self._scaled[key] = None
+            return None
+
+        image = None
+        if self.cache_dir:
+            cache_path = self._cache_path(name, tile_size)
+            if os.path.exists(cache_path):
+                try:
+                    image = pygame.image.load(cache_path)
+                except pygame.error:
+                    image = None
+
+        if image is None:
+            source = self.atlas.subsurface(self.regions[name])
+            image = pygame.transform.smoothscale(source, (tile_size, tile_size))
+            if self.cache_dir:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                pygame.image.save(image, self._cache_path(name, tile_size))
+
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        self._scaled[key] = image
+        return image
+
+    def get_unit_images(self, tile_size):
+        """Gibt alle Einheitenbilder für eine Kachelgröße als Dictionary zurück."""
+        return {name: self.get_image(name, tile_size) for name in self.image_files}
+
+    def clear_scaled(self):
+        """Verwirft alle skalierten Varianten (der Atlas bleibt erhalten)."""
+        self._scaled.clear()
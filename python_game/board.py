@@ -1,36 +1,137 @@
-from .units import Swordsman, Archer, Rider
-from .terrain import Terrain, TerrainType
+import logging
+from .unit_defs import ATTACK_RANGE, MOVE_ORTHOGONAL, MOVE_DIAGONAL, NEEDS_LINE_OF_SIGHT
+from .terrain import TerrainType, TERRAINS, TERRAIN_CODE
+from .pathfinding import flood_fill
+from .mapgen import generate_layout
+
+log = logging.getLogger(__name__)  # Spielmeldungen (Heilung), siehe units.py
+
+# Bewegungsschablonen: pro (Einheitentyp, Terrain-Strafe) einmal berechnet.
+# Jeder Eintrag ist (dx, dy, Strahl) mit den relativen Zwischenfeldern des Weges.
+_movement_stencils = {}
+
+def ray_offsets(dx, dy):
+    """Zwischenfelder auf dem Weg von (0, 0) nach (dx, dy), wie _is_path_clear sie prüft."""
+    step_x = (dx > 0) - (dx < 0)
+    step_y = (dy > 0) - (dy < 0)
+    ray = []
+    x, y = 0, 0
+    while x != dx or y != dy:
+        if x != dx:
+            x += step_x
+        if y != dy:
+            y += step_y
+        if (x, y) != (dx, dy):
+            ray.append((x, y))
+    return tuple(ray)
+
+def _is_in_rhombus(dist_x, dist_y, orthogonal_range, diagonal_range):
+    if dist_x == 0:  # Vertikale Bewegung
+        return dist_y <= orthogonal_range
+    if dist_y == 0:  # Horizontale Bewegung
+        return dist_x <= orthogonal_range
+    if dist_x == dist_y:  # Diagonale Bewegung
+        return dist_x <= diagonal_range
+    # Kombinierte Bewegung
+    return dist_x + dist_y <= orthogonal_range and max(dist_x, dist_y) <= diagonal_range
+
+def get_movement_stencil(type_index, movement_penalty):
+    """Gibt die Bewegungsschablone für einen Einheitentyp und eine Terrain-Strafe zurück."""
+    key = (type_index, movement_penalty)
+    stencil = _movement_stencils.get(key)
+    if stencil is None:
+        orthogonal_range = max(0, MOVE_ORTHOGONAL[type_index] - movement_penalty)
+        diagonal_range = max(0, MOVE_DIAGONAL[type_index] - movement_penalty)
+        reach = max(orthogonal_range, diagonal_range)
+        stencil = []
+        # Reihenfolge wie beim Durchlaufen des Bretts (x außen, y innen)
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                if (dx, dy) == (0, 0):
+                    continue
+                if _is_in_rhombus(abs(dx), abs(dy), orthogonal_range, diagonal_range):
+                    stencil.append((dx, dy, ray_offsets(dx, dy)))
+        stencil = tuple(stencil)
+        _movement_stencils[key] = stencil
+    return stencil
+
+# Terrain-Layouts sind unveränderlich und werden von allen Brettern mit derselben Karte geteilt:
+# (Größe, Seed) -> (terrain_codes, terrain). Ein neues Brett kopiert daher kein Terrain.
+_terrain_layouts = {}
+
+def _default_layout_codes(size):
+    """Standard-Terrain als Terrain-Codes (ein Byte pro Feld, zeilenweise)."""
+    codes = bytearray([TERRAIN_CODE[TerrainType.GRASS]]) * (size * size)
+    def put(x, y, terrain_type):
+        codes[y * size + x] = TERRAIN_CODE[terrain_type]
+    # Beispiel-Terrain (kann später angepasst werden)
+    # Berge in der Mitte
+    put(4, 4, TerrainType.MOUNTAIN)
+    put(3, 3, TerrainType.MOUNTAIN)
+    put(5, 5, TerrainType.MOUNTAIN)
+    
+    # Gewässer
+    put(2, 2, TerrainType.WATER)
+    put(6, 6, TerrainType.WATER)
+    put(6, 2, TerrainType.WATER)
+    put(2, 6, TerrainType.WATER)
+    
+    # Wälder
+    put(4, 1, TerrainType.FOREST)
+    put(4, 7, TerrainType.FOREST)
+    put(1, 4, TerrainType.FOREST)
+    put(7, 4, TerrainType.FOREST)
+    
+    # Heilquellen
+    put(4, 0, TerrainType.HEALING)
+    put(4, 8, TerrainType.HEALING)
+    return bytes(codes)
+
+def _rows_from_codes(size, codes):
+    """Zeilen mit geteilten Terrain-Fliegengewichten (Tupel, damit niemand sie versehentlich verändert)."""
+    return tuple(tuple(TERRAINS[code] for code in codes[y * size:(y + 1) * size]) for y in range(size))
+
+def get_terrain_layout(size, terrain_seed=None):
+    """Gibt (terrain_codes, terrain) für eine Karte zurück, pro (Größe, Seed) nur einmal erzeugt."""
+    key = (size, terrain_seed)
+    layout = _terrain_layouts.get(key)
+    if layout is None:
+        if terrain_seed is None:
+            codes = _default_layout_codes(size)
+        else:
+            codes = bytes(TERRAIN_CODE[terrain_type] for row in generate_layout(size, terrain_seed) for terrain_type in row)
+        layout = (codes, _rows_from_codes(size, codes))
+        _terrain_layouts[key] = layout
+    return layout
 
 class Board:
-    def __init__(self, size=9):
+    def __init__(self, size=9, terrain_seed=None):
         self.size = size
-        self.grid = [[None for _ in range(size)] for _ in range(size)]
-        self.terrain = [[Terrain(TerrainType.GRASS) for _ in range(size)] for _ in range(size)]
-        self._setup_default_terrain()
+        self.grid = [[None] * size for _ in range(size)]
+        self.version = 0  # Wird bei jeder Zustandsänderung erhöht (für Caches)
+        self.terrain_seed = terrain_seed  # None: feste Standardkarte, sonst prozedural (mapgen)
+        self.analysis = None  # Optionale TerrainAnalysis (z.B. Sichtlinien-Tabelle), siehe terrain_analysis
+        # terrain_codes: ein Byte pro Feld; terrain[y][x]: geteilte, unveränderliche Terrain-Objekte
+        self.terrain_codes, self.terrain = get_terrain_layout(size, terrain_seed)
 
-    def _setup_default_terrain(self):
-        """Setzt Standard-Terrain auf dem Spielfeld."""
-        # Beispiel-Terrain (kann später angepasst werden)
-        # Berge in der Mitte
-        self.terrain[4][4] = Terrain(TerrainType.MOUNTAIN)
-        self.terrain[3][3] = Terrain(TerrainType.MOUNTAIN)
-        self.terrain[5][5] = Terrain(TerrainType.MOUNTAIN)
-        
-        # Gewässer
-        self.terrain[2][2] = Terrain(TerrainType.WATER)
-        self.terrain[6][6] = Terrain(TerrainType.WATER)
-        self.terrain[2][6] = Terrain(TerrainType.WATER)
-        self.terrain[6][2] = Terrain(TerrainType.WATER)
-        
-        # Wälder
-        self.terrain[1][4] = Terrain(TerrainType.FOREST)
-        self.terrain[7][4] = Terrain(TerrainType.FOREST)
-        self.terrain[4][1] = Terrain(TerrainType.FOREST)
-        self.terrain[4][7] = Terrain(TerrainType.FOREST)
-        
-        # Heilquellen
-        self.terrain[0][4] = Terrain(TerrainType.HEALING)
-        self.terrain[8][4] = Terrain(TerrainType.HEALING)
+    def mark_changed(self):
+        """Markiert das Brett als verändert und invalidiert damit abhängige Caches."""
+        self.version += 1
+
+    def set_terrain_codes(self, codes):
+        """Ersetzt das komplette Terrain dieses Bretts (ein Code pro Feld, zeilenweise)."""
+        codes = bytes(codes)
+        if len(codes) != self.size * self.size:
+            raise ValueError("Falsche Anzahl an Terrain-Codes.")
+        self.terrain_codes = codes
+        self.terrain = _rows_from_codes(self.size, codes)
+        self.analysis = None  # Passt nicht mehr zum Terrain
+
+    def set_terrain(self, x, y, terrain_type):
+        """Ändert ein einzelnes Feld (kopiert das geteilte Layout; für viele Felder set_terrain_codes nutzen)."""
+        codes = bytearray(self.terrain_codes)
+        codes[y * self.size + x] = TERRAIN_CODE[terrain_type]
+        self.set_terrain_codes(codes)
 
     def place_unit(self, unit, x, y):
         """Platziert eine Einheit auf dem Brett."""
@@ -46,8 +147,9 @@ class Board:
             healing = self.terrain[y][x].get_healing_amount(unit)
             if healing > 0:
                 unit.health = min(unit.max_health, unit.health + healing)
-                print(f"{unit.__class__.__name__} wurde um {healing} HP geheilt!")
+                log.info("%s wurde um %s HP geheilt!", unit.__class__.__name__, healing)
                 
+            self.mark_changed()
             return True
         return False
 
@@ -80,8 +182,9 @@ class Board:
         healing = self.terrain[new_y][new_x].get_healing_amount(unit)
         if healing > 0:
             unit.health = min(unit.max_health, unit.health + healing)
-            print(f"{unit.__class__.__name__} wurde um {healing} HP geheilt!")
+            log.info("%s wurde um %s HP geheilt!", unit.__class__.__name__, healing)
         
+        self.mark_changed()
         return True
 
     def get_unit_at(self, x, y):
@@ -94,57 +197,14 @@ class Board:
         """Gibt das Terrain an der Position (x, y) zurück."""
         if 0 <= x < self.size and 0 <= y < self.size:
             return self.terrain[y][x]
-        return Terrain(TerrainType.GRASS)
+        return TERRAINS[TERRAIN_CODE[TerrainType.GRASS]]
 
-    def get_reachable_positions(self, unit, max_distance):
-        """Berechnet alle erreichbaren Positionen für eine Einheit mit Pfadfindung."""
-        if unit.position is None:
-            return []
-            
-        start_x, start_y = unit.position
-        reachable = set()
-        visited = set()
-        
-        # BFS (Breadth-First Search) für Pfadfindung
-        queue = [(start_x, start_y, 0)]  # (x, y, distance)
-        
-        while queue:
-            x, y, distance = queue.pop(0)
-            
-            if (x, y) in visited:
-                continue
-                
-            visited.add((x, y))
-            
-            # Wenn wir die maximale Distanz erreicht haben, stoppe
-            if distance >= max_distance:
-                continue
-                
-            # Füge Position zu erreichbaren hinzu (außer Startposition)
-            if distance > 0:
-                reachable.add((x, y))
-            
-            # Prüfe alle 8 Richtungen (orthogonal und diagonal)
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                        
-                    new_x, new_y = x + dx, y + dy
-                    
-                    # Prüfe Grenzen
-                    if not (0 <= new_x < self.size and 0 <= new_y < self.size):
-                        continue
-                        
-                    # Prüfe, ob Feld blockiert ist
-                    if self.grid[new_y][new_x] is not None:
-                        continue
-                        
-                    # Füge zur Queue hinzu
-                    if (new_x, new_y) not in visited:
-                        queue.append((new_x, new_y, distance + 1))
-        
-        return list(reachable)
+    def get_reachable_positions(self, unit, max_distance=None):
+        """
+        Erreichbare Positionen bei gewichteter Bewegung (Dijkstra, siehe pathfinding).
+        max_distance: Bewegungsbudget, Standard ist die orthogonale Reichweite der Einheit.
+        """
+        return flood_fill(self, unit, max_distance).positions()
 
     def get_reachable_positions_rhombus(self, unit, max_distance):
         """Berechnet erreichbare Positionen mit korrekter Bewegungslogik und Terrain."""
@@ -154,56 +214,27 @@ class Board:
         start_x, start_y = unit.position
         reachable = set()
         
-        # Bestimme Bewegungsreichweiten basierend auf Einheitentyp
-        if isinstance(unit, Swordsman):
-            orthogonal_range = 2  # 2 Felder in alle 4 Hauptrichtungen
-            diagonal_range = 1    # 1 Feld diagonal
-        elif isinstance(unit, Archer):
-            orthogonal_range = 1  # 1 Feld in alle Richtungen
-            diagonal_range = 1
-        elif isinstance(unit, Rider):
-            orthogonal_range = 4  # 4 Felder in alle 4 Hauptrichtungen
-            diagonal_range = 2    # 2 Felder diagonal
-        else:
-            orthogonal_range = max_distance
-            diagonal_range = max_distance
-        
-        # Reduziere Reichweite basierend auf aktuellem Terrain
-        current_terrain = self.terrain[start_y][start_x]
-        movement_penalty = current_terrain.get_movement_penalty(unit)
-        orthogonal_range = max(0, orthogonal_range - movement_penalty)
-        diagonal_range = max(0, diagonal_range - movement_penalty)
+        # Reichweite hängt vom Terrain am Startfeld ab: Schablone für (Einheitentyp, Strafe)
+        movement_penalty = self.terrain[start_y][start_x].get_movement_penalty(unit)
+        stencil = get_movement_stencil(unit.type_index, movement_penalty)
         
-        # Prüfe alle Positionen im Bewegungsradius
-        for x in range(self.size):
-            for y in range(self.size):
-                if (x, y) == (start_x, start_y):
-                    continue  # Startposition überspringen
-                    
-                # Berechne Distanz
-                dist_x = abs(start_x - x)
-                dist_y = abs(start_y - y)
-                
-                # Bestimme, ob Position erreichbar ist
-                is_reachable = False
-                
-                if dist_x == 0 and dist_y == 0:
-                    continue  # Startposition
-                elif dist_x == 0:  # Vertikale Bewegung
-                    is_reachable = dist_y <= orthogonal_range
-                elif dist_y == 0:  # Horizontale Bewegung
-                    is_reachable = dist_x <= orthogonal_range
-                elif dist_x == dist_y:  # Diagonale Bewegung
-                    is_reachable = dist_x <= diagonal_range
-                else:
-                    # Kombinierte Bewegung
-                    total_steps = dist_x + dist_y
-                    is_reachable = total_steps <= orthogonal_range and max(dist_x, dist_y) <= diagonal_range
-                
-                if is_reachable:
-                    # Prüfe, ob der Weg frei ist und das Ziel passierbar ist
-                    if self._is_path_clear(start_x, start_y, x, y) and self.terrain[y][x].is_passable(unit):
-                        reachable.add((x, y))
+        size = self.size
+        grid = self.grid
+        terrain = self.terrain
+        for dx, dy, ray in stencil:
+            x = start_x + dx
+            y = start_y + dy
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            # Weg frei? (Zwischenfelder liegen innerhalb des Rechtecks von Start und Ziel)
+            for ray_dx, ray_dy in ray:
+                ray_x = start_x + ray_dx
+                ray_y = start_y + ray_dy
+                if grid[ray_y][ray_x] is not None or terrain[ray_y][ray_x].terrain_type == TerrainType.MOUNTAIN:
+                    break
+            else:
+                if terrain[y][x].is_passable(unit):
+                    reachable.add((x, y))
         
         return list(reachable)
     
@@ -246,15 +277,8 @@ class Board:
         start_x, start_y = unit.position
         attackable = []
         
-        # Bestimme Angriffsreichweite basierend auf Einheitentyp
-        if isinstance(unit, Swordsman):
-            range_distance = 2  # Lanze
-        elif isinstance(unit, Archer):
-            range_distance = 6  # Bogen
-        elif isinstance(unit, Rider):
-            range_distance = 1  # Nahkampf
-        else:
-            range_distance = 1
+        range_distance = ATTACK_RANGE[unit.type_index]
+        needs_line_of_sight = NEEDS_LINE_OF_SIGHT[unit.type_index]
         
         # Prüfe alle Positionen in Reichweite
         for x in range(self.size):
@@ -267,8 +291,8 @@ class Board:
                 if distance <= range_distance:
                     target_unit = self.get_unit_at(x, y)
                     if target_unit and target_unit.player != unit.player:
-                        # Prüfe Sichtlinie für Bogenschützen
-                        if isinstance(unit, Archer):
+                        # Prüfe Sichtlinie für Fernkämpfer
+                        if needs_line_of_sight:
                             if not self._has_line_of_sight(start_x, start_y, x, y):
                                 continue
                         attackable.append((x, y))
@@ -277,6 +301,12 @@ class Board:
     
     def _has_line_of_sight(self, start_x, start_y, end_x, end_y):
         """Prüft, ob eine Sichtlinie zwischen zwei Punkten besteht."""
+        # Vorberechnete Tabelle, falls vorhanden (hängt nur vom Terrain ab)
+        if self.analysis is not None:
+            visible = self.analysis.has_line_of_sight(start_x, start_y, end_x, end_y)
+            if visible is not None:
+                return visible
+
         # Prüfe Start- und Endposition auf Berge
         if self.terrain[start_y][start_x].blocks_line_of_sight():
             return False
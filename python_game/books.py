@@ -0,0 +1,1015 @@
+import argparse
+import hashlib
+import math
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .actions import Action, MOVE, ATTACK, SPECIAL, apply_action, legal_actions
+from .board import Board, get_terrain_layout
+from .combat import terrain_damage
+from .player import Player
+from .protocol import UNIT_CLASSES, capture_units, encode_keyframe
+from .terrain import GRASS, TERRAIN_DEFENSE, TERRAIN_HEALING
+from .unit_defs import UNIT_TYPES, UNIT_STATS, ATTACK_RANGE, MOVE_ORTHOGONAL, MOVE_DIAGONAL, NEEDS_LINE_OF_SIGHT, \
+    DAMAGE_MODIFIER, SPECIAL_DAMAGE, PASSABLE, MOVEMENT_PENALTY
+
+# Eröffnungsbuch und Endspieltabellen für die KI "hard" (Standardkarte 9x9, Modus "single", Rautenbewegung).
+# Alle werden offline erzeugt (python3 -m python_game.books) und liegen als Binärdateien in data/.
+# Die KI blendet sie per mmap ein und liest pro Zug nur wenige Bytes: keine Suche in diesen Phasen.
+#
+# Eröffnungsbuch: Stellungen der ersten Halbzüge ab der Startaufstellung -> bester Zug laut Rollouts
+# (Selbstspiele der KI nach jedem möglichen Zug). Schlüssel ist ein 64-Bit-Hash des Keyframes der
+# Stellung (wie ai_service.snapshot_game), abgelegt in einer Hash-Tabelle mit offener Adressierung.
+#
+# Endspieltabelle: eine Einheit gegen eine, gelöst per Rückwärtsanalyse. Zustand sind Typ und Feld
+# beider Einheiten und die Treffer, die jede noch aushält (HP / Schaden des Gegners, aufgerundet).
+# Bewegung, Reichweite und Sichtlinie entsprechen genau den Regeln, und die Tabelle gilt nur, wenn beide
+# Spezialfähigkeiten verbraucht sind. Gelöst werden nur Stellungen auf neutralen Feldern (ohne
+# Terrain-Verteidigung und Heilquelle), dort ist der Schaden pro Treffer fest. Züge in Wald oder auf
+# eine Heilquelle gelten als Folgestellungen mit unbekanntem Wert: eine Stellung kann über sie
+# gewonnen, aber nie verloren sein. Steht eine Einheit auf Wald oder einer Heilquelle, gibt probe None.
+# Die KI fragt in jedem Zug neu mit den echten HP ab.
+#
+# Zwei gegen eins (zwei verschiedene Typen gegen einen beliebigen): gleiche Regeln und Felder, gelöst mit
+# NumPy Ebene für Ebene (rund 8 * 10^8 Zustände, wenige Minuten). Das Paar hält Treffer nur von einem Typ
+# aus, die einzelne Einheit von zweien; ihre HP werden daher zu Klassen gleichwertiger Werte (hp_classes).
+# Gespeichert sind die Halbzüge bis zum nächsten Schlagen: danach ist die Partie aus oder eine Stellung
+# der 1v1-Tabelle, deren Ausgang für das Schlagen zählt. Ein Byte pro Zustand, zlib-komprimiert in Blöcken.
+
+# Erhöhen, wenn sich Aufbau oder Berechnung der Dateien ändern
+FORMAT_VERSION = 1  # Eröffnungsbuch
+ENDGAME_FORMAT_VERSION = 2  # Endspieltabellen (2: nur neutrale Felder)
+BOARD_SIZE = 9
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+ENDGAME_TABLE_PATH = os.path.join(DATA_DIR, "endgame_1v1.bin")
+ENDGAME_2V1_PATH = os.path.join(DATA_DIR, "endgame_2v1.bin")
+OPENING_BOOK_PATH = os.path.join(DATA_DIR, "opening_book.bin")
+
+# Endspieltabelle: pro Zustand zwei Bytes (Wert, Aktion)
+# Wert: n > 0 gewinnt in n Halbzügen, 256 - n verliert in n Halbzügen, 0 Remis (höchstens MAX_DISTANCE)
+# Aktion: Zielfeld (y * 9 + x) einer Bewegung, ACTION_ATTACK oder ACTION_PASS
+MAX_DISTANCE = 127
+ACTION_ATTACK = 254
+ACTION_PASS = 255
+_TABLE_MAGIC = b"BHEG"
+_TABLE_HEADER = struct.Struct("<4s8sBB")  # Magic, Regel-Fingerabdruck, Brettgröße, Anzahl Typen
+_TABLE_2V1_MAGIC = b"BHE2"  # Gleicher Kopf, danach Block-Offsets und zlib-Blöcke
+
+# Eröffnungsbuch: Slot = Schlüssel, Aktion (0: leer), Feld der Einheit, Zielfeld
+_BOOK_MAGIC = b"BHOB"
+_BOOK_HEADER = struct.Struct("<4s8sI")  # Magic, Regel-Fingerabdruck, Anzahl Slots (Zweierpotenz)
+_BOOK_SLOT = struct.Struct("<QBBBx")
+_BOOK_OPS = (None, MOVE, ATTACK, SPECIAL)
+
+# Rollouts für das Eröffnungsbuch: die Buchseite spielt "hard", der Gegner reihum diese Stufen
+ROLLOUT_OPPONENTS = ("hard", "medium", "easy")
+ROLLOUT_TURNS = 120  # Danach entscheidet das Material
+
+def rules_fingerprint(terrain_codes, version=FORMAT_VERSION):
+    """Fingerabdruck aller Regeln, von denen die Dateien abhängen (passt er nicht, werden sie ignoriert)."""
+    rules = (version, UNIT_TYPES, UNIT_STATS, ATTACK_RANGE, MOVE_ORTHOGONAL, MOVE_DIAGONAL,
+             NEEDS_LINE_OF_SIGHT, DAMAGE_MODIFIER, SPECIAL_DAMAGE, sorted(PASSABLE.items()),
+             sorted(MOVEMENT_PENALTY.items()), TERRAIN_DEFENSE, TERRAIN_HEALING, bytes(terrain_codes))
+    return hashlib.blake2b(repr(rules).encode("utf-8"), digest_size=8).digest()
+
+def _default_codes():
+    return get_terrain_layout(BOARD_SIZE)[0]
+
+def is_covered(game):
+    """Gelten Buch und Tabelle für dieses Spiel? (Standardkarte, Modus "single", Rautenbewegung)"""
+    board = game.board
+    return (game.turn_mode == "single" and game.movement_rules == "rhombus" and board.terrain_seed is None
+            and board.size == BOARD_SIZE and board.terrain_codes == _default_codes())
+
+def _map_file(path, magic, header, version=FORMAT_VERSION):
+    """Blendet eine Datei schreibgeschützt ein; None, wenn sie fehlt oder nicht passt."""
+    if not os.path.exists(path) or os.path.getsize(path) < header.size:
+        return None, None
+    with open(path, "rb") as data_file:
+        data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    fields = header.unpack_from(data, 0)
+    if fields[0] != magic or fields[1] != rules_fingerprint(_default_codes(), version):
+        print(f"Warnung: {os.path.basename(path)} passt nicht zu den aktuellen Regeln und wird ignoriert "
+              f"(neu erzeugen mit python3 -m python_game.books).")
+        data.close()
+        return None, None
+    return data, fields
+
+def _write_file(path, content):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as data_file:
+        data_file.write(content)
+    os.replace(temporary_path, path)
+
+# --- Endspieltabelle ---------------------------------------------------------------------------
+
+def neutral_cells(terrain_codes):
+    """Pro Feld: ohne Terrain-Verteidigung und Heilquelle (nur dort rechnet die Tabelle)."""
+    return [TERRAIN_DEFENSE[code] == 1.0 and TERRAIN_HEALING[code] == 0 for code in terrain_codes]
+
+def hits_to_kill(health, attacker_type, target_type):
+    """Treffer, die eine Einheit mit health HP gegen attacker_type auf einem neutralen Feld noch aushält."""
+    return max(1, math.ceil(health / terrain_damage(attacker_type, target_type, GRASS)))
+
+def _table_layout(hits):
+    """Byte-Offset jeder Teiltabelle [Typ am Zug][anderer Typ] und Gesamtgröße."""
+    cells = BOARD_SIZE * BOARD_SIZE
+    offsets = []
+    total = 0
+    for mover_type, row in enumerate(hits):
+        offsets.append([])
+        for other_type in range(len(row)):
+            offsets[-1].append(total)
+            total += 2 * cells * cells * hits[mover_type][other_type] * hits[other_type][mover_type]
+    return offsets, total
+
+class EndgameTable:
+    """Eingeblendete Endspieltabelle (eine Einheit gegen eine)."""
+
+    def __init__(self, data, offset, hits):
+        self.data = data  # mmap oder bytes
+        self.hits = hits  # hits[a][b]: Treffer, die Typ a von Typ b aushält
+        self.neutral = neutral_cells(_default_codes())
+        offsets, _ = _table_layout(hits)
+        self._offsets = [[offset + value for value in row] for row in offsets]
+
+    def entry(self, mover_type, mover_cell, mover_hits, other_type, other_cell, other_hits):
+        """(Distanz, Aktionscode) für den Spieler am Zug: Distanz > 0 Gewinn, < 0 Verlust, 0 Remis."""
+        cells = BOARD_SIZE * BOARD_SIZE
+        other_max = self.hits[other_type][mover_type]
+        index = ((mover_cell * cells + other_cell) * self.hits[mover_type][other_type] + mover_hits - 1) \
+            * other_max + other_hits - 1
+        position = self._offsets[mover_type][other_type] + 2 * index
+        value = self.data[position]
+        return (value - 256 if value > MAX_DISTANCE else value), self.data[position + 1]
+
+    def probe(self, game):
+        """(Distanz, Action oder None für Passen) für den Spieler am Zug, oder None, wenn nicht abgedeckt."""
+        mover = game.players[game.current_turn]
+        own = [unit for unit in mover.units if unit.position is not None]
+        enemies = [unit for player in game.players if player is not mover
+                   for unit in player.units if unit.position is not None]
+        if len(own) != 1 or len(enemies) != 1 or game.delayed_arrow_storm_effects:
+            return None
+        unit, enemy = own[0], enemies[0]
+        if not (unit.special_ability_used and enemy.special_ability_used) or unit.shield_ready() or enemy.shield_ready():
+            return None
+        unit_cell = unit.position[1] * BOARD_SIZE + unit.position[0]
+        enemy_cell = enemy.position[1] * BOARD_SIZE + enemy.position[0]
+        if not (self.neutral[unit_cell] and self.neutral[enemy_cell]):
+            return None
+        unit_type, enemy_type = unit.type_index, enemy.type_index
+        distance, code = self.entry(
+            unit_type, unit_cell,
+            min(self.hits[unit_type][enemy_type], hits_to_kill(unit.health, enemy_type, unit_type)),
+            enemy_type, enemy_cell,
+            min(self.hits[enemy_type][unit_type], hits_to_kill(enemy.health, unit_type, enemy_type)))
+        if distance == 0:
+            return None
+        if code == ACTION_PASS:
+            return distance, None
+        if code == ACTION_ATTACK:
+            return distance, Action(ATTACK, unit.position, enemy.position)
+        return distance, Action(MOVE, unit.position, (code % BOARD_SIZE, code // BOARD_SIZE))
+
+def _geometry(board):
+    """
+    Regeln pro Typ als Tabellen über Feldindizes (y * Größe + x):
+    passable[t][Feld], reach[t][Start][Blocker] -> Zielfelder, attack[t][Start][Ziel].
+    """
+    size = board.size
+    cells = size * size
+    owner, other = Player(1, "Tabelle"), Player(2, "Tabelle")
+    blocker = UNIT_CLASSES[0](other)
+    passable, reach, attack = [], [], []
+    for type_index, unit_class in enumerate(UNIT_CLASSES):
+        unit = unit_class(owner)
+        type_passable = [board.terrain[cell // size][cell % size].is_passable(unit) for cell in range(cells)]
+        type_reach = [None] * cells
+        type_attack = [None] * cells
+        for start in range(cells):
+            if not type_passable[start]:
+                continue
+            start_x, start_y = start % size, start // size
+            unit.position = (start_x, start_y)
+            per_blocker = []
+            for blocked in range(cells):
+                if blocked == start:
+                    per_blocker.append(())
+                    continue
+                board.grid[blocked // size][blocked % size] = blocker
+                targets = {y * size + x for x, y in board.get_reachable_positions_rhombus(unit, unit.movement_speed)}
+                board.grid[blocked // size][blocked % size] = None
+                targets.discard(blocked)
+                per_blocker.append(tuple(sorted(targets)))
+            type_reach[start] = per_blocker
+            type_attack[start] = bytes(
+                target != start
+                and max(abs(target % size - start_x), abs(target // size - start_y)) <= ATTACK_RANGE[type_index]
+                and (not NEEDS_LINE_OF_SIGHT[type_index]
+                     or board._has_line_of_sight(start_x, start_y, target % size, target // size))
+                for target in range(cells))
+        passable.append(type_passable)
+        reach.append(type_reach)
+        attack.append(type_attack)
+    return passable, reach, attack
+
+def solve_endgames(log=print):
+    """
+    Rückwärtsanalyse aller Stellungen eine gegen eine Einheit auf der Standardkarte.
+    Gibt (hits, tables) zurück; tables[a][b] enthält die Einträge mit Typ a am Zug (siehe EndgameTable).
+    """
+    started = time.perf_counter()
+    board = Board(BOARD_SIZE)
+    cells = BOARD_SIZE * BOARD_SIZE
+    types = range(len(UNIT_CLASSES))
+    passable, reach, attack = _geometry(board)
+    neutral = neutral_cells(board.terrain_codes)
+    # Rückwärts: von welchen neutralen Startfeldern erreicht Typ t das Feld ziel, wenn blocker besetzt ist
+    sources = [[[[] for _ in range(cells)] for _ in range(cells)] for _ in types]
+    for type_index in types:
+        for start in range(cells):
+            if reach[type_index][start] is None or not neutral[start]:
+                continue
+            for blocked, targets in enumerate(reach[type_index][start]):
+                for target in targets:
+                    sources[type_index][target][blocked].append(start)
+    hits = [[hits_to_kill(UNIT_STATS[a]["health"], b, a) for b in types] for a in types]
+    log(f"Geometrie vorberechnet ({time.perf_counter() - started:.1f}s), Treffer: {hits}")
+
+    # Pro Paar (Typ am Zug, anderer Typ): Distanz (> 0 Gewinn, < 0 Verlust, 0 offen),
+    # Aktion und Anzahl noch nicht als Gewinn des Gegners erkannter Folgestellungen
+    distance, action, remaining = {}, {}, {}
+    queue = deque()
+    for a in types:
+        for b in types:
+            mover_max, other_max = hits[a][b], hits[b][a]
+            block = mover_max * other_max
+            pair_distance = [0] * (cells * cells * block)
+            pair_remaining = bytearray(len(pair_distance))
+            pair_action = bytearray((ACTION_PASS,)) * len(pair_distance)
+            for mover_cell in range(cells):
+                if not (passable[a][mover_cell] and neutral[mover_cell]):
+                    continue
+                for other_cell in range(cells):
+                    if other_cell == mover_cell or not (passable[b][other_cell] and neutral[other_cell]):
+                        continue
+                    can_attack = attack[a][mover_cell][other_cell]
+                    base = (mover_cell * cells + other_cell) * block
+                    # Folgestellungen: Bewegungen (auch auf nicht neutrale Felder, die nie entschieden werden),
+                    # Angriff, Passen
+                    children = len(reach[a][mover_cell][other_cell]) + can_attack + 1
+                    pair_remaining[base:base + block] = bytes((children,)) * block
+                    if can_attack:
+                        # Gegner hält nur noch einen Treffer aus: Gewinn im nächsten Halbzug
+                        for mover_hits in range(mover_max):
+                            index = base + mover_hits * other_max
+                            pair_distance[index] = 1
+                            pair_remaining[index] = 0
+                            pair_action[index] = ACTION_ATTACK
+                            queue.append((a, b, mover_cell, other_cell, mover_hits, 0))
+            distance[a, b] = pair_distance
+            remaining[a, b] = pair_remaining
+            action[a, b] = pair_action
+
+    resolved = 0
+    while queue:
+        a, b, mover_cell, other_cell, mover_hits, other_hits = queue.popleft()
+        resolved += 1
+        mover_max, other_max = hits[a][b], hits[b][a]
+        value = distance[a, b][((mover_cell * cells + other_cell) * mover_max + mover_hits) * other_max + other_hits]
+        # Vorgänger: b war am Zug (Feld q, Treffer von a vor einem Angriff)
+        predecessors = [(other_cell, mover_hits, ACTION_PASS)]
+        if mover_hits + 1 < mover_max and attack[b][other_cell][mover_cell]:
+            predecessors.append((other_cell, mover_hits + 1, ACTION_ATTACK))
+        for start in sources[b][other_cell][mover_cell]:
+            predecessors.append((start, mover_hits, other_cell))
+        previous_distance = distance[b, a]
+        previous_remaining = remaining[b, a]
+        previous_action = action[b, a]
+        block = other_max * mover_max
+        for start, previous_hits, code in predecessors:
+            index = (start * cells + mover_cell) * block + other_hits * mover_max + previous_hits
+            if previous_distance[index] != 0:
+                continue
+            if value < 0:
+                # a verliert hier: b gewinnt mit diesem Zug
+                previous_distance[index] = 1 - value
+                previous_action[index] = code
+                queue.append((b, a, start, mover_cell, other_hits, previous_hits))
+            else:
+                # Alle Züge von b führen zu Gewinnen von a: Verlust, zuletzt gefundener Zug hält am längsten
+                previous_remaining[index] -= 1
+                if previous_remaining[index] == 0:
+                    previous_distance[index] = -(value + 1)
+                    previous_action[index] = code
+                    queue.append((b, a, start, mover_cell, other_hits, previous_hits))
+
+    tables = [[None] * len(types) for _ in types]
+    for (a, b), pair_distance in distance.items():
+        entries = bytearray(2 * len(pair_distance))
+        entries[0::2] = bytes(min(value, MAX_DISTANCE) if value >= 0 else 256 - min(-value, MAX_DISTANCE)
+                              for value in pair_distance)
+        entries[1::2] = action[a, b]
+        tables[a][b] = bytes(entries)
+    log(f"{resolved} entschiedene Stellungen von {sum(len(d) for d in distance.values())} "
+        f"({time.perf_counter() - started:.1f}s)")
+    return hits, tables
+
+def write_endgame_table(hits, tables, path=ENDGAME_TABLE_PATH):
+    header = _TABLE_HEADER.pack(_TABLE_MAGIC, rules_fingerprint(_default_codes(), ENDGAME_FORMAT_VERSION),
+                                BOARD_SIZE, len(hits))
+    content = header + bytes(value for row in hits for value in row) + b"".join(b"".join(row) for row in tables)
+    _write_file(path, content)
+    return len(content)
+
+def load_endgame_table(path=ENDGAME_TABLE_PATH):
+    """Blendet die Endspieltabelle ein; None, wenn sie fehlt oder nicht zu den Regeln passt."""
+    data, fields = _map_file(path, _TABLE_MAGIC, _TABLE_HEADER, ENDGAME_FORMAT_VERSION)
+    if data is None:
+        return None
+    _, _, size, type_count = fields
+    offset = _TABLE_HEADER.size + type_count * type_count
+    hits = [list(data[_TABLE_HEADER.size + row * type_count:_TABLE_HEADER.size + (row + 1) * type_count])
+            for row in range(type_count)]
+    if size != BOARD_SIZE or type_count != len(UNIT_CLASSES) or offset + _table_layout(hits)[1] != len(data):
+        data.close()
+        return None
+    return EndgameTable(data, offset, hits)
+
+# --- Endspieltabelle zwei gegen eins -----------------------------------------------------------
+
+def hp_classes(max_health, first_damage, second_damage):
+    """
+    HP einer einzelnen Einheit gegen zwei Angreifertypen (Schaden pro Treffer first_damage, second_damage)
+    als Klassen: zwei HP-Werte sind gleichwertig, wenn genau dieselben Trefferfolgen sie besiegen
+    (i Treffer vom ersten und j vom zweiten Typ). Die Klasse nach einem Treffer hängt nur von der Klasse ab.
+    Gibt (Klasse pro HP, Folgeklasse nach Treffer des ersten Typs, nach Treffer des zweiten Typs (-1: besiegt),
+    Treffer nur vom ersten Typ, nur vom zweiten Typ) zurück, die letzten vier als Listen pro Klasse.
+    """
+    profiles = {}
+    class_of = [None] * (max_health + 1)
+    for health in range(1, max_health + 1):
+        # Pro Anzahl Treffer des zweiten Typs: nötige Treffer des ersten Typs
+        profile = tuple(max(0, math.ceil((health - hits * second_damage) / first_damage))
+                        for hits in range(math.ceil(health / second_damage) + 1))
+        class_of[health] = profiles.setdefault(profile, len(profiles))
+    after_first, after_second = [None] * len(profiles), [None] * len(profiles)
+    for health in range(1, max_health + 1):
+        after_first[class_of[health]] = class_of[health - first_damage] if health > first_damage else -1
+        after_second[class_of[health]] = class_of[health - second_damage] if health > second_damage else -1
+    return (class_of, after_first, after_second,
+            [profile[0] for profile in profiles], [len(profile) - 1 for profile in profiles])
+
+def _table_cells(board):
+    """Pro Typ die Felder, auf denen die Tabellen rechnen (begehbar und neutral), aufsteigend."""
+    size = board.size
+    neutral = neutral_cells(board.terrain_codes)
+    return [[cell for cell in range(size * size)
+             if neutral[cell] and board.terrain[cell // size][cell % size].passable[type_index]]
+            for type_index in range(len(UNIT_CLASSES))]
+
+class EndgameCombination:
+    """
+    Eine Besetzung zwei gegen eins: Typ der einzelnen Einheit und die Typen des Paars (first < second).
+    Zustand: Felder (Indizes in die Felder des jeweiligen Typs, _table_cells), Treffer, die first und second
+    noch aushalten, und die HP-Klasse der einzelnen Einheit (hp_classes).
+    Die Datei hat pro Feldpaar des Paars einen Block mit dem Paar am Zug und pro Feld der einzelnen Einheit
+    einen mit ihr am Zug: alle Folgestellungen eines Zugs liegen im selben Block.
+    """
+
+    def __init__(self, single, first, second, hits, cells, first_block):
+        self.single, self.first, self.second = single, first, second
+        (self.class_of, self.after_first, self.after_second,
+         self.hits_first, self.hits_second) = hp_classes(UNIT_STATS[single]["health"],
+                                                          terrain_damage(first, single, GRASS),
+                                                          terrain_damage(second, single, GRASS))
+        # (Feld first, Feld second, Feld single, Treffer first, Treffer second, Klasse)
+        self.shape = (len(cells[first]), len(cells[second]), len(cells[single]),
+                      hits[first][single], hits[second][single], len(self.hits_first))
+        self.pair_block = first_block
+        self.single_block = first_block + self.shape[0] * self.shape[1]
+        self.end_block = self.single_block + self.shape[2]
+
+    def pair_entry(self, state):
+        """(Blocknummer, Index) einer Stellung mit dem Paar am Zug; state wie in probe, Treffer ab 1."""
+        first_cell, second_cell, single_cell, first_hits, second_hits, hp_class = state
+        _, second_count, _, first_max, second_max, class_count = self.shape
+        return (self.pair_block + first_cell * second_count + second_cell,
+                ((single_cell * first_max + first_hits - 1) * second_max + second_hits - 1) * class_count + hp_class)
+
+    def single_entry(self, state):
+        """(Blocknummer, Index) einer Stellung mit der einzelnen Einheit am Zug."""
+        first_cell, second_cell, single_cell, first_hits, second_hits, hp_class = state
+        _, second_count, _, first_max, second_max, class_count = self.shape
+        return (self.single_block + single_cell,
+                (((first_cell * second_count + second_cell) * first_max + first_hits - 1) * second_max
+                 + second_hits - 1) * class_count + hp_class)
+
+def _combinations(hits, cells):
+    """Alle Besetzungen zwei gegen eins in Dateireihenfolge (zwei gleiche Typen kommen nicht vor)."""
+    combinations = []
+    block = 0
+    for single in range(len(UNIT_CLASSES)):
+        for first in range(len(UNIT_CLASSES)):
+            for second in range(first + 1, len(UNIT_CLASSES)):
+                combinations.append(EndgameCombination(single, first, second, hits, cells, block))
+                block = combinations[-1].end_block
+    return combinations
+
+class Endgame2v1Table:
+    """
+    Eingeblendete Endspieltabelle zwei gegen eins. Pro Zustand ein Byte: Halbzüge bis zum nächsten Schlagen
+    (kodiert wie in der 1v1-Tabelle), danach entscheidet die 1v1-Tabelle. Aktionen sind nicht gespeichert,
+    der beste Zug folgt aus den Werten der Folgestellungen (alle im selben komprimierten Block).
+    """
+
+    def __init__(self, data, offsets, hits, cells, endgame_1v1):
+        self.data = data
+        self._offsets = offsets  # Byte-Offset jedes Blocks, zuletzt das Ende
+        self.endgame_1v1 = endgame_1v1
+        self.cells = cells
+        self._cell_index = [{cell: index for index, cell in enumerate(type_cells)} for type_cells in cells]
+        self._combinations = {(combination.single, combination.first, combination.second): combination
+                              for combination in _combinations(hits, cells)}
+        self._cached = (None, None)  # (Blocknummer, Inhalt) des zuletzt entpackten Blocks
+
+    def entry(self, block, index):
+        """Distanz aus Sicht des Spielers am Zug: > 0 Gewinn, < 0 Verlust, 0 Remis oder nicht entschieden."""
+        if self._cached[0] != block:
+            self._cached = (block, zlib.decompress(self.data[self._offsets[block]:self._offsets[block + 1]]))
+        value = self._cached[1][index]
+        return value - 256 if value > MAX_DISTANCE else value
+
+    def probe(self, game):
+        """(Distanz, Action oder None für Passen) für den Spieler am Zug, oder None, wenn nicht abgedeckt."""
+        mover = game.players[game.current_turn]
+        own = [unit for unit in mover.units if unit.position is not None]
+        enemies = [unit for player in game.players if player is not mover
+                   for unit in player.units if unit.position is not None]
+        if game.delayed_arrow_storm_effects or sorted((len(own), len(enemies))) != [1, 2]:
+            return None
+        if any(not unit.special_ability_used or unit.shield_ready() for unit in own + enemies):
+            return None
+        pair_to_move = len(own) == 2
+        single = enemies[0] if pair_to_move else own[0]
+        first, second = sorted(own if pair_to_move else enemies, key=lambda unit: unit.type_index)
+        combination = self._combinations.get((single.type_index, first.type_index, second.type_index))
+        if combination is None:
+            return None
+        state = [self._cell_index[unit.type_index].get(unit.position[1] * BOARD_SIZE + unit.position[0])
+                 for unit in (first, second, single)]
+        if None in state:
+            return None
+        state += [min(combination.shape[3], hits_to_kill(first.health, single.type_index, first.type_index)),
+                  min(combination.shape[4], hits_to_kill(second.health, single.type_index, second.type_index)),
+                  combination.class_of[single.health]]
+
+        # Wert jeder Aktion für den Spieler am Zug (None: unbekannt); Gewinn über den schnellsten Zug,
+        # Verlust nur, wenn alle Folgestellungen bekannt sind, dann mit dem Zug, der am längsten hält
+        values = [(self._action_value(game, combination, state, pair_to_move, (first, second, single), action), action)
+                  for action in legal_actions(game) + [None]]
+        wins = [entry for entry in values if entry[0] is not None and entry[0] > 0]
+        if wins:
+            return min(wins, key=lambda entry: entry[0])
+        if any(value is None for value, _ in values):
+            return None
+        return min(values, key=lambda entry: entry[0])
+
+    def _action_value(self, game, combination, state, pair_to_move, units, action):
+        """Wert einer Aktion: n > 0 gewinnt, -n verliert (n Halbzüge bis nach dem nächsten Schlagen), None unbekannt."""
+        child = list(state)
+        if action is not None:
+            slot = units.index(game.board.get_unit_at(*action.unit_position))
+            if action.op == MOVE:
+                child[slot] = self._cell_index[units[slot].type_index].get(
+                    action.target[1] * BOARD_SIZE + action.target[0])
+                if child[slot] is None:
+                    return None  # Wald oder Heilquelle
+            elif pair_to_move:
+                child[5] = (combination.after_first if slot == 0 else combination.after_second)[child[5]]
+                if child[5] == -1:
+                    return 1  # Letzte gegnerische Einheit geschlagen
+            else:
+                hit = 3 if action.target == units[0].position else 4
+                if child[hit] == 1:
+                    # Einheit des Paars geschlagen: 1v1-Stellung mit der übrigen Einheit am Zug
+                    value = self._after_capture(combination, child, hit == 3)
+                    return None if value == 0 else 1 if value < 0 else -1
+                child[hit] -= 1
+        value = self.entry(*(combination.single_entry(child) if pair_to_move else combination.pair_entry(child)))
+        if value == 0:
+            return None
+        return 1 - value if value < 0 else -(value + 1)
+
+    def _after_capture(self, combination, state, first_captured):
+        """Wert der 1v1-Stellung nach dem Schlagen aus Sicht der übrigen Einheit des Paars (0: unbekannt)."""
+        if self.endgame_1v1 is None:
+            return 0
+        first_cell, second_cell, single_cell, first_hits, second_hits, hp_class = state
+        if first_captured:
+            remaining, cell, hits, single_hits = combination.second, second_cell, second_hits, combination.hits_second
+        else:
+            remaining, cell, hits, single_hits = combination.first, first_cell, first_hits, combination.hits_first
+        return self.endgame_1v1.entry(remaining, self.cells[remaining][cell], hits, combination.single,
+                                      self.cells[combination.single][single_cell], single_hits[hp_class])[0]
+
+def _geometry_arrays(board):
+    """
+    Die Regeln aus _geometry als NumPy-Felder über Feldindizes, pro Typ: free[Start, Ziel] (ohne Blocker
+    erreichbar), ray[Start, Ziel, Blocker] (Blocker steht auf dem Weg oder dem Ziel), attack[Start, Ziel].
+    """
+    import numpy
+    cells = board.size * board.size
+    passable, reach, attack = _geometry(board)
+    free_arrays, ray_arrays, attack_arrays = [], [], []
+    for type_index in range(len(UNIT_CLASSES)):
+        free = numpy.zeros((cells, cells), dtype=bool)
+        ray = numpy.zeros((cells, cells, cells), dtype=bool)
+        type_attack = numpy.zeros((cells, cells), dtype=bool)
+        for start in range(cells):
+            if not passable[type_index][start]:
+                continue
+            per_blocker = numpy.zeros((cells, cells), dtype=bool)  # [Blocker, Ziel]
+            for blocked, targets in enumerate(reach[type_index][start]):
+                per_blocker[blocked, list(targets)] = True
+            free[start] = per_blocker.any(axis=0)
+            ray[start] = (free[start] & ~per_blocker).T
+            type_attack[start] = numpy.frombuffer(attack[type_index][start], dtype=bool)
+        free_arrays.append(free)
+        ray_arrays.append(ray)
+        attack_arrays.append(type_attack)
+    return free_arrays, ray_arrays, attack_arrays
+
+def _signed_values(endgame_1v1, mover_type, other_type):
+    """Distanzen der 1v1-Tabelle als NumPy-Feld [Feld am Zug, anderes Feld, Treffer am Zug - 1, andere - 1]."""
+    import numpy
+    hits = endgame_1v1.hits
+    cells = BOARD_SIZE * BOARD_SIZE
+    shape = (cells, cells, hits[mover_type][other_type], hits[other_type][mover_type])
+    raw = numpy.frombuffer(endgame_1v1.data, dtype=numpy.uint8, count=2 * math.prod(shape),
+                           offset=endgame_1v1._offsets[mover_type][other_type])[0::2].astype(numpy.int16)
+    return numpy.where(raw > MAX_DISTANCE, raw - 256, raw).reshape(shape)
+
+def solve_endgames_2v1(endgame_1v1, log=print):
+    """
+    Rückwärtsanalyse aller Stellungen zwei gegen eins auf den neutralen Feldern der Standardkarte (braucht NumPy).
+    Liefert pro Besetzung (EndgameCombination, Werte mit dem Paar am Zug, Werte mit der einzelnen Einheit am Zug),
+    beide als uint8-Felder der Form combination.shape, kodiert wie die 1v1-Tabelle. Gezählt werden die Halbzüge
+    bis zum nächsten Schlagen (einschließlich): danach ist die Partie aus oder eine 1v1-Stellung, deren Ausgang
+    aus endgame_1v1 kommt. Der Gewinner schlägt so schnell wie möglich, der Verlierer zögert es hinaus.
+    """
+    import numpy
+    started = time.perf_counter()
+    board = Board(BOARD_SIZE)
+    cells = [numpy.array(type_cells, dtype=numpy.intp) for type_cells in _table_cells(board)]
+    free, ray, attack = _geometry_arrays(board)
+    geometry = []
+    for type_index, type_cells in enumerate(cells):
+        # Bewegungen von jedem Startfeld bei zwei Blockern: [Start, Blocker, Blocker]
+        open_moves = (free[type_index][type_cells][:, :, None] & ~ray[type_index][type_cells]).astype(numpy.int32)
+        move_counts = open_moves.transpose(0, 2, 1) @ open_moves
+        # Startfelder (Indizes) pro Zielfeld (Index), mit -1 aufgefüllt
+        into = free[type_index][type_cells][:, type_cells]
+        sources = numpy.full((len(type_cells), into.sum(axis=0).max()), -1, dtype=numpy.intp)
+        for target in range(len(type_cells)):
+            starts = numpy.flatnonzero(into[:, target])
+            sources[target, :len(starts)] = starts
+        geometry.append((move_counts, sources, ray[type_index][type_cells]))
+    log(f"Geometrie vorberechnet ({time.perf_counter() - started:.1f}s)")
+
+    for combination in _combinations(endgame_1v1.hits, [list(type_cells) for type_cells in cells]):
+        pair_values, single_values, levels = _solve_combination(combination, cells, geometry, attack, endgame_1v1)
+        decided = [numpy.count_nonzero(values) for values in (pair_values, single_values)]
+        log(f"{UNIT_TYPES[combination.first]} + {UNIT_TYPES[combination.second]} gegen "
+            f"{UNIT_TYPES[combination.single]}: {decided[0]} + {decided[1]} entschiedene Stellungen von "
+            f"{2 * pair_values.size}, {levels} Halbzüge ({time.perf_counter() - started:.0f}s)")
+        yield combination, pair_values, single_values
+
+def _solve_combination(combination, cells, geometry, attack, endgame_1v1, chunk=1 << 16):
+    """Rückwärtsanalyse einer Besetzung, Ebene für Ebene über alle Stellungen gleicher Distanz."""
+    import numpy
+    single, first, second = combination.single, combination.first, combination.second
+    shape = combination.shape
+    first_count, second_count, single_count, first_max, second_max, class_count = shape
+    first_cells, second_cells, single_cells = cells[first], cells[second], cells[single]
+    # Schrittweiten der flachen Indizes
+    single_stride = first_max * second_max * class_count
+    second_stride = single_count * single_stride
+    first_stride = second_count * second_stride
+    first_hit_stride, second_hit_stride = second_max * class_count, class_count
+
+    def cube(array):
+        """(first, second, single) -> volle Form."""
+        return numpy.broadcast_to(array.reshape(array.shape + (1, 1, 1)), shape)
+
+    valid = ((first_cells[:, None, None] != second_cells[None, :, None])
+             & (first_cells[:, None, None] != single_cells[None, None, :])
+             & (second_cells[None, :, None] != single_cells[None, None, :]))
+    first_attacks = attack[first][first_cells][:, single_cells]  # [first, single]
+    second_attacks = attack[second][second_cells][:, single_cells]
+    single_attacks_first = attack[single][single_cells][:, first_cells]  # [single, first]
+    single_attacks_second = attack[single][single_cells][:, second_cells]
+
+    # Folgestellungen (auch auf nicht neutrale Felder, die nie entschieden werden): Bewegungen, Angriffe, Passen
+    pair_children = (geometry[first][0][:, second_cells][:, :, single_cells]
+                     + geometry[second][0][:, first_cells][:, :, single_cells].transpose(1, 0, 2)
+                     + first_attacks[:, None, :] + second_attacks[None, :, :] + 1)
+    single_children = (geometry[single][0][:, first_cells][:, :, second_cells].transpose(1, 2, 0)
+                       + single_attacks_first.T[:, None, :] + single_attacks_second.T[None, :, :] + 1)
+    pair_remaining = numpy.array(cube(numpy.where(valid, pair_children, 0).astype(numpy.uint8)))
+    single_remaining = numpy.array(cube(numpy.where(valid, single_children, 0).astype(numpy.uint8)))
+    pair_values = numpy.zeros(shape, dtype=numpy.int16)
+    single_values = numpy.zeros(shape, dtype=numpy.int16)
+
+    # Das Paar schlägt die einzelne Einheit: Gewinn im ersten Halbzug
+    after_first = numpy.array(combination.after_first)
+    after_second = numpy.array(combination.after_second)
+    kills = ((first_attacks[:, None, :, None, None, None] & (after_first == -1))
+             | (second_attacks[None, :, :, None, None, None] & (after_second == -1)))
+    pair_values[cube(valid) & kills] = 1
+
+    # Die einzelne Einheit schlägt eine des Paars: Ausgang aus der 1v1-Tabelle (Schlagen zählt als Distanz 0)
+    hits_first = numpy.array(combination.hits_first) - 1
+    hits_second = numpy.array(combination.hits_second) - 1
+    first_left = _signed_values(endgame_1v1, first, single)[first_cells][:, single_cells][..., hits_first]
+    second_left = _signed_values(endgame_1v1, second, single)[second_cells][:, single_cells][..., hits_second]
+    for captured, outcome, slot in (
+            ((single_attacks_first.T[:, None, :] & valid)[..., None, None], second_left[None], 3),
+            ((single_attacks_second.T[None, :, :] & valid)[..., None, None], first_left[:, None], 4)):
+        # Teilfelder mit der geschlagenen Einheit bei einem Treffer
+        values = single_values[:, :, :, 0] if slot == 3 else single_values[:, :, :, :, 0]
+        remaining = single_remaining[:, :, :, 0] if slot == 3 else single_remaining[:, :, :, :, 0]
+        values[captured & (outcome < 0)] = 1
+        remaining -= (captured & (outcome > 0)).astype(numpy.uint8)
+    single_values[cube(valid) & (single_values == 0) & (single_remaining == 0)] = -1
+
+    # Vorgänger in der Gegenrichtung: vor jedem Paar-Zug-Zustand war die einzelne Einheit am Zug und umgekehrt
+    before_first = _inverse(combination.after_first)
+    before_second = _inverse(combination.after_second)
+
+    def unmove(index, moved, moved_cells, stride, sources, rays, blockers):
+        """Indizes der Stellungen, aus denen die Einheit auf moved (Feldindex) gezogen ist."""
+        starts = sources[moved]
+        usable = starts >= 0
+        starts = numpy.where(usable, starts, 0)
+        start_cells = moved_cells[starts]
+        target_cells = moved_cells[moved][:, None]
+        for blocker in blockers:
+            blocker = blocker[:, None]
+            usable &= ~rays[starts, target_cells, blocker] & (start_cells != blocker)
+        return (index[:, None] + (starts - moved[:, None]) * stride)[usable]
+
+    def unhit(index, hp_class, before):
+        previous = before[hp_class]
+        usable = previous >= 0
+        return (index[:, None] + previous - hp_class[:, None])[usable]
+
+    def pair_parents(index):
+        """Stellungen mit der einzelnen Einheit am Zug, die zu index (Paar am Zug) führen."""
+        first_cell, second_cell, single_cell, first_hits, second_hits, _ = numpy.unravel_index(index, shape)
+        hit_first = single_attacks_first[single_cell, first_cell] & (first_hits + 1 < first_max)
+        hit_second = single_attacks_second[single_cell, second_cell] & (second_hits + 1 < second_max)
+        return numpy.concatenate((
+            index,
+            unmove(index, single_cell, single_cells, single_stride, geometry[single][1], geometry[single][2],
+                   (first_cells[first_cell], second_cells[second_cell])),
+            index[hit_first] + first_hit_stride,
+            index[hit_second] + second_hit_stride))
+
+    def single_parents(index):
+        """Stellungen mit dem Paar am Zug, die zu index (einzelne Einheit am Zug) führen."""
+        first_cell, second_cell, single_cell, _, _, hp_class = numpy.unravel_index(index, shape)
+        hit_first = first_attacks[first_cell, single_cell]
+        hit_second = second_attacks[second_cell, single_cell]
+        return numpy.concatenate((
+            index,
+            unmove(index, first_cell, first_cells, first_stride, geometry[first][1], geometry[first][2],
+                   (second_cells[second_cell], single_cells[single_cell])),
+            unmove(index, second_cell, second_cells, second_stride, geometry[second][1], geometry[second][2],
+                   (first_cells[first_cell], single_cells[single_cell])),
+            unhit(index[hit_first], hp_class[hit_first], before_first),
+            unhit(index[hit_second], hp_class[hit_second], before_second)))
+
+    pair_flat, single_flat = pair_values.reshape(-1), single_values.reshape(-1)
+    pair_remaining, single_remaining = pair_remaining.reshape(-1), single_remaining.reshape(-1)
+    sides = ((pair_flat, pair_parents, single_flat, single_remaining),
+             (single_flat, single_parents, pair_flat, pair_remaining))
+    frontiers = [numpy.flatnonzero(pair_flat), numpy.flatnonzero(single_flat)]
+    level = 1
+    while any(len(frontier) for frontier in frontiers):
+        found = [[], []]  # Neu entschiedene Stellungen (Paar am Zug, einzelne Einheit am Zug)
+        # Zuerst Gewinne: wer in eine verlorene Stellung ziehen kann, gewinnt
+        for side, frontier in enumerate(frontiers):
+            values, parents_of, parent_values, _ = sides[side]
+            lost = frontier[values[frontier] < 0]
+            for start in range(0, len(lost), chunk):
+                parents = parents_of(lost[start:start + chunk])
+                parents = numpy.unique(parents[parent_values[parents] == 0])
+                parent_values[parents] = level + 1
+                found[1 - side].append(parents)
+        # Dann Verluste: alle Folgestellungen gewonnen, die zuletzt gefundene hält am längsten
+        for side, frontier in enumerate(frontiers):
+            values, parents_of, parent_values, parent_remaining = sides[side]
+            won = frontier[values[frontier] > 0]
+            for start in range(0, len(won), chunk):
+                parents = parents_of(won[start:start + chunk])
+                parents, counts = numpy.unique(parents[parent_values[parents] == 0], return_counts=True)
+                parent_remaining[parents] -= counts.astype(numpy.uint8)
+                lost = parents[parent_remaining[parents] == 0]
+                parent_values[lost] = -(level + 1)
+                found[1 - side].append(lost)
+        frontiers = [numpy.concatenate(side_found) if side_found else numpy.zeros(0, dtype=numpy.intp)
+                     for side_found in found]
+        level += 1
+    return _encode(pair_values), _encode(single_values), level - 1
+
+def _inverse(after):
+    """Pro Klasse die Klassen, aus denen ein Treffer in sie führt, als NumPy-Feld mit -1 aufgefüllt."""
+    import numpy
+    before = [[previous for previous, following in enumerate(after) if following == hp_class]
+              for hp_class in range(len(after))]
+    array = numpy.full((len(after), max(1, max(len(entry) for entry in before))), -1, dtype=numpy.intp)
+    for hp_class, entry in enumerate(before):
+        array[hp_class, :len(entry)] = entry
+    return array
+
+def _encode(values):
+    import numpy
+    return numpy.where(values >= 0, numpy.minimum(values, MAX_DISTANCE),
+                       256 - numpy.minimum(-values, MAX_DISTANCE)).astype(numpy.uint8)
+
+def write_endgame_2v1(hits, solved, path=ENDGAME_2V1_PATH):
+    """Schreibt die Ergebnisse von solve_endgames_2v1 blockweise zlib-komprimiert; gibt die Dateigröße zurück."""
+    blocks = []
+    for combination, pair_values, single_values in solved:
+        for first_cell in range(combination.shape[0]):
+            for second_cell in range(combination.shape[1]):
+                blocks.append(zlib.compress(pair_values[first_cell, second_cell].tobytes(), 9))
+        for single_cell in range(combination.shape[2]):
+            blocks.append(zlib.compress(single_values[:, :, single_cell].tobytes(), 9))
+    offsets = [0]
+    for block in blocks:
+        offsets.append(offsets[-1] + len(block))
+    content = (_TABLE_HEADER.pack(_TABLE_2V1_MAGIC, rules_fingerprint(_default_codes(), ENDGAME_FORMAT_VERSION),
+                                  BOARD_SIZE, len(hits))
+               + bytes(value for row in hits for value in row)
+               + struct.pack(f"<{len(offsets)}Q", *offsets) + b"".join(blocks))
+    _write_file(path, content)
+    return len(content)
+
+def load_endgame_2v1(endgame_1v1, path=ENDGAME_2V1_PATH):
+    """Blendet die Tabelle zwei gegen eins ein; None, wenn sie fehlt oder nicht zu den Regeln passt."""
+    data, fields = _map_file(path, _TABLE_2V1_MAGIC, _TABLE_HEADER, ENDGAME_FORMAT_VERSION)
+    if data is None:
+        return None
+    _, _, size, type_count = fields
+    offset = _TABLE_HEADER.size + type_count * type_count
+    hits = [list(data[_TABLE_HEADER.size + row * type_count:_TABLE_HEADER.size + (row + 1) * type_count])
+            for row in range(type_count)]
+    cells = _table_cells(Board(BOARD_SIZE))
+    block_count = _combinations(hits, cells)[-1].end_block if type_count == len(UNIT_CLASSES) else 0
+    blocks_start = offset + 8 * (block_count + 1)
+    if size != BOARD_SIZE or type_count != len(UNIT_CLASSES) or blocks_start > len(data):
+        data.close()
+        return None
+    offsets = [blocks_start + value for value in struct.unpack_from(f"<{block_count + 1}Q", data, offset)]
+    if offsets[-1] != len(data):
+        data.close()
+        return None
+    return Endgame2v1Table(data, offsets, hits, cells, endgame_1v1)
+
+# --- Eröffnungsbuch ----------------------------------------------------------------------------
+
+def snapshot_key(snapshot):
+    """64-Bit-Schlüssel eines Stellungs-Keyframes."""
+    return int.from_bytes(hashlib.blake2b(snapshot, digest_size=8).digest(), "little")
+
+def position_key(game):
+    """Schlüssel der aktuellen Stellung (gleiche Bytes wie ai_service.snapshot_game)."""
+    board = game.board
+    return snapshot_key(encode_keyframe(0, game.current_turn, capture_units(game), board.size, board.terrain_seed))
+
+class OpeningBook:
+    """Eingeblendetes Eröffnungsbuch: Stellungsschlüssel -> Action."""
+
+    def __init__(self, data, offset, slots):
+        self.data = data
+        self._offset = offset
+        self._mask = slots - 1
+
+    def lookup_key(self, key):
+        slot = key & self._mask
+        while True:
+            found, op, unit_cell, target_cell = _BOOK_SLOT.unpack_from(self.data, self._offset + slot * _BOOK_SLOT.size)
+            if op == 0:
+                return None
+            if found == key:
+                return Action(_BOOK_OPS[op], (unit_cell % BOARD_SIZE, unit_cell // BOARD_SIZE),
+                              (target_cell % BOARD_SIZE, target_cell // BOARD_SIZE))
+            slot = (slot + 1) & self._mask
+
+    def lookup(self, game):
+        return self.lookup_key(position_key(game))
+
+def write_opening_book(entries, path=OPENING_BOOK_PATH):
+    """Schreibt {Schlüssel: Action} als Hash-Tabelle (höchstens halb gefüllt)."""
+    slots = 8
+    while slots < 2 * len(entries):
+        slots *= 2
+    table = bytearray(slots * _BOOK_SLOT.size)
+    for key, book_action in entries.items():
+        slot = key & (slots - 1)
+        while table[slot * _BOOK_SLOT.size + 8] != 0:
+            slot = (slot + 1) & (slots - 1)
+        op, (unit_x, unit_y), (target_x, target_y) = book_action
+        _BOOK_SLOT.pack_into(table, slot * _BOOK_SLOT.size, key, _BOOK_OPS.index(op),
+                             unit_y * BOARD_SIZE + unit_x, target_y * BOARD_SIZE + target_x)
+    content = _BOOK_HEADER.pack(_BOOK_MAGIC, rules_fingerprint(_default_codes()), slots) + bytes(table)
+    _write_file(path, content)
+    return len(content)
+
+def load_opening_book(path=OPENING_BOOK_PATH):
+    """Blendet das Eröffnungsbuch ein; None, wenn es fehlt oder nicht zu den Regeln passt."""
+    data, fields = _map_file(path, _BOOK_MAGIC, _BOOK_HEADER)
+    if data is None:
+        return None
+    slots = fields[2]
+    if slots & (slots - 1) or _BOOK_HEADER.size + slots * _BOOK_SLOT.size != len(data):
+        data.close()
+        return None
+    return OpeningBook(data, _BOOK_HEADER.size, slots)
+
+def _material(player):
+    return sum(unit.health / unit.max_health for unit in player.units)
+
+def rollout(task):
+    """Ein Selbstspiel nach einem Kandidatenzug (läuft im Worker). Ergebnis für den ziehenden Spieler in [-1, 1]."""
+    snapshot, candidate, opponent, seed = task
+    from .ai import AI
+    from .ai_service import restore_game
+    random.seed(seed)
+    game = restore_game(snapshot)
+    mover = game.current_turn
+    apply_action(game, candidate)
+    game.end_turn()
+    ais = []
+    for index, player in enumerate(game.players):
+        ai = AI(player, "hard" if index == mover else opponent)
+        ai.debug = False
+        ai.use_books = False  # Das Buch entsteht gerade
+        ai.set_game(game)
+        ais.append(ai)
+    for _ in range(ROLLOUT_TURNS):
+        if game._check_game_over():
+            break
+        ais[game.current_turn].make_turn()
+        game.end_turn()
+    own, enemy = game.players[mover], game.players[1 - mover]
+    if not enemy.units:
+        return 1.0
+    if not own.units:
+        return -1.0
+    # Kein Ende: Materialvorsprung, kleiner als jeder Sieg (eine Einheit jedes Typs pro Seite)
+    return (_material(own) - _material(enemy)) / (2 * len(UNIT_TYPES))
+
+def _after(snapshot, candidate):
+    from .ai_service import restore_game, snapshot_game
+    game = restore_game(snapshot)
+    apply_action(game, candidate)
+    game.end_turn()
+    return snapshot_game(game)
+
+def best_action(snapshot, rollouts, map_function=map):
+    """Kandidatenzug mit dem besten mittleren Rollout-Ergebnis: (Action, Ergebnis)."""
+    from .ai_service import restore_game
+    actions = legal_actions(restore_game(snapshot))
+    # Gleiche Gegner und Seeds für alle Kandidaten, damit die Ergebnisse vergleichbar sind
+    tasks = [(snapshot, candidate, ROLLOUT_OPPONENTS[index % len(ROLLOUT_OPPONENTS)], index)
+             for candidate in actions for index in range(rollouts)]
+    results = list(map_function(rollout, tasks))
+    best, best_score = None, None
+    for number, candidate in enumerate(actions):
+        score = sum(results[number * rollouts:(number + 1) * rollouts]) / rollouts
+        if best_score is None or score > best_score:
+            best, best_score = candidate, score
+    return best, best_score
+
+def build_opening_book(plies=3, rollouts=6, map_function=map, log=print):
+    """
+    Buch für beide Seiten: in den ersten plies Halbzügen steht für jede Stellung, in der die Buchseite
+    am Zug ist, der beste Zug; für den Gegner werden alle möglichen Züge weiterverfolgt.
+    """
+    from .ai_service import restore_game, snapshot_game
+    from .game import Game
+    start = snapshot_game(Game(headless=True))
+    entries = {}
+    for book_player in range(2):
+        level = [start]
+        for ply in range(plies):
+            next_level = {}
+            for snapshot in level:
+                game = restore_game(snapshot)
+                if game._check_game_over():
+                    continue
+                if game.current_turn == book_player:
+                    key = snapshot_key(snapshot)
+                    if key not in entries:
+                        entries[key], score = best_action(snapshot, rollouts, map_function)
+                        log(f"Spieler {book_player + 1}, Halbzug {ply + 1}: {entries[key]} ({score:+.3f})")
+                    actions = [entries[key]]
+                elif ply + 1 < plies:
+                    actions = legal_actions(game)
+                else:
+                    actions = []
+                if ply + 1 < plies:
+                    for candidate in actions:
+                        next_level[_after(snapshot, candidate)] = None
+            level = list(next_level)
+    return entries
+
+# --- Abfrage durch die KI ----------------------------------------------------------------------
+
+_loaded = {}  # Pfad -> eingeblendete Datei (oder None), einmal pro Prozess
+
+def get_endgame_table(path=ENDGAME_TABLE_PATH):
+    if path not in _loaded:
+        _loaded[path] = load_endgame_table(path)
+    return _loaded[path]
+
+def get_endgame_2v1(path=ENDGAME_2V1_PATH):
+    if path not in _loaded:
+        _loaded[path] = load_endgame_2v1(get_endgame_table(), path)
+    return _loaded[path]
+
+def get_opening_book(path=OPENING_BOOK_PATH):
+    if path not in _loaded:
+        _loaded[path] = load_opening_book(path)
+    return _loaded[path]
+
+def book_move(game):
+    """
+    Zug aus den Endspieltabellen oder dem Eröffnungsbuch für den Spieler am Zug.
+    Gibt (True, Action oder None für Passen) zurück, oder (False, None), wenn keins von beiden die Stellung kennt.
+    Remis-Stellungen der Tabelle überlassen der normalen KI die Wahl.
+    """
+    if not is_covered(game):
+        return False, None
+    for table in (get_endgame_table(), get_endgame_2v1()):
+        if table is not None:
+            probe = table.probe(game)
+            if probe is not None:
+                return True, probe[1]
+    book = get_opening_book()
+    if book is not None:
+        book_action = book.lookup(game)
+        if book_action is not None:
+            return True, book_action
+    return False, None
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt Eröffnungsbuch und Endspieltabellen (Standardkarte)")
+    parser.add_argument("--skip-endgame", action="store_true", help="Endspieltabelle nicht neu erzeugen")
+    parser.add_argument("--skip-2v1", action="store_true", help="Endspieltabelle zwei gegen eins nicht neu erzeugen")
+    parser.add_argument("--skip-opening", action="store_true", help="Eröffnungsbuch nicht neu erzeugen")
+    parser.add_argument("--plies", type=int, default=3, help="Halbzüge ab der Startaufstellung im Buch")
+    parser.add_argument("--rollouts", type=int, default=6, help="Selbstspiele pro Kandidatenzug")
+    parser.add_argument("--workers", type=int, default=1, help="Prozesse für die Rollouts")
+    args = parser.parse_args()
+
+    if not args.skip_endgame:
+        hits, tables = solve_endgames()
+        size = write_endgame_table(hits, tables)
+        print(f"Endspieltabelle gespeichert: {ENDGAME_TABLE_PATH} ({size} Bytes)")
+    if not args.skip_2v1:
+        endgame_1v1 = load_endgame_table()
+        if endgame_1v1 is None:
+            print(f"Endspieltabelle zwei gegen eins braucht {ENDGAME_TABLE_PATH}, übersprungen.")
+        else:
+            try:
+                size = write_endgame_2v1(endgame_1v1.hits, solve_endgames_2v1(endgame_1v1))
+                print(f"Endspieltabelle zwei gegen eins gespeichert: {ENDGAME_2V1_PATH} ({size} Bytes)")
+            except ImportError:
+                print("Endspieltabelle zwei gegen eins braucht NumPy (pip install numpy), übersprungen.")
+    if not args.skip_opening:
+        started = time.perf_counter()
+        if args.workers > 1:
+            # spawn statt fork, wie im KI-Dienst
+            with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                entries = build_opening_book(args.plies, args.rollouts,
+                                             lambda function, tasks: executor.map(function, tasks, chunksize=8))
+        else:
+            entries = build_opening_book(args.plies, args.rollouts)
+        size = write_opening_book(entries)
+        print(f"Eröffnungsbuch gespeichert: {OPENING_BOOK_PATH} ({len(entries)} Stellungen, {size} Bytes, "
+              f"{time.perf_counter() - started:.0f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Kampfauflösung ohne Seiteneffekte: resolve_attack berechnet aus dem Brett und den
+# beteiligten Einheiten eine Liste von Schadensereignissen, verändert aber nichts.
+# Angewendet werden die Ereignisse erst mit apply_events (Unit.apply_damage_event).
+# Reihenfolge pro Treffer: Grundschaden -> Schild (halbiert) -> Terrain-Verteidigung (abgerundet).
+# Alle Kombinationen (Art, Angreifer, Ziel, Terrain, Schild) sind beim Import in DAMAGE_TABLE
+# vorberechnet; eine Vorhersage ist damit ein einziger Tabellenzugriff.
+
+from .terrain import TERRAIN_DEFENSE
+from .unit_defs import UNIT_TYPES, UNIT_STATS, DAMAGE_MODIFIER, SPECIAL_DAMAGE
+
+ATTACK = "attack"
+ARROW_STORM = "arrow_storm"
+CHARGE = "charge"
+KINDS = (ATTACK, ARROW_STORM, CHARGE)
+KIND_INDEX = {kind: index for index, kind in enumerate(KINDS)}
+
+TYPE_COUNT = len(UNIT_TYPES)
+TERRAIN_COUNT = len(TERRAIN_DEFENSE)
+NO_TERRAIN = TERRAIN_COUNT  # Ziel ohne Feld (nicht auf dem Brett): keine Terrain-Verteidigung
+
+def _raw_damage(kind_index, attacker_type, target_type):
+    modifier = DAMAGE_MODIFIER[attacker_type][target_type]
+    if KINDS[kind_index] == ATTACK:
+        return UNIT_STATS[attacker_type]["attack_power"] * modifier
+    return int(SPECIAL_DAMAGE[attacker_type] * modifier)
+
+def _final_damage(raw_damage, terrain_code, shield):
+    damage = raw_damage // 2 if shield else raw_damage
+    if terrain_code != NO_TERRAIN:
+        damage = int(damage * TERRAIN_DEFENSE[terrain_code])
+    return damage
+
+PAIR_STRIDE = (TERRAIN_COUNT + 1) * 2  # Einträge pro (Art, Angreifer, Ziel)
+
+def _table_index(kind_index, attacker_type, target_type, terrain_code=0, shield=False):
+    return ((kind_index * TYPE_COUNT + attacker_type) * TYPE_COUNT + target_type) * PAIR_STRIDE + terrain_code * 2 + shield
+
+# RAW_DAMAGE[_table_index(Art, Angreifer, Ziel)]: Grundschaden (nur Terrain 0, ohne Schild belegt)
+# DAMAGE_TABLE[_table_index(Art, Angreifer, Ziel, Terrain-Code, Schild)]: erlittener Schaden
+RAW_DAMAGE = [0] * (len(KINDS) * TYPE_COUNT * TYPE_COUNT * PAIR_STRIDE)
+DAMAGE_TABLE = list(RAW_DAMAGE)
+for _kind in range(len(KINDS)):
+    for _attacker in range(TYPE_COUNT):
+        for _target in range(TYPE_COUNT):
+            _raw = _raw_damage(_kind, _attacker, _target)
+            RAW_DAMAGE[_table_index(_kind, _attacker, _target)] = _raw
+            for _terrain in range(TERRAIN_COUNT + 1):
+                for _shield in (False, True):
+                    DAMAGE_TABLE[_table_index(_kind, _attacker, _target, _terrain, _shield)] = \
+                        _final_damage(_raw, _terrain, _shield)
+
+class DamageEvent:
+    """Ein Treffer auf eine Einheit."""
+    __slots__ = ("kind", "target", "position", "raw_damage", "damage", "shield_consumed", "health_after")
+
+    def __init__(self, kind, target, position, raw_damage, damage, shield_consumed, health_after):
+        self.kind = kind  # ATTACK, ARROW_STORM, CHARGE oder None (direkter Schaden)
+        self.target = target
+        self.position = position  # Feld des Ziels zum Zeitpunkt des Treffers
+        self.raw_damage = raw_damage  # Grundschaden des Angreifers (vor Schild und Terrain)
+        self.damage = damage  # Tatsächlich erlittener Schaden
+        self.shield_consumed = shield_consumed  # Schildwall des Ziels wird verbraucht
+        self.health_after = health_after
+
+    @property
+    def lethal(self):
+        return self.health_after == 0
+
+def _terrain_code(board, target):
+    position = target.position
+    if position is None or board is None:
+        return NO_TERRAIN
+    return board.terrain_codes[position[1] * board.size + position[0]]
+
+def base_damage(attacker, target, kind):
+    """Grundschaden eines Angriffs der Art kind gegen target (vor Schild und Terrain)."""
+    return RAW_DAMAGE[_table_index(KIND_INDEX[kind], attacker.type_index, target.type_index)]
+
+def type_damage(attacker_type, target_type, kind=ATTACK):
+    """Grundschaden wie base_damage, aber für Typindizes statt Einheiten (z.B. Endspieltabelle)."""
+    return RAW_DAMAGE[_table_index(KIND_INDEX[kind], attacker_type, target_type)]
+
+def terrain_damage(attacker_type, target_type, terrain_code, kind=ATTACK):
+    """Erlittener Schaden ohne Schild auf einem Terrain, für Typindizes (z.B. Endspieltabelle)."""
+    return DAMAGE_TABLE[_table_index(KIND_INDEX[kind], attacker_type, target_type, terrain_code)]
+
+def lookup_damage(board, attacker, target, kind=ATTACK, shield=None):
+    """Erlittener Schaden eines Angriffs als Tabellenzugriff. shield=None: aktuellen Schild-Zustand verwenden."""
+    if shield is None:
+        shield = target.shield_ready()
+    position = target.position
+    terrain_code = NO_TERRAIN if position is None or board is None else board.terrain_codes[position[1] * board.size + position[0]]
+    return DAMAGE_TABLE[((KIND_INDEX[kind] * TYPE_COUNT + attacker.type_index) * TYPE_COUNT + target.type_index)
+                        * PAIR_STRIDE + terrain_code * 2 + shield]
+
+def damage_taken(target, raw_damage, board=None, shield=None):
+    """Erlittener Schaden für beliebigen Grundschaden (ohne Tabelle, z.B. direkter Schaden)."""
+    if shield is None:
+        shield = target.shield_ready()
+    return _final_damage(raw_damage, _terrain_code(board, target), shield)
+
+def damage_event(board, target, raw_damage, kind=None, shield=None):
+    """Schadensereignis für einen Treffer mit raw_damage Grundschaden auf target."""
+    if shield is None:
+        shield = target.shield_ready()
+    damage = damage_taken(target, raw_damage, board, shield)
+    return DamageEvent(kind, target, target.position, raw_damage, damage, shield,
+                       max(0, target.health - damage))
+
+def _attack_event(board, attacker, target, kind):
+    shield = target.shield_ready()
+    index = _table_index(KIND_INDEX[kind], attacker.type_index, target.type_index)
+    damage = DAMAGE_TABLE[index + _terrain_code(board, target) * 2 + shield]
+    return DamageEvent(kind, target, target.position, RAW_DAMAGE[index], damage, shield,
+                       max(0, target.health - damage))
+
+def resolve_attack(board, attacker, target, kind=ATTACK):
+    """
+    Berechnet die Schadensereignisse eines Angriffs, ohne Einheiten oder Brett zu verändern.
+    ATTACK und CHARGE: target ist die angegriffene Einheit (Reichweite prüft der Aufrufer).
+    ARROW_STORM: target ist das Zielfeld (x, y); getroffen werden alle Gegner im 3x3-Bereich.
+    """
+    if kind != ARROW_STORM:
+        return [_attack_event(board, attacker, target, kind)]
+    target_x, target_y = target
+    events = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            x, y = target_x + dx, target_y + dy
+            if 0 <= x < board.size and 0 <= y < board.size:
+                unit = board.get_unit_at(x, y)
+                if unit and unit.player != attacker.player:
+                    events.append(_attack_event(board, attacker, unit, ARROW_STORM))
+    return events
+
+def apply_events(events):
+    """Wendet Schadensereignisse auf die Ziele an (einzige Stelle, an der Kampf Einheiten verändert)."""
+    for event in events:
+        event.target.apply_damage_event(event)
+    return events
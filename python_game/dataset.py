@@ -0,0 +1,292 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .actions import MOVE, ATTACK, SPECIAL
+from .protocol import capture_units, NO_TARGET
+
+# Stellungsdatenbank für Tuning und gelernte Bewertungen.
+# Selbstspiele schreiben jede Stellung vor einem Zug als Datensatz fester Länge: Terrain, alle Einheiten
+# (Typ, Besitzer, Feld, HP, Flags wie im Protokoll, vorbereiteter Pfeilregen), die Bewertung der KI
+# "hard", den gespielten Zug und den Ausgang des Spiels. Die Datensätze eines Spiels werden erst am
+# Spielende angehängt (dann steht der Ausgang fest); Dateien werden nie umgeschrieben.
+# Jeder Schreiber (ein Selbstspiel-Prozess) füllt eigene Shards <Name>-<Nummer>.bhds; Leser blenden alle
+# Shards eines Verzeichnisses per numpy.memmap ein und greifen ohne Kopie auf Blöcke zu.
+# Schreiben braucht nur die Standardbibliothek, Lesen NumPy (optional: pip install numpy).
+#
+# Aufruf: python3 -m python_game.dataset --games 1000 --workers 4 --output .cache/dataset
+
+FORMAT_VERSION = 1
+MAGIC = b"BHDS"
+SHARD_SUFFIX = ".bhds"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(os.path.dirname(PACKAGE_DIR), ".cache", "dataset")
+MAX_UNITS = 6  # Einheiten pro Stellung (Startaufstellung: drei pro Seite)
+RECORDS_PER_SHARD = 1 << 18
+NO_UNIT = 255  # Typ eines leeren Einheiten-Slots
+DRAW = -1  # Gewinner bei Remis
+
+# Kopf jeder Shard-Datei: Magic, Version, Brettgröße, Einheiten-Slots, Länge eines Datensatzes
+HEADER = struct.Struct("<4sHBBH6x")
+
+# Aktionen: 0 = Passen
+ACTION_CODES = {None: 0, MOVE: 1, ATTACK: 2, SPECIAL: 3}
+
+def _fields(board_size, max_units):
+    """Felder eines Datensatzes: (Name, struct-Code, NumPy-Typ, Anzahl). Gemeinsame Quelle für beide Formate."""
+    cells = board_size * board_size
+    return [
+        ("game", "I", "<u4", 1),  # Spielnummer (Seed des Selbstspiels)
+        ("ply", "H", "<u2", 1),  # Halbzug im Spiel
+        ("turn", "B", "u1", 1),  # Spieler am Zug
+        ("map_seed", "i", "<i4", 1),  # -1: Standardkarte
+        ("terrain", "B", "u1", cells),  # Terrain-Codes, zeilenweise
+        ("unit_type", "B", "u1", max_units),  # Typindex oder NO_UNIT
+        ("unit_owner", "B", "u1", max_units),
+        ("unit_x", "B", "u1", max_units),
+        ("unit_y", "B", "u1", max_units),
+        ("unit_hp", "H", "<u2", max_units),
+        ("unit_flags", "B", "u1", max_units),  # protocol.FLAG_*
+        ("storm_x", "B", "u1", max_units),  # Vorbereiteter Pfeilregen oder NO_TARGET
+        ("storm_y", "B", "u1", max_units),
+        ("evaluation", "f", "<f4", 1),  # Bewertung "hard": Spieler am Zug minus Gegner
+        ("action", "B", "u1", 1),  # ACTION_CODES
+        ("action_from", "B", "u1", 1),  # Feld der Einheit (y * Größe + x)
+        ("action_to", "B", "u1", 1),  # Zielfeld
+        ("winner", "b", "i1", 1),  # 0, 1 oder DRAW
+        ("plies_left", "H", "<u2", 1),  # Halbzüge bis zum Spielende
+    ]
+
+# Felder pro Einheiten-Slot in der Reihenfolge von protocol.capture_units (ohne den Pfeilregen)
+UNIT_COLUMNS = [name for name, *_ in _fields(1, 1) if name.startswith("unit_")]
+
+def record_struct(board_size=9, max_units=MAX_UNITS):
+    return struct.Struct("<" + "".join(f"{count}{code}" if count > 1 else code
+                                       for _, code, _, count in _fields(board_size, max_units)))
+
+def record_dtype(board_size=9, max_units=MAX_UNITS):
+    """NumPy-Typ eines Datensatzes (gleiche Bytes wie record_struct)."""
+    numpy = _numpy()
+    return numpy.dtype([(name, dtype, (count,)) if count > 1 else (name, dtype)
+                        for name, _, dtype, count in _fields(board_size, max_units)])
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("Zum Lesen des Datensatzes wird NumPy benötigt (pip install numpy).") from error
+    return numpy
+
+def position_values(game, max_units=MAX_UNITS):
+    """Werte der Felder terrain bis storm_y eines Datensatzes für die aktuelle Stellung (flach, in Feldreihenfolge)."""
+    units = sorted(capture_units(game).items())
+    if len(units) > max_units:
+        raise ValueError(f"Zu viele Einheiten für den Datensatz ({len(units)} > {max_units}).")
+    slots = [(NO_UNIT,) + (0,) * (len(UNIT_COLUMNS) - 1) + (None,)] * max_units
+    slots[:len(units)] = [unit for _, unit in units]
+    storms = [storm or (NO_TARGET, NO_TARGET) for *_, storm in slots]
+    values = list(game.board.terrain_codes)
+    for column in range(len(UNIT_COLUMNS)):
+        values.extend(slot[column] for slot in slots)
+    values.extend(storm[0] for storm in storms)
+    values.extend(storm[1] for storm in storms)
+    return values
+
+class GameRecorder:
+    """Sammelt die Stellungen eines Spiels; records() liefert sie nach Spielende als Datensätze."""
+
+    def __init__(self, game, game_id, map_seed=None, max_units=MAX_UNITS):
+        self.game = game
+        self.game_id = game_id & 0xFFFFFFFF
+        self.map_seed = -1 if map_seed is None else map_seed
+        self.max_units = max_units
+        self._struct = record_struct(game.board.size, max_units)
+        self._positions = []  # (Werte ohne Zug und Ausgang, Zug)
+        self._current = None
+
+    def before_turn(self):
+        """Vor dem Zug aufrufen: hält die Stellung fest."""
+        game = self.game
+        evaluator = game.evaluator
+        mover = game.players[game.current_turn]
+        opponent = game.players[1 - game.current_turn]
+        evaluation = evaluator.player_score(mover) - evaluator.player_score(opponent)
+        self._current = [self.game_id, len(self._positions), game.current_turn, self.map_seed,
+                         *position_values(game, self.max_units), evaluation]
+        game.last_action = None  # Passen erkennen
+
+    def after_turn(self):
+        """Nach dem Zug (vor end_turn) aufrufen: merkt sich die gespielte Aktion."""
+        action = self.game.last_action
+        if action is None:
+            move = (0, 0, 0)
+        else:
+            size = self.game.board.size
+            (unit_x, unit_y), (target_x, target_y) = action.unit_position, action.target
+            move = (ACTION_CODES[action.op], unit_y * size + unit_x, target_y * size + target_x)
+        self._positions.append((self._current, move))
+        self._current = None
+
+    def records(self, winner):
+        """Alle Datensätze als Bytes; winner: Index des Gewinners oder DRAW."""
+        total = len(self._positions)
+        return b"".join(self._struct.pack(*values, *move, winner, total - ply)
+                        for ply, (values, move) in enumerate(self._positions))
+
+class ShardWriter:
+    """
+    Hängt Datensätze an Shards <Verzeichnis>/<Name>-<Nummer>.bhds an (pro Shard höchstens
+    records_per_shard). Beginnt immer mit einer neuen Nummer; vorhandene Dateien bleiben unverändert.
+    """
+
+    def __init__(self, directory, name, board_size=9, max_units=MAX_UNITS, records_per_shard=RECORDS_PER_SHARD):
+        self.directory = directory
+        self.name = name
+        self.board_size = board_size
+        self.max_units = max_units
+        self.record_size = record_struct(board_size, max_units).size
+        self.records_per_shard = records_per_shard
+        self.records_written = 0
+        self._file = None
+        self._in_shard = 0
+        os.makedirs(directory, exist_ok=True)
+        existing = glob.glob(os.path.join(directory, f"{name}-*{SHARD_SUFFIX}"))
+        self._next_index = 1 + max((int(path[:-len(SHARD_SUFFIX)].rsplit("-", 1)[1]) for path in existing), default=-1)
+
+    def _open_shard(self):
+        path = os.path.join(self.directory, f"{self.name}-{self._next_index:05d}{SHARD_SUFFIX}")
+        self._next_index += 1
+        self._file = open(path, "xb")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.board_size, self.max_units, self.record_size))
+        self._in_shard = 0
+
+    def write(self, records):
+        """Hängt Datensätze (Bytes, Vielfaches von record_size) an und schreibt sie sofort auf die Platte."""
+        if len(records) % self.record_size:
+            raise ValueError("Unvollständiger Datensatz.")
+        offset = 0
+        while offset < len(records):
+            if self._file is None or self._in_shard >= self.records_per_shard:
+                self.close()
+                self._open_shard()
+            count = min((len(records) - offset) // self.record_size, self.records_per_shard - self._in_shard)
+            self._file.write(records[offset:offset + count * self.record_size])
+            self._in_shard += count
+            self.records_written += count
+            offset += count * self.record_size
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+_worker_writers = {}  # Verzeichnis -> ShardWriter dieses Prozesses
+
+def worker_writer(directory):
+    """ShardWriter des aktuellen Prozesses für ein Verzeichnis (ein Schreiber pro Selbstspiel-Prozess)."""
+    writer = _worker_writers.get(directory)
+    if writer is None:
+        writer = ShardWriter(directory, f"selfplay-{os.getpid()}")
+        _worker_writers[directory] = writer
+    return writer
+
+def read_header(path):
+    with open(path, "rb") as shard_file:
+        magic, version, board_size, max_units, record_size = HEADER.unpack(shard_file.read(HEADER.size))
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} ist keine Shard-Datei dieser Version.")
+    return board_size, max_units, record_size
+
+class Dataset:
+    """
+    Alle Shards eines Verzeichnisses (oder eine Shard-Datei oder eine Liste von Dateien) als ein Datensatz.
+    Die Shards werden nur eingeblendet: batches() liefert Ausschnitte ohne Kopie,
+    sample() kopiert nur die gezogenen Datensätze. Ein unvollständiger letzter Datensatz
+    (abgebrochener Schreiber) wird ignoriert.
+    """
+
+    def __init__(self, source):
+        numpy = _numpy()
+        if isinstance(source, (str, bytes, os.PathLike)):
+            paths = sorted(glob.glob(os.path.join(source, f"*{SHARD_SUFFIX}"))) if os.path.isdir(source) else [source]
+        else:
+            paths = list(source)
+        self.dtype = None
+        self.shards = []
+        for path in paths:
+            board_size, max_units, record_size = read_header(path)
+            dtype = record_dtype(board_size, max_units)
+            if dtype.itemsize != record_size:
+                raise ValueError(f"{path}: Datensatzlänge {record_size} passt nicht zum Format ({dtype.itemsize}).")
+            if self.dtype is None:
+                self.dtype = dtype
+            elif dtype != self.dtype:
+                raise ValueError(f"{path}: anderes Format als die übrigen Shards.")
+            count = (os.path.getsize(path) - HEADER.size) // record_size
+            if count:
+                self.shards.append(numpy.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,)))
+        self._starts = numpy.cumsum([0] + [len(shard) for shard in self.shards])
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        shard = int(self._starts.searchsorted(index, side="right")) - 1
+        return self.shards[shard][index - self._starts[shard]]
+
+    def batches(self, batch_size):
+        """Aufeinanderfolgende Blöcke als Ansichten auf die Shards (ohne Kopie, nicht über Shard-Grenzen)."""
+        for shard in self.shards:
+            for start in range(0, len(shard), batch_size):
+                yield shard[start:start + batch_size]
+
+    def sample(self, batch_size, rng=None):
+        """Zufällige Datensätze (mit Zurücklegen) als neues Array; liest nur die gezogenen Datensätze."""
+        numpy = _numpy()
+        if not len(self):
+            raise ValueError("Datensatz ist leer.")
+        rng = rng or numpy.random.default_rng()
+        indices = numpy.sort(rng.integers(0, len(self), batch_size))
+        shard_of = self._starts.searchsorted(indices, side="right") - 1
+        parts = []
+        for shard in numpy.unique(shard_of):
+            local = indices[shard_of == shard] - self._starts[shard]
+            parts.append(self.shards[shard][local])
+        batch = numpy.concatenate(parts)
+        rng.shuffle(batch)
+        return batch
+
+def main():
+    from .ai_weights import DEFAULT_WEIGHTS
+    from .tuner import play_game
+
+    parser = argparse.ArgumentParser(description="Selbstspiele als Stellungsdatenbank aufzeichnen")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4, help="Prozesse für die Selbstspiele")
+    parser.add_argument("--difficulty", choices=("easy", "medium", "hard"), default="hard")
+    parser.add_argument("--seed", type=int, default=1, help="Erste Spielnummer")
+    parser.add_argument("--output", default=DATASET_DIR, help="Verzeichnis für die Shards")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    output = os.path.abspath(args.output)
+    values = DEFAULT_WEIGHTS.values
+    tasks = [(values, values, args.difficulty, args.seed + index, output) for index in range(args.games)]
+    # spawn statt fork, wie im KI-Dienst
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // (8 * args.workers))))
+    print(f"{len(results)} Spiele aufgezeichnet nach {output} ({time.perf_counter() - started:.1f}s): "
+          f"{results.count(1)} Siege Spieler 1, {results.count(-1)} Siege Spieler 2, {results.count(0)} Remis")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from .unit_defs import ATTACK_RANGE, TYPE_ADVANTAGE_BONUS, THREAT_RANGE
+from .terrain import TerrainType
+from .ai_weights import DEFAULT_WEIGHTS
+
+# Bewertung einzelner Einheiten für die KI (Schwierigkeit "hard").
+# Die Terme hängen entweder nur von einer Einheit ab (HP, Spezialfähigkeit, Feld) oder von
+# einem Paar aus Einheit und Gegner (Bedrohung, Angriffsmöglichkeit). IncrementalEvaluator hält
+# beide Arten zwischengespeichert und rechnet nach einer Änderung nur die betroffenen Einheiten
+# und ihre Paare neu, statt jedes Mal alle Einheiten gegen alle Gegner zu prüfen.
+# Alle Gewichte kommen aus einem AIWeights-Satz (ai_weights.py, Standard: data/ai_weights.json).
+
+OFF_BOARD_SCORE = -1000  # Bewertung einer Einheit ohne Feld
+
+def position_term(board, x, y, weights=DEFAULT_WEIGHTS):
+    """Terrain-Bonus und zentrale Position (für Kontrolle)."""
+    score = 0
+    terrain_type = board.get_terrain_at(x, y).terrain_type
+    if terrain_type == TerrainType.FOREST:
+        score += weights.forest  # Wald gibt Verteidigungsbonus
+    elif terrain_type == TerrainType.HEALING:
+        score += weights.healing  # Heilquelle ist gut
+    # Zentrum und größter Abstand dazu aus der Brettgröße (9x9: (4, 4), 8)
+    center = board.size // 2
+    center_distance = abs(x - center) + abs(y - center)
+    score += (board.size - 1 - center_distance) * weights.center
+    return score
+
+def unit_term(board, unit, weights=DEFAULT_WEIGHTS):
+    """Terme, die nur von der Einheit selbst abhängen."""
+    score = 0
+    score += unit.health / unit.max_health * weights.hp
+    if not unit.special_ability_used:
+        score += weights.special
+    score += position_term(board, unit.position[0], unit.position[1], weights)
+    return score
+
+def _distance(unit, enemy):
+    return max(abs(unit.position[0] - enemy.position[0]), abs(unit.position[1] - enemy.position[1]))
+
+def threat_term(unit, enemy, weights=DEFAULT_WEIGHTS):
+    """Abzug, wenn enemy die Einheit bedroht (THREAT_RANGE des Gegners)."""
+    if _distance(unit, enemy) <= THREAT_RANGE[enemy.type_index]:
+        return -weights.threat_penalty[enemy.type_index]
+    return 0
+
+def attack_term(unit, enemy, weights=DEFAULT_WEIGHTS):
+    """Bonus, wenn die Einheit enemy angreifen kann (verwundbare Gegner und gute Paarungen zählen mehr)."""
+    if _distance(unit, enemy) > ATTACK_RANGE[unit.type_index]:
+        return 0
+    score = weights.attack_in_range
+    if enemy.health < enemy.max_health * 0.5:
+        score += weights.attack_vulnerable
+    return score + TYPE_ADVANTAGE_BONUS[unit.type_index][enemy.type_index]
+
+class IncrementalEvaluator:
+    """
+    Zwischengespeicherte Bewertung aller Einheiten eines Spiels (game.get_evaluator(weights)).
+    refresh() vergleicht den kompakten Zustand jeder Einheit (Besitzer, Feld, HP, Spezialfähigkeit)
+    mit dem letzten Stand und rechnet nur geänderte Einheiten und ihre Paare neu:
+    O(Einheiten) für den Vergleich plus O(geänderte Einheiten * Gegner) statt O(Einheiten²).
+    Terrain-Änderungen werden nicht erkannt, danach reset() aufrufen.
+    """
+
+    def __init__(self, game, weights=DEFAULT_WEIGHTS):
+        self.game = game
+        self.weights = weights
+        self.reset()
+
+    def reset(self):
+        self._state = {}  # Einheit -> (Besitzer, Feld, HP, Spezialfähigkeit verbraucht)
+        self._unit_terms = {}  # Einheit -> unit_term
+        self._pairs = {}  # Einheit -> {Gegner: (threat_term, attack_term)}
+        self._threat_sum = {}  # Einheit -> Summe der Bedrohungsterme
+        self._attack_sum = {}  # Einheit -> Summe der Angriffsterme
+        self.units_recomputed = 0  # Statistik: neu bewertete Einheiten seit reset()
+
+    def refresh(self):
+        """Bringt alle Terme auf den aktuellen Stand des Spiels."""
+        current = {}
+        for owner, player in enumerate(self.game.players):
+            for unit in player.units:
+                if unit.position is not None:
+                    current[unit] = (owner, unit.position, unit.health, unit.special_ability_used)
+        state = self._state
+        removed = [unit for unit in state if unit not in current]
+        changed = [unit for unit, unit_state in current.items() if state.get(unit) != unit_state]
+        if not removed and not changed:
+            return
+        for unit in removed:
+            self._remove(unit)
+        self._state = current
+        board = self.game.board
+        for unit in changed:
+            self._unit_terms[unit] = unit_term(board, unit, self.weights)
+            self._pairs.setdefault(unit, {})
+            self._threat_sum.setdefault(unit, 0)
+            self._attack_sum.setdefault(unit, 0)
+        for unit in changed:
+            owner = current[unit][0]
+            for enemy, enemy_state in current.items():
+                if enemy_state[0] != owner:
+                    self._set_pair(unit, enemy)
+                    self._set_pair(enemy, unit)
+        self.units_recomputed += len(changed)
+
+    def _remove(self, unit):
+        for enemy in self._pairs.pop(unit, {}):
+            threat, attack = self._pairs[enemy].pop(unit)
+            self._threat_sum[enemy] -= threat
+            self._attack_sum[enemy] -= attack
+        del self._state[unit]
+        del self._unit_terms[unit]
+        del self._threat_sum[unit]
+        del self._attack_sum[unit]
+
+    def _set_pair(self, unit, enemy):
+        threat = threat_term(unit, enemy, self.weights)
+        attack = attack_term(unit, enemy, self.weights)
+        pairs = self._pairs[unit]
+        old_threat, old_attack = pairs.get(enemy, (0, 0))
+        pairs[enemy] = (threat, attack)
+        self._threat_sum[unit] += threat - old_threat
+        self._attack_sum[unit] += attack - old_attack
+
+    def score(self, unit):
+        """Bewertung nach dem letzten refresh() (wie AI._evaluate_unit_position)."""
+        unit_score = self._unit_terms.get(unit)
+        if unit_score is None:
+            return OFF_BOARD_SCORE
+        return unit_score + self._threat_sum[unit] + self._attack_sum[unit]
+
+    def evaluate(self, unit):
+        self.refresh()
+        return self.score(unit)
+
+    def player_score(self, player):
+        """Summe der Bewertungen aller Einheiten eines Spielers auf dem Brett."""
+        self.refresh()
+        return sum(self.score(unit) for unit in player.units if unit.position is not None)
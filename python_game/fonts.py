@@ -0,0 +1,14 @@
+import pygame
+
+# Schriften werden erst beim ersten Zeichnen geladen und dann wiederverwendet
+_fonts = {}
+
+def get_font(size):
+    """Gibt die Standardschrift in der gewünschten Größe zurück (einmal geladen pro Größe)."""
+    font = _fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
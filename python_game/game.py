@@ -1,21 +1,64 @@
-from .board import Board
+import logging
+from .board import Board, ray_offsets
+from .pathfinding import flood_fill, find_path
+from .terrain_analysis import get_analysis
 from .player import Player
+from .actions import Action, MOVE, ATTACK, SPECIAL
+from .combat import ARROW_STORM, lookup_damage
 from .units import Swordsman, Archer, Rider
-from .animations import AnimationManager, MeleeAttackAnimation, ArrowAnimation, HitAnimation, ArrowStormAnimation, MovementAnimation
-from .ai import AI
+from .unit_defs import ATTACK_RANGE, NEEDS_LINE_OF_SIGHT, MOVE_ORTHOGONAL, MOVES_PER_TURN, ACTIONS_PER_TURN
+from .history import History
+from .animations import AnimationManager, NullAnimationManager, MeleeAttackAnimation, ArrowAnimation, HitAnimation, ArrowStormAnimation, MovementAnimation
+
+log = logging.getLogger(__name__)  # Spielmeldungen, siehe units.py
+
+class AttackPrediction:
+    """Vorhergesagtes Ergebnis eines Angriffs (berechnet ohne das Spiel zu verändern)."""
+    __slots__ = ("damage", "in_range", "line_of_sight", "can_attack", "storm_damage", "lethal")
+
+    def __init__(self, damage, in_range, line_of_sight, can_attack, storm_damage, lethal):
+        self.damage = damage  # Tatsächlicher Schaden inklusive Terrain und Schild
+        self.in_range = in_range  # Chebyshev-Distanz innerhalb der Angriffsreichweite
+        self.line_of_sight = line_of_sight
+        self.can_attack = can_attack  # In Reichweite, Sichtlinie frei und das Ziel ist ein Gegner
+        self.storm_damage = storm_damage  # Zusätzlicher Schaden durch vorbereitete Pfeilregen
+        self.lethal = lethal
 
 class Game:
-    def __init__(self, game_mode="multiplayer", ai_difficulty="medium"):
-        self.board = Board()
+    def __init__(self, game_mode="multiplayer", ai_difficulty="medium", clock=None, headless=False, movement_rules="rhombus", turn_mode="single",
+                 map_seed=None, board_size=9, ai_value_net=False, history_depth=None):
+        # map_seed=None: feste Standardkarte, sonst prozedural erzeugt (gleicher Seed, gleiche Karte)
+        self.board = Board(board_size, terrain_seed=map_seed)
+        # Statische Terrain-Analyse, pro Karte nur einmal berechnet (Speicher- und Festplatten-Cache)
+        self.board.analysis = get_analysis(self.board)
+        # "rhombus": Rautenform mit geraden Strahlen (Standard)
+        # "weighted": kürzeste Wege mit Terrain-Kosten (siehe pathfinding)
+        self.movement_rules = movement_rules
+        # "single": eine Aktion pro Zug (Standard)
+        # "multi": jede Einheit hat pro Zug eine Bewegung und eine Aktion (Angriff oder Spezial)
+        self.turn_mode = turn_mode
         self.players = [Player(1, "Player 1"), Player(2, "Player 2")]
         self.current_turn = 0
-        self.animation_manager = AnimationManager()
+        # headless: keine Animationen sammeln und keine Debug-Ausgaben (z.B. auf dem Server)
+        self.debug = not headless
+        if headless:
+            self.animation_manager = NullAnimationManager(clock)
+        else:
+            self.animation_manager = AnimationManager(clock)  # clock=None: Echtzeit
         self.pending_special_effects = []  # Spezialfähigkeiten, die in der nächsten Runde ausgeführt werden
         self.arrow_storm_effects = []  # Pfeilregen-Effekte, die nach dem Gegnerzug ausgeführt werden
         self.delayed_arrow_storm_effects = []  # Pfeilregen-Effekte, die erst nach dem kompletten Gegnerzug ausgeführt werden
         self.arrow_storm_animations = []  # Liste aller aktiven Pfeilregen-Animationen
         self.turn_switch_count = 0  # Zähler für Zugwechsel
         self.last_arrow_storm_player = None  # Spieler, der den Pfeilregen vorbereitet hat
+        self._prediction_cache = {}  # (Angreifer, Ziel) -> AttackPrediction für die aktuelle Brett-Version
+        self._prediction_version = None
+        self._listeners = []  # Werden nach jeder Zustandsänderung aufgerufen
+        self._evaluators = {}  # AIWeights -> IncrementalEvaluator, erst bei Bedarf (KI "hard") erzeugt
+        self.last_action = None  # Action der letzten erfolgreichen Aktion
+        # Rückgängig/Wiederholen, make/unmake für Suchen; history_depth begrenzt die Schritte für Rückgängig
+        # (None: unbegrenzt, 0: nur make/unmake, z.B. für Selbstspiele und den Server)
+        self.history = History(self, history_depth)
         
         # KI-Einstellungen
         self.game_mode = game_mode
@@ -23,8 +66,9 @@ class Game:
         self.ai = None
         
         if game_mode == "singleplayer":
-            # KI für Spieler 2 (Computer)
-            self.ai = AI(self.players[1], ai_difficulty)
+            # KI für Spieler 2 (Computer); erst hier importieren, Multiplayer braucht sie nicht
+            from .ai import AI
+            self.ai = AI(self.players[1], ai_difficulty, value_net=self._load_value_net() if ai_value_net else None)
             self.ai.set_game(self)
             
         self._setup_units()
@@ -34,6 +78,7 @@ class Game:
         p1 = self.players[0]
         units_p1 = [Swordsman(p1), Archer(p1), Rider(p1)]
         for i, unit in enumerate(units_p1):
+            unit.unit_id = i
             p1.add_unit(unit)
             self.board.place_unit(unit, i * 2 + 1, 0)
         
@@ -41,8 +86,9 @@ class Game:
         p2 = self.players[1]
         units_p2 = [Swordsman(p2), Archer(p2), Rider(p2)]
         for i, unit in enumerate(units_p2):
+            unit.unit_id = len(units_p1) + i
             p2.add_unit(unit)
-            self.board.place_unit(unit, i * 2 + 1, 8)
+            self.board.place_unit(unit, i * 2 + 1, self.board.size - 1)
 
     def start_game(self):
         while not self._check_game_over():
@@ -107,6 +153,7 @@ class Game:
                 return
 
             if self.board.move_unit(unit, new_x, new_y):
+                self._state_changed()
                 print(f"Moved unit to ({new_x},{new_y})")
             else:
                 print("Invalid move.")
@@ -132,6 +179,7 @@ class Game:
                 if target_unit.health == 0:
                     target_unit.player.remove_unit(target_unit)
                     self.board.grid[target_y][target_x] = None
+                self._state_changed()
             else:
                  print("Attack failed.")
 
@@ -149,6 +197,75 @@ class Game:
         except (ValueError, IndexError):
             print("Invalid input for coordinates.")
 
+    def add_listener(self, callback):
+        """Registriert callback(game), das nach jeder Zustandsänderung aufgerufen wird."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _state_changed(self):
+        """Wird nach jeder Zustandsänderung aufgerufen (invalidiert Vorhersagen, benachrichtigt Listener)."""
+        self.board.mark_changed()
+        for callback in self._listeners:
+            callback(self)
+
+    @property
+    def evaluator(self):
+        """Inkrementelle Bewertung aller Einheiten mit den Standardgewichten."""
+        return self.get_evaluator()
+
+    def get_evaluator(self, weights=None):
+        """Inkrementelle Bewertung (evaluation.IncrementalEvaluator) für einen Gewichtssatz, None: Standard."""
+        from .evaluation import IncrementalEvaluator, DEFAULT_WEIGHTS
+        weights = weights or DEFAULT_WEIGHTS
+        evaluator = self._evaluators.get(weights)
+        if evaluator is None:
+            evaluator = self._evaluators[weights] = IncrementalEvaluator(self, weights)
+        return evaluator
+
+    def predict_attack(self, attacker, target_unit):
+        """
+        Sagt den Schaden eines normalen Angriffs voraus, inklusive Terrain, Schild,
+        Sichtlinie und vorbereiteter Pfeilregen. Ergebnisse werden pro Brett-Version gecached.
+        """
+        if self._prediction_version != self.board.version:
+            self._prediction_cache.clear()
+            self._prediction_version = self.board.version
+        key = (id(attacker), id(target_unit))
+        prediction = self._prediction_cache.get(key)
+        if prediction is not None:
+            return prediction
+
+        board = self.board
+        damage = lookup_damage(board, attacker, target_unit)
+        # Nur dieses eine Ziel prüfen: Chebyshev-Distanz gegen die Reichweite, dann die Sichtlinie
+        in_range = False
+        line_of_sight = True
+        if attacker.position is not None:
+            start_x, start_y = attacker.position
+            target_x, target_y = target_unit.position
+            in_range = max(abs(start_x - target_x), abs(start_y - target_y)) <= ATTACK_RANGE[attacker.type_index]
+            if NEEDS_LINE_OF_SIGHT[attacker.type_index]:
+                line_of_sight = board._has_line_of_sight(start_x, start_y, target_x, target_y)
+        can_attack = in_range and line_of_sight and target_unit.player != attacker.player
+
+        # Vorbereitete Pfeilregen des Angreifers treffen nach dem Angriff (Schild ggf. verbraucht)
+        remaining_health = target_unit.health - damage if can_attack else target_unit.health
+        shield = False if can_attack else None
+        storm_damage = 0
+        for effect_type, unit, animation in self.delayed_arrow_storm_effects:
+            if unit.player == attacker.player and unit.arrow_storm_hits(*target_unit.position):
+                storm_damage += lookup_damage(board, unit, target_unit, ARROW_STORM, shield)
+                shield = False
+
+        lethal = can_attack and damage >= target_unit.health
+        prediction = AttackPrediction(damage, in_range, line_of_sight, can_attack, storm_damage,
+                                      lethal or storm_damage >= remaining_health)
+        self._prediction_cache[key] = prediction
+        return prediction
+
     def attempt_special_ability(self, unit, target_x, target_y):
         """
         Versucht eine Spezialfähigkeit zu verwenden.
@@ -156,11 +273,20 @@ class Game:
         """
         if unit.special_ability_used:
             return False, "Spezialfähigkeit bereits verbraucht."
+        if not self.can_act(unit):
+            return False, "Einheit hat in diesem Zug bereits gehandelt."
+        action = Action(SPECIAL, unit.position, (target_x, target_y))
+        # Sturmangriff trifft die Einheit am Ziel
+        self.history.begin((unit, self.board.get_unit_at(target_x, target_y) if isinstance(unit, Rider) else None))
             
         if isinstance(unit, Swordsman):
             # Schild hoch - sofort aktiv
             success = unit.use_special_ability()
             if success:
+                unit.actions_left -= 1
+                self.last_action = action
+                self.history.commit(action)
+                self._state_changed()
                 return True, "Schild hoch aktiviert! Schaden wird für den nächsten Angriff halbiert."
             return False, "Spezialfähigkeit fehlgeschlagen."
             
@@ -168,14 +294,18 @@ class Game:
             # Pfeilregen - wird nach dem kompletten Gegnerzug ausgeführt
             success = unit.use_special_ability(target_x, target_y, self.board)
             if success:
-                print(f"DEBUG: Pfeilregen vorbereitet auf ({target_x}, {target_y}) von Spieler {unit.player.id}")
+                self._debug_print(f"Pfeilregen vorbereitet auf ({target_x}, {target_y}) von Spieler {unit.player.id}")
                 # Animation für Pfeilregen-Bereich
-                arrow_storm_anim = ArrowStormAnimation((target_x, target_y))
+                arrow_storm_anim = ArrowStormAnimation((target_x, target_y), board_size=self.board.size)
                 self.animation_manager.add_animation(arrow_storm_anim)
                 self.arrow_storm_animations.append(arrow_storm_anim)
                 self.delayed_arrow_storm_effects.append(('arrow_storm', unit, arrow_storm_anim))
                 self.last_arrow_storm_player = unit.player.id
-                print(f"DEBUG: Verzögerte Pfeilregen-Effekte in Queue: {len(self.delayed_arrow_storm_effects)}")
+                self._debug_print(f"Verzögerte Pfeilregen-Effekte in Queue: {len(self.delayed_arrow_storm_effects)}")
+                unit.actions_left -= 1
+                self.last_action = action
+                self.history.commit(action)
+                self._state_changed()
                 return True, f"Pfeilregen vorbereitet auf ({target_x}, {target_y})!"
             return False, "Pfeilregen fehlgeschlagen."
             
@@ -186,12 +316,18 @@ class Game:
                 # Führe Sturmangriff aus
                 charge_success = unit.execute_charge(self.board)
                 if charge_success:
+                    # Der Sturmangriff bewegt den Reiter: verbraucht Aktion und Bewegung
+                    unit.actions_left -= 1
+                    unit.moves_left = 0
+                    self.last_action = action
+                    self.history.commit(action)
+                    self._state_changed()
                     return True, "Sturmangriff erfolgreich ausgeführt!"
                 else:
                     # Wenn der Sturmangriff fehlschlägt, setze die Fähigkeit zurück
                     unit.special_ability_used = False
                     unit.charge_target = None
-                    unit.charge_path = []
+                    unit.charge_path = ()
                     return False, "Sturmangriff fehlgeschlagen - Unerwarteter Fehler."
             return False, "Sturmangriff fehlgeschlagen - Ungültiges Ziel."
             
@@ -217,11 +353,11 @@ class Game:
         self.delayed_arrow_storm_effects = remaining_effects
         
         if effects_to_execute:
-            print(f"DEBUG: Führe {len(effects_to_execute)} verzögerte Pfeilregen-Effekte für Spieler {current_player_id} aus")
+            self._debug_print(f"Führe {len(effects_to_execute)} verzögerte Pfeilregen-Effekte für Spieler {current_player_id} aus")
             
             for effect_type, unit, animation in effects_to_execute:
                 if effect_type == 'arrow_storm':
-                    print(f"DEBUG: Führe verzögerten Pfeilregen für {unit.__class__.__name__} aus")
+                    self._debug_print(f"Führe verzögerten Pfeilregen für {unit.__class__.__name__} aus")
                     targets_hit = unit.execute_arrow_storm(self.board)
                     
                     # Animationen für getroffene Ziele
@@ -237,7 +373,7 @@ class Game:
             
             # Beende die entsprechenden Pfeilregen-Animationen
             animations_to_finish = [effect[2] for effect in effects_to_execute]
-            print(f"DEBUG: Beende {len(animations_to_finish)} Pfeilregen-Animationen")
+            self._debug_print(f"Beende {len(animations_to_finish)} Pfeilregen-Animationen")
             for anim in animations_to_finish:
                 if anim in self.arrow_storm_animations:
                     anim.finish()
@@ -247,18 +383,59 @@ class Game:
             if not self.arrow_storm_animations:
                 self.last_arrow_storm_player = None
 
+    def _load_value_net(self):
+        """Gelerntes Bewertungsnetz für die KI (value_net.py) oder None: dann spielt die KI mit der Heuristik."""
+        try:
+            from .value_net import load_value_net
+        except ImportError:
+            log.warning("Bewertungsnetz braucht NumPy (pip install numpy), KI nutzt die Heuristik.")
+            return None
+        value_net = load_value_net()
+        if value_net is None:
+            log.warning("Kein Bewertungsnetz gefunden (python3 -m python_game.train_value), KI nutzt die Heuristik.")
+        elif value_net.board_size != self.board.size:
+            log.warning("Bewertungsnetz ist für %sx%s trainiert, KI nutzt die Heuristik.", value_net.board_size, value_net.board_size)
+            return None
+        return value_net
+
+    def _debug_print(self, message):
+        """Gibt Debug-Nachrichten aus (nicht bei headless Spielen)."""
+        if self.debug:
+            print(f"DEBUG: {message}")
+        
     def end_turn(self):
         """Beendet den aktuellen Zug und führt Rundenende-Effekte aus"""
-        print(f"DEBUG: Ende Zug für Spieler {self.current_turn + 1}")
+        self._debug_print(f"Ende Zug für Spieler {self.current_turn + 1}")
+        self.history.begin(self._turn_change_units())
         # Beende Effekte für alle Einheiten des aktuellen Spielers
         current_player = self.players[self.current_turn]
         for unit in current_player.units:
             if hasattr(unit, 'end_turn'):
                 unit.end_turn()
         
+        # Budgets des nächsten Spielers auffrischen
+        for unit in self.players[(self.current_turn + 1) % 2].units:
+            unit.reset_turn_budget()
+        
         # Wechsle zum nächsten Spieler
         self.switch_turn()
-        print(f"DEBUG: Wechsle zu Spieler {self.current_turn + 1}")
+        self.history.commit(None)
+        self._debug_print(f"Wechsle zu Spieler {self.current_turn + 1}")
+
+    def _turn_change_units(self):
+        """
+        Einheiten, die der Zugwechsel ändern kann (für den Verlauf): aufgefrischte Budgets des
+        nächsten Spielers sowie Bogenschützen und Ziele seiner fälligen Pfeilregen.
+        """
+        upcoming = self.players[(self.current_turn + 1) % 2]
+        units = [unit for unit in upcoming.units
+                 if unit.moves_left != MOVES_PER_TURN or unit.actions_left != ACTIONS_PER_TURN]
+        for effect_type, archer, animation in self.delayed_arrow_storm_effects:
+            if archer.player is upcoming and archer.arrow_storm_target:
+                target_x, target_y = archer.arrow_storm_target
+                units.append(archer)
+                units.extend(self.board.get_unit_at(target_x + dx, target_y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        return units
 
     def _check_game_over(self):
         return not self.players[0].units or not self.players[1].units
@@ -272,13 +449,52 @@ class Game:
         self.current_turn = (self.current_turn + 1) % 2
         self.turn_switch_count += 1
         
-        print(f"DEBUG: Zugwechsel von Spieler {old_turn + 1} zu Spieler {self.current_turn + 1}")
-        print(f"DEBUG: Turn switch count: {self.turn_switch_count}")
-        print(f"DEBUG: Last arrow storm player: {self.last_arrow_storm_player}")
+        self._debug_print(f"Zugwechsel von Spieler {old_turn + 1} zu Spieler {self.current_turn + 1}")
+        self._debug_print(f"Turn switch count: {self.turn_switch_count}")
+        self._debug_print(f"Last arrow storm player: {self.last_arrow_storm_player}")
         
         # Führe verzögerte Pfeilregen-Effekte aus, wenn der Spieler wechselt
         # Jeder Pfeilregen wird ausgeführt, wenn der entsprechende Spieler wieder an der Reihe ist
         self.execute_delayed_arrow_storm_effects()
+        self._state_changed()
+
+    def can_move(self, unit):
+        """Prüft das Bewegungsbudget der Einheit (nur im Modus "multi" begrenzt)."""
+        return self.turn_mode != "multi" or unit.moves_left > 0
+
+    def can_act(self, unit):
+        """Prüft das Aktionsbudget der Einheit (Angriff oder Spezialfähigkeit, nur im Modus "multi" begrenzt)."""
+        return self.turn_mode != "multi" or unit.actions_left > 0
+
+    def is_turn_exhausted(self):
+        """
+        Gibt True zurück, wenn der aktuelle Spieler nichts mehr tun kann und der Zug enden sollte.
+        Im Modus "single" ist das nach jeder erfolgreichen Aktion der Fall.
+        """
+        if self.turn_mode != "multi":
+            return True
+        return not any(unit.has_turn_budget() for unit in self.players[self.current_turn].units)
+
+    def get_reachable_positions(self, unit):
+        """Alle Felder, auf die sich die Einheit nach den aktuellen Bewegungsregeln bewegen kann."""
+        if self.movement_rules == "weighted":
+            return flood_fill(self.board, unit).positions()
+        return self.board.get_reachable_positions_rhombus(unit, unit.movement_speed)
+
+    def get_movement_path(self, unit, x, y):
+        """
+        Weg der Einheit zum Feld (x, y) als Liste von Feldern (ohne Start, mit Ziel),
+        oder None, wenn das Feld nicht erreichbar ist.
+        """
+        if unit.position is None:
+            return None
+        if self.movement_rules == "weighted":
+            return find_path(self.board, unit, (x, y), budget=MOVE_ORTHOGONAL[unit.type_index])
+        if (x, y) not in self.board.get_reachable_positions_rhombus(unit, unit.movement_speed):
+            return None
+        # Rautenform: gerader Strahl, bei Springerzügen über das Zwischenfeld
+        start_x, start_y = unit.position
+        return [(start_x + dx, start_y + dy) for dx, dy in ray_offsets(x - start_x, y - start_y)] + [(x, y)]
 
     def attempt_move(self, unit, new_x, new_y):
         """
@@ -287,18 +503,25 @@ class Game:
         """
         if unit.position is None:
             return False, "Einheit hat keine Position."
+        if not self.can_move(unit):
+            return False, "Einheit hat sich in diesem Zug bereits bewegt."
 
-        # Prüfe, ob das Ziel erreichbar ist (Rautenform)
-        reachable_positions = self.board.get_reachable_positions_rhombus(unit, unit.movement_speed)
-        if (new_x, new_y) not in reachable_positions:
+        # Prüfe, ob das Ziel erreichbar ist
+        path = self.get_movement_path(unit, new_x, new_y)
+        if path is None:
             return False, "Ziel ist nicht erreichbar."
 
         old_pos = unit.position
+        self.history.begin((unit,))
         if self.board.move_unit(unit, new_x, new_y):
-            # Füge Bewegungsanimation hinzu
+            # Füge Bewegungsanimation entlang des Weges hinzu
             self.animation_manager.add_animation(
-                MovementAnimation(old_pos, (new_x, new_y), unit)
+                MovementAnimation(old_pos, (new_x, new_y), unit, path=path)
             )
+            unit.moves_left -= 1
+            self.last_action = Action(MOVE, old_pos, (new_x, new_y))
+            self.history.commit(self.last_action)
+            self._state_changed()
             return True, f"Einheit nach ({new_x},{new_y}) bewegt."
         else:
             return False, "Ungültiger Zug. Position ist möglicherweise besetzt."
@@ -315,12 +538,15 @@ class Game:
 
         if target_unit.player == attacker.player:
             return False, "Kann eigene Einheit nicht angreifen."
+        if not self.can_act(attacker):
+            return False, "Einheit hat in diesem Zug bereits gehandelt."
         
-        # Prüfe Sichtlinie für Bogenschützen
-        if isinstance(attacker, Archer) and attacker.position is not None:
+        # Prüfe Sichtlinie für Fernkämpfer (Bogenschützen)
+        if NEEDS_LINE_OF_SIGHT[attacker.type_index] and attacker.position is not None:
             if not self.board._has_line_of_sight(attacker.position[0], attacker.position[1], target_x, target_y):
                 return False, "Sichtlinie blockiert (Berg im Weg)."
         
+        self.history.begin((attacker, target_unit))
         if attacker.attack(target_unit, self.board):
             # Animation basierend auf Einheitentyp hinzufügen
             attacker_pos = attacker.position
@@ -347,6 +573,10 @@ class Game:
                 target_unit.player.remove_unit(target_unit)
                 self.board.grid[target_y][target_x] = None
                 message += f" {target_unit.__class__.__name__} wurde besiegt."
+            attacker.actions_left -= 1
+            self.last_action = Action(ATTACK, attacker_pos, target_pos)
+            self.history.commit(self.last_action)
+            self._state_changed()
             return True, message
         else:
              return False, "Angriff fehlgeschlagen. Ziel möglicherweise außer Reichweite."
@@ -355,17 +585,18 @@ class Game:
         """Führt einen Angriff zwischen zwei Einheiten aus."""
         current_player = self.players[self.current_turn]
         if attacking_unit.player != current_player:
-            print("It's not your turn!")
+            log.info("It's not your turn!")
             return False
             
         if attacking_unit.special_ability_used:
-            print("Unit has already used its special ability this turn!")
+            log.info("Unit has already used its special ability this turn!")
             return False
             
         # Führe den Angriff aus
         success = attacking_unit.attack(target_unit, self.board)
         
         if success:
+            self._state_changed()
             # Prüfe, ob die Ziel-Einheit besiegt wurde
             if target_unit.health <= 0:
                 # Entferne die Einheit vom Brett
@@ -373,16 +604,15 @@ class Game:
                     self.board.grid[target_unit.position[1]][target_unit.position[0]] = None
                     target_unit.position = None
                     
-                # Entferne die Einheit aus der Spieler-Liste
-                if target_unit in target_unit.player.units:
-                    target_unit.player.units.remove(target_unit)
+                # Entferne die Einheit aus dem Register des Spielers
+                target_unit.player.remove_unit(target_unit)
                     
-                print(f"{target_unit.__class__.__name__} from Player {target_unit.player.id} has been defeated!")
+                log.info("%s from Player %s has been defeated!", target_unit.__class__.__name__, target_unit.player.id)
                 
                 # Prüfe, ob das Spiel vorbei ist
                 if len(target_unit.player.units) == 0:
                     self.game_over = True
                     self.winner = current_player
-                    print(f"Player {self.winner.id} wins!")
+                    log.info("Player %s wins!", self.winner.id)
         
         return success
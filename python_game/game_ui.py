@@ -1,18 +1,77 @@
 import pygame
+from .fonts import get_font
 from .units import Swordsman
 
+class HoverPreview:
+    """Schadensvorhersage für das Feld unter der Maus; wird nur bei Änderungen neu berechnet."""
+    def __init__(self):
+        self._key = None
+        self.cell = None
+        self.prediction = None
+
+    def update(self, cell, selected_unit, game):
+        """Aktualisiert die Vorhersage. Gibt True zurück, wenn sie neu berechnet wurde."""
+        key = (cell, id(selected_unit), id(game), game.board.version)
+        if key == self._key:
+            return False
+        self._key = key
+        self.cell = cell
+        self.prediction = None
+        
+        if selected_unit and cell:
+            target_unit = game.board.get_unit_at(cell[0], cell[1])
+            # Nur für gegnerische Einheiten
+            if target_unit and target_unit.player != selected_unit.player:
+                self.prediction = game.predict_attack(selected_unit, target_unit)
+        return True
+
 class GameUI:
-    def __init__(self, screen_width, screen_height, board_size, square_size):
+    def __init__(self, screen_width, screen_height, board_size, square_size, board_x=0):
+        self.board_size = board_size
+        self.hover_preview = HoverPreview()
+        self._preview_label = None  # Gerenderte Vorhersage (Hintergrund, Rahmen und Text)
+        self.resize(screen_width, screen_height, square_size, board_x)
+        
+        # Farben
+        self.ui_bg_color = (50, 50, 50)
+        self.text_color = (255, 255, 255)
+        self.button_color = (100, 100, 100)
+        self.button_hover_color = (150, 150, 150)
+        self.special_button_color = (150, 100, 50)  # Orange für Spezialfähigkeiten
+        self.special_button_hover_color = (200, 150, 100)
+        self.damage_text_color = (255, 0, 0)
+        self.damage_text_blocked_color = (160, 160, 160)
+        self.tooltip_bg_color = (0, 0, 0, 200)
+        
+        # Spezialfähigkeiten-Tooltips
+        self.special_tooltips = {
+            "Swordsman": "Schild hoch: Halbiert erlittenen Schaden für 1 Runde",
+            "Archer": "Pfeilregen: Trifft Ziel und alle angrenzenden Felder",
+            "Rider": "Sturmangriff: Bewegt sich mehrere Felder und greift an"
+        }
+        
+    # Schriften erst beim ersten Zeichnen laden (schnellerer Start)
+    @property
+    def font_medium(self):
+        return get_font(32)
+
+    @property
+    def font_small(self):
+        return get_font(24)
+
+    @property
+    def font_tiny(self):
+        return get_font(18)
+
+    def resize(self, screen_width, screen_height, square_size, board_x=0):
+        """Berechnet UI-Bereich und Buttons für eine neue Fenster- bzw. Feldgröße."""
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.board_size = board_size
         self.square_size = square_size
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
-        self.font_tiny = pygame.font.Font(None, 18)
+        self.board_x = board_x  # Horizontaler Versatz des Spielfelds
         
         # UI-Bereich unter dem Spielfeld
-        self.ui_area_y = board_size * square_size
+        self.ui_area_y = self.board_size * square_size
         self.ui_height = screen_height - self.ui_area_y
         
         # Buttons
@@ -34,22 +93,14 @@ class GameUI:
             button_height
         )
         
-        # Farben
-        self.ui_bg_color = (50, 50, 50)
-        self.text_color = (255, 255, 255)
-        self.button_color = (100, 100, 100)
-        self.button_hover_color = (150, 150, 150)
-        self.special_button_color = (150, 100, 50)  # Orange für Spezialfähigkeiten
-        self.special_button_hover_color = (200, 150, 100)
-        self.damage_text_color = (255, 0, 0)
-        self.tooltip_bg_color = (0, 0, 0, 200)
-        
-        # Spezialfähigkeiten-Tooltips
-        self.special_tooltips = {
-            "Swordsman": "Schild hoch: Halbiert erlittenen Schaden für 1 Runde",
-            "Archer": "Pfeilregen: Trifft Ziel und alle angrenzenden Felder",
-            "Rider": "Sturmangriff: Bewegt sich mehrere Felder und greift an"
-        }
+        # Zug beenden (nur im Modus "multi"), links neben dem Spezial-Button
+        self.end_turn_button = pygame.Rect(
+            screen_width - 2 * button_width - 20 - button_spacing, 
+            self.ui_area_y + 20 + button_height + button_spacing, 
+            button_width, 
+            button_height
+        )
+        self.end_turn_visible = False
         
     def draw(self, screen, selected_unit, game):
         # UI-Hintergrund
@@ -57,15 +108,23 @@ class GameUI:
         pygame.draw.rect(screen, self.ui_bg_color, ui_rect)
         pygame.draw.line(screen, (255, 255, 255), (0, self.ui_area_y), (self.screen_width, self.ui_area_y), 2)
         
+        self.end_turn_visible = game.turn_mode == "multi"
+        if self.end_turn_visible:
+            self._draw_end_turn_button(screen)
+        
         if selected_unit:
             self._draw_unit_info(screen, selected_unit)
+            if self.end_turn_visible:
+                self._draw_turn_budget(screen, selected_unit)
             self._draw_attack_button(screen)
             self._draw_special_button(screen, selected_unit)
             self._draw_tooltips(screen)
         else:
             # Keine Einheit ausgewählt
             text = self.font_medium.render("Wähle eine Einheit aus", True, self.text_color)
-            text_rect = text.get_rect(center=(self.screen_width // 2, self.ui_area_y + self.ui_height // 2))
+            # Mit "Zug beenden"-Button links daneben zentrieren
+            center_x = self.end_turn_button.left // 2 if self.end_turn_visible else self.screen_width // 2
+            text_rect = text.get_rect(center=(center_x, self.ui_area_y + self.ui_height // 2))
             screen.blit(text, text_rect)
             
     def _draw_unit_info(self, screen, unit):
@@ -103,6 +162,22 @@ class GameUI:
             special_status = self.font_small.render("Spezialfähigkeit: Verfügbar", True, (0, 255, 0))
         screen.blit(special_status, (info_x, info_y + 95))
         
+    def _draw_turn_budget(self, screen, unit):
+        # Verbleibendes Budget im Modus "multi"
+        budget = f"Übrig: {unit.moves_left} Bewegung, {unit.actions_left} Aktion"
+        color = self.text_color if unit.has_turn_budget() else (160, 160, 160)
+        budget_text = self.font_tiny.render(budget, True, color)
+        screen.blit(budget_text, (20, self.ui_area_y + 135))
+        
+    def _draw_end_turn_button(self, screen):
+        color = self.button_hover_color if self._is_mouse_over_button(self.end_turn_button) else self.button_color
+        pygame.draw.rect(screen, color, self.end_turn_button)
+        pygame.draw.rect(screen, (255, 255, 255), self.end_turn_button, 2)
+        
+        text = self.font_small.render("Zug beenden", True, self.text_color)
+        text_rect = text.get_rect(center=self.end_turn_button.center)
+        screen.blit(text, text_rect)
+        
     def _draw_attack_button(self, screen):
         # Button-Hintergrund
         color = self.button_hover_color if self._is_mouse_over_button(self.attack_button) else self.button_color
@@ -130,6 +205,8 @@ class GameUI:
         return button.collidepoint(mouse_pos)
         
     def handle_click(self, mouse_pos):
+        if self.end_turn_visible and self.end_turn_button.collidepoint(mouse_pos):
+            return "end_turn"
         if self.attack_button.collidepoint(mouse_pos):
             return "attack"
         elif self.special_button.collidepoint(mouse_pos):
@@ -166,38 +243,50 @@ class GameUI:
         
     def draw_damage_prediction(self, screen, mouse_pos, selected_unit, game):
         """Zeichnet Schadensvorhersage beim Hovern über Gegner"""
-        if not selected_unit:
-            return
-            
         # Konvertiere Mausposition zu Gitter-Koordinaten
-        grid_x = mouse_pos[0] // self.square_size
-        grid_y = mouse_pos[1] // self.square_size
-        
-        # Prüfe, ob Maus über dem Spielfeld ist
-        if not (0 <= grid_x < self.board_size and 0 <= grid_y < self.board_size):
+        cell = None
+        board_mouse_x = mouse_pos[0] - self.board_x
+        if board_mouse_x >= 0 and mouse_pos[1] >= 0:
+            grid_x = board_mouse_x // self.square_size
+            grid_y = mouse_pos[1] // self.square_size
+            # Prüfe, ob Maus über dem Spielfeld ist
+            if 0 <= grid_x < self.board_size and 0 <= grid_y < self.board_size:
+                cell = (grid_x, grid_y)
+                
+        # Nur neu berechnen, wenn sich Feld, Einheit oder Brett-Version geändert haben
+        if self.hover_preview.update(cell, selected_unit, game):
+            self._preview_label = self._render_prediction(self.hover_preview.prediction)
+            
+        if self._preview_label is None:
             return
             
-        target_unit = game.board.get_unit_at(grid_x, grid_y)
+        # Position über der Einheit
+        grid_x, grid_y = self.hover_preview.cell
+        label_x = self.board_x + grid_x * self.square_size + self.square_size // 2 - self._preview_label.get_width() // 2
+        label_y = grid_y * self.square_size - 30
+        screen.blit(self._preview_label, (label_x, label_y))
         
-        # Nur anzeigen, wenn über einem gegnerischen Einheit gehovert wird
-        if target_unit and target_unit.player != selected_unit.player:
-            # Berechne voraussichtlichen Schaden
-            damage_modifier = selected_unit.get_damage_modifier(target_unit)
-            predicted_damage = int(selected_unit.attack_power * damage_modifier)
-            
-            # Zeichne Schadensvorhersage über der Einheit
-            damage_text = self.font_small.render(f"{predicted_damage} Schaden", True, self.damage_text_color)
+    def _render_prediction(self, prediction):
+        """Rendert die Vorhersage einmalig als Oberfläche mit Hintergrund."""
+        if prediction is None:
+            return None
             
-            # Position über der Einheit
-            text_x = grid_x * self.square_size + self.square_size // 2 - damage_text.get_width() // 2
-            text_y = grid_y * self.square_size - 30
-            
-            # Hintergrund für bessere Lesbarkeit
-            bg_rect = damage_text.get_rect()
-            bg_rect.x = text_x
-            bg_rect.y = text_y
-            bg_rect.inflate_ip(10, 5)
-            pygame.draw.rect(screen, (0, 0, 0), bg_rect)
-            pygame.draw.rect(screen, self.damage_text_color, bg_rect, 2)
-            
-            screen.blit(damage_text, (text_x, text_y)) 
\ No newline at end of file
+        text = f"{prediction.damage} Schaden"
+        if prediction.storm_damage:
+            text += f" +{prediction.storm_damage} Pfeilregen"
+        if prediction.lethal:
+            text += " (tödlich)"
+        if not prediction.in_range:
+            text += " - außer Reichweite"
+        elif not prediction.line_of_sight:
+            text += " - keine Sichtlinie"
+        color = self.damage_text_color if prediction.can_attack else self.damage_text_blocked_color
+        damage_text = self.font_small.render(text, True, color)
+        
+        # Hintergrund für bessere Lesbarkeit
+        bg_rect = damage_text.get_rect().inflate(10, 5)
+        label = pygame.Surface(bg_rect.size)
+        label.fill((0, 0, 0))
+        pygame.draw.rect(label, color, label.get_rect(), 2)
+        label.blit(damage_text, damage_text.get_rect(center=label.get_rect().center))
+        return label
@@ -0,0 +1,192 @@
+import contextlib
+from operator import attrgetter
+
+from .actions import apply_action
+from .animations import NullAnimationManager
+
+# Verlauf für Rückgängig/Wiederholen (game.history). Jede erfolgreiche Aktion und jeder Zugwechsel
+# legt einen Schritt ab: den Zustand der betroffenen Einheiten (Feld, HP, Budget, Spezialfelder,
+# ob sie im Register des Spielers steht) und die wenigen Spielfelder (Zug, Pfeilregen-Warteschlange)
+# vor und nach dem Schritt. Den Platz im Register merkt sich Player.remove_unit beim Entfernen. Zurücknehmen und Wiederholen setzen nur diese Werte zurück,
+# der Aufwand hängt also von der Größe der Änderung ab, nicht von der des Spiels.
+# make/unmake (mit simulation) sind die Grundlage für Suchen auf dem laufenden Spiel ohne Kopie.
+# max_depth begrenzt die Schritte für Rückgängig (0: keine Aufzeichnung, z.B. Selbstspiele und Server);
+# make/unmake und simulation zeichnen immer auf.
+
+UNIT_FIELDS = ("position", "health", "special_ability_used", "moves_left", "actions_left")
+_fields_by_class = {}  # Klasse -> (veränderliche Felder, attrgetter dafür)
+
+def _class_fields(unit):
+    entry = _fields_by_class.get(type(unit))
+    if entry is None:
+        fields = UNIT_FIELDS + type(unit).__slots__  # plus Felder der Unterklasse (Schild, Ziele)
+        entry = _fields_by_class[type(unit)] = (fields, attrgetter(*fields))
+    return entry
+
+def unit_fields(unit):
+    return _class_fields(unit)[0]
+
+def capture_units(units):
+    """Pro Einheit (Einheit, im Register ihres Spielers?, Feldwerte)."""
+    return [(unit, unit.player.has_unit(unit), _class_fields(unit)[1](unit)) for unit in units]
+
+def capture_game(game):
+    return (game.current_turn, game.turn_switch_count, game.last_arrow_storm_player, game.last_action,
+            tuple(game.delayed_arrow_storm_effects), tuple(game.arrow_storm_animations))
+
+class Step:
+    """Ein Schritt im Verlauf: action ist die Action oder None für einen Zugwechsel."""
+    __slots__ = ("action", "before", "after")
+
+    def __init__(self, action, before):
+        self.action = action
+        self.before = before  # (capture_game, capture_units)
+        self.after = None  # Erst beim Zurücknehmen festgehalten (dann ist der aktuelle Zustand der danach)
+
+class History:
+    def __init__(self, game, max_depth=None):
+        self.game = game
+        self.max_depth = max_depth  # None: unbegrenzt
+        self.undo_stack = []
+        self.redo_stack = []
+        self._pending = None  # Zustand vor dem laufenden Schritt (begin)
+        self._marks = []  # Stapel von mark() für make/unmake
+        self._simulations = 0  # Laufende simulation()-Blöcke
+
+    def _recording(self):
+        return self.max_depth != 0 or self._marks or self._simulations
+
+    def begin(self, units):
+        """Vor einer Änderung: hält den Zustand der Einheiten fest, die sie betreffen kann."""
+        if not self._recording():
+            return
+        units = [unit for unit in dict.fromkeys(units) if unit is not None] if units else []
+        self._pending = (capture_game(self.game), capture_units(units))
+
+    def commit(self, action):
+        """Nach einer erfolgreichen Änderung: legt den Schritt ab (neuer Zweig, Wiederholen verfällt)."""
+        if self._pending is None:
+            return
+        self.undo_stack.append(Step(action, self._pending))
+        self._pending = None
+        self.redo_stack = []  # neue Liste: revert() kann die alte wiederherstellen
+        if self.max_depth is not None and len(self.undo_stack) > self.max_depth and not (self._marks or self._simulations):
+            # Während einer Suche nie kürzen: mark() merkt sich die Länge des Stapels
+            del self.undo_stack[:len(self.undo_stack) - self.max_depth]
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self):
+        """Nimmt den letzten Schritt zurück. Gibt den Schritt zurück oder None."""
+        if not self.undo_stack:
+            return None
+        step = self.undo_stack.pop()
+        step.after = (capture_game(self.game), capture_units([unit for unit, _, _ in step.before[1]]))
+        self._restore(step.before)
+        self.redo_stack.append(step)
+        return step
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        step = self.redo_stack.pop()
+        self._restore(step.after)
+        self.undo_stack.append(step)
+        return step
+
+    def undo_action(self):
+        """Nimmt die letzte Aktion zurück, samt der Zugwechsel danach (Strg+Z im Hot-Seat)."""
+        undone = False
+        while self.undo_stack and not undone:
+            undone = self.undo().action is not None
+        return undone
+
+    def redo_action(self):
+        """Wiederholt die nächste Aktion und die direkt folgenden Zugwechsel."""
+        if not self.redo_stack:
+            return False
+        self.redo()
+        while self.redo_stack and self.redo_stack[-1].action is None:
+            self.redo()
+        return True
+
+    def mark(self):
+        """Aktueller Stand für revert()."""
+        return len(self.undo_stack), self.redo_stack
+
+    def revert(self, mark):
+        """Nimmt alle Schritte seit mark() zurück, ohne sie zum Wiederholen anzubieten."""
+        depth, redo_stack = mark
+        while len(self.undo_stack) > depth:
+            self._restore(self.undo_stack.pop().before)
+        self.redo_stack = redo_stack
+
+    def make(self, action):
+        """Suchzug: Aktion (None: Passen) und Zugende. Gibt zurück, ob die Aktion gültig war."""
+        self._marks.append(self.mark())
+        success = action is None or apply_action(self.game, action)[0]
+        self.game.end_turn()
+        return success
+
+    def unmake(self):
+        """Nimmt den letzten make() zurück."""
+        self.revert(self._marks.pop())
+
+    @contextlib.contextmanager
+    def simulation(self):
+        """Suchen auf dem laufenden Spiel: keine Animationen, Listener und Debug-Ausgaben, danach alles zurück."""
+        game = self.game
+        mark = self.mark()
+        animation_manager, listeners, debug = game.animation_manager, game._listeners, game.debug
+        game.animation_manager = NullAnimationManager(animation_manager.clock)
+        game._listeners = []
+        game.debug = False
+        self._simulations += 1
+        try:
+            yield self
+        finally:
+            self._simulations -= 1
+            self.revert(mark)
+            del self._marks[:]
+            game.animation_manager, game._listeners, game.debug = animation_manager, listeners, debug
+            game.board.mark_changed()
+
+    def _restore(self, state):
+        game_state, unit_states = state
+        game = self.game
+        grid = game.board.grid
+        for unit, _, _ in unit_states:
+            if unit.position is not None:
+                x, y = unit.position
+                if grid[y][x] is unit:
+                    grid[y][x] = None
+        restored = {}  # Spieler -> wieder zu registrierende Einheiten
+        for unit, registered, values in unit_states:
+            for name, value in zip(unit_fields(unit), values):
+                setattr(unit, name, value)
+            if not registered:
+                unit.player.remove_unit(unit)
+                continue
+            if not unit.player.has_unit(unit):
+                restored.setdefault(unit.player, []).append(unit)
+            if unit.position is not None:
+                grid[unit.position[1]][unit.position[0]] = unit
+        for player, units in restored.items():
+            player.restore_units(units)
+
+        (game.current_turn, game.turn_switch_count, game.last_arrow_storm_player, game.last_action,
+         effects, animations) = game_state
+        game.delayed_arrow_storm_effects = list(effects)
+        for animation in set(game.arrow_storm_animations).difference(animations):
+            animation.finish()
+        for animation in animations:
+            # Beim Zugwechsel beendete Markierung wieder anzeigen
+            animation.finished = False
+            if animation not in game.animation_manager.animations:
+                game.animation_manager.add_animation(animation)
+        game.arrow_storm_animations = list(animations)
+        game._state_changed()
@@ -0,0 +1,89 @@
+import random
+from collections import deque
+from .terrain import TerrainType
+
+# Prozedurale Karten: aus (Seed, Größe) entsteht immer dieselbe Karte.
+# Karten sind punktsymmetrisch zur Brettmitte (beide Spieler haben dieselben Bedingungen),
+# die Startreihen bleiben frei von Bergen und Gewässern, und alle Felder, die jede
+# Einheit betreten kann, hängen zusammen (per Flutfüllung geprüft).
+
+GENERATOR_VERSION = 1  # Erhöhen, wenn sich die erzeugten Karten ändern (invalidiert Analyse-Caches)
+MAX_ATTEMPTS = 100
+HOME_ROWS = 2  # Geschützte Reihen auf jeder Seite
+
+def mirror(size, x, y):
+    """Gegenüberliegendes Feld bei Punktsymmetrie."""
+    return size - 1 - x, size - 1 - y
+
+def is_open(terrain_type):
+    """Felder, die jede Einheit betreten kann (keine Berge, kein Wasser für Bogenschützen)."""
+    return terrain_type not in (TerrainType.MOUNTAIN, TerrainType.WATER)
+
+def is_symmetric(layout):
+    size = len(layout)
+    return all(layout[y][x] == layout[size - 1 - y][size - 1 - x] for y in range(size) for x in range(size))
+
+def is_connected(layout):
+    """Prüft per Flutfüllung (8 Nachbarn), dass alle offenen Felder eine Zusammenhangskomponente bilden."""
+    size = len(layout)
+    open_cells = [(x, y) for y in range(size) for x in range(size) if is_open(layout[y][x])]
+    if not open_cells:
+        return False
+    seen = {open_cells[0]}
+    queue = deque([open_cells[0]])
+    while queue:
+        x, y = queue.popleft()
+        for next_y in range(max(0, y - 1), min(size, y + 2)):
+            for next_x in range(max(0, x - 1), min(size, x + 2)):
+                if (next_x, next_y) not in seen and is_open(layout[next_y][next_x]):
+                    seen.add((next_x, next_y))
+                    queue.append((next_x, next_y))
+    return len(seen) == len(open_cells)
+
+def _set(layout, x, y, terrain_type):
+    size = len(layout)
+    mirror_x, mirror_y = mirror(size, x, y)
+    layout[y][x] = terrain_type
+    layout[mirror_y][mirror_x] = terrain_type
+
+def _place_clusters(layout, rng, terrain_type, count, max_length, rows):
+    """Setzt count zufällige Ketten (Zufallswege) eines Terrain-Typs samt Spiegelbild auf Grasfelder."""
+    size = len(layout)
+    for _ in range(count):
+        x = rng.randrange(size)
+        y = rng.randrange(rows[0], rows[1])
+        for _ in range(rng.randint(1, max_length)):
+            if layout[y][x] == TerrainType.GRASS:
+                _set(layout, x, y, terrain_type)
+            x = min(size - 1, max(0, x + rng.choice((-1, 0, 1))))
+            y = min(rows[1] - 1, max(rows[0], y + rng.choice((-1, 0, 1))))
+
+def _random_layout(size, rng):
+    layout = [[TerrainType.GRASS] * size for _ in range(size)]
+    area = size * size
+    # Hindernisse nur außerhalb der Startreihen
+    inner_rows = (HOME_ROWS, size - HOME_ROWS)
+    _place_clusters(layout, rng, TerrainType.MOUNTAIN, max(1, area // 40), 3, inner_rows)
+    _place_clusters(layout, rng, TerrainType.WATER, max(1, area // 40), 2, inner_rows)
+    _place_clusters(layout, rng, TerrainType.FOREST, max(1, area // 30), 3, (1, size - 1))
+    # Heilquellen in der eigenen Hälfte, vor den Startreihen
+    for _ in range(max(1, size // 9)):
+        for _ in range(size):
+            x = rng.randrange(size)
+            y = rng.randrange(1, max(2, size // 3))
+            if layout[y][x] == TerrainType.GRASS:
+                _set(layout, x, y, TerrainType.HEALING)
+                break
+    return layout
+
+def generate_layout(size, seed):
+    """
+    Erzeugt eine Karte als Liste von Reihen mit TerrainType-Werten.
+    Ungültige Versuche (nicht zusammenhängend) werden mit dem nächsten Versuch desselben Seeds wiederholt.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        rng = random.Random(f"{GENERATOR_VERSION}:{seed}:{size}:{attempt}")
+        layout = _random_layout(size, rng)
+        if is_connected(layout) and is_symmetric(layout):
+            return layout
+    raise ValueError(f"Keine gültige Karte für Seed {seed} und Größe {size} gefunden.")
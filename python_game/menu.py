@@ -1,4 +1,5 @@
 import pygame
+from .fonts import get_font
 
 class Button:
     def __init__(self, x, y, width, height, text, color=(100, 100, 100), hover_color=(150, 150, 150)):
@@ -33,12 +34,6 @@ class GameState:
 
 class Menu:
     def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
-        
         # Farben
         self.title_color = (255, 255, 255)
         self.button_color = (100, 100, 100)
@@ -50,6 +45,28 @@ class Menu:
         self.button_height = 50
         self.button_spacing = 20
         
+        self._hovered_button = None  # Für das Neuzeichnen nur bei Hover-Änderungen
+        
+        self.resize(width, height)
+        
+    # Schriften erst beim ersten Zeichnen laden (schnellerer Start)
+    @property
+    def font_large(self):
+        return get_font(48)
+
+    @property
+    def font_medium(self):
+        return get_font(32)
+
+    @property
+    def font_small(self):
+        return get_font(24)
+
+    def resize(self, width, height):
+        """Passt die Button-Positionen an eine neue Fenstergröße an."""
+        self.width = width
+        self.height = height
+        
         # Schwierigkeitsauswahl
         self.difficulty_buttons = {
             "easy": pygame.Rect(width//2 - self.button_width//2, height//2 - 50, self.button_width, self.button_height),
@@ -74,37 +91,9 @@ class Menu:
         screen.blit(subtitle, subtitle_rect)
         
         # Buttons
-        button_y_start = self.height//2 + 50
-        
-        # Singleplayer Button
-        singleplayer_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start, self.button_width, self.button_height)
-        color = self.button_hover_color if self._is_mouse_over_button(singleplayer_rect) else self.button_color
-        pygame.draw.rect(screen, color, singleplayer_rect)
-        pygame.draw.rect(screen, (255, 255, 255), singleplayer_rect, 2)
-        
-        singleplayer_text = self.font_medium.render("Singleplayer", True, self.text_color)
-        singleplayer_text_rect = singleplayer_text.get_rect(center=singleplayer_rect.center)
-        screen.blit(singleplayer_text, singleplayer_text_rect)
-        
-        # Multiplayer Button
-        multiplayer_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start + self.button_height + self.button_spacing, self.button_width, self.button_height)
-        color = self.button_hover_color if self._is_mouse_over_button(multiplayer_rect) else self.button_color
-        pygame.draw.rect(screen, color, multiplayer_rect)
-        pygame.draw.rect(screen, (255, 255, 255), multiplayer_rect, 2)
-        
-        multiplayer_text = self.font_medium.render("Multiplayer", True, self.text_color)
-        multiplayer_text_rect = multiplayer_text.get_rect(center=multiplayer_rect.center)
-        screen.blit(multiplayer_text, multiplayer_text_rect)
-        
-        # Quit Button
-        quit_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start + 2 * (self.button_height + self.button_spacing), self.button_width, self.button_height)
-        color = self.button_hover_color if self._is_mouse_over_button(quit_rect) else self.button_color
-        pygame.draw.rect(screen, color, quit_rect)
-        pygame.draw.rect(screen, (255, 255, 255), quit_rect, 2)
-        
-        quit_text = self.font_medium.render("Quit", True, self.text_color)
-        quit_text_rect = quit_text.get_rect(center=quit_rect.center)
-        screen.blit(quit_text, quit_text_rect)
+        labels = {"singleplayer_menu": "Singleplayer", "multiplayer": "Multiplayer", "quit": "Quit"}
+        for name, rect in self._main_menu_buttons().items():
+            self._draw_button(screen, rect, labels[name], self.font_medium, 2)
         
     def draw_singleplayer_menu(self, screen):
         """Zeichnet das Singleplayer-Menü mit Schwierigkeitsauswahl."""
@@ -160,77 +149,33 @@ class Menu:
         screen.blit(overlay, (0, 0))
         
         # Menü-Box
-        menu_width = 300
-        menu_height = 200
-        menu_x = self.width//2 - menu_width//2
-        menu_y = self.height//2 - menu_height//2
-        
-        menu_rect = pygame.Rect(menu_x, menu_y, menu_width, menu_height)
+        menu_rect = self._pause_menu_rect()
         pygame.draw.rect(screen, (50, 50, 50), menu_rect)
         pygame.draw.rect(screen, (255, 255, 255), menu_rect, 2)
         
         # Titel
         title = self.font_medium.render("Pause", True, self.title_color)
-        title_rect = title.get_rect(center=(self.width//2, menu_y + 30))
+        title_rect = title.get_rect(center=(self.width//2, menu_rect.y + 30))
         screen.blit(title, title_rect)
         
         # Buttons
-        button_y = menu_y + 80
-        
-        # Continue Button
-        continue_rect = pygame.Rect(menu_x + 50, button_y, 200, 30)
-        color = self.button_hover_color if self._is_mouse_over_button(continue_rect) else self.button_color
-        pygame.draw.rect(screen, color, continue_rect)
-        pygame.draw.rect(screen, (255, 255, 255), continue_rect, 1)
-        
-        continue_text = self.font_small.render("Weiterspielen", True, self.text_color)
-        continue_text_rect = continue_text.get_rect(center=continue_rect.center)
-        screen.blit(continue_text, continue_text_rect)
-        
-        # Restart Button
-        restart_rect = pygame.Rect(menu_x + 50, button_y + 40, 200, 30)
-        color = self.button_hover_color if self._is_mouse_over_button(restart_rect) else self.button_color
-        pygame.draw.rect(screen, color, restart_rect)
-        pygame.draw.rect(screen, (255, 255, 255), restart_rect, 1)
-        
-        restart_text = self.font_small.render("Neustart", True, self.text_color)
-        restart_text_rect = restart_text.get_rect(center=restart_rect.center)
-        screen.blit(restart_text, restart_text_rect)
-        
-        # Main Menu Button
-        main_menu_rect = pygame.Rect(menu_x + 50, button_y + 80, 200, 30)
-        color = self.button_hover_color if self._is_mouse_over_button(main_menu_rect) else self.button_color
-        pygame.draw.rect(screen, color, main_menu_rect)
-        pygame.draw.rect(screen, (255, 255, 255), main_menu_rect, 1)
-        
-        main_menu_text = self.font_small.render("Hauptmenü", True, self.text_color)
-        main_menu_text_rect = main_menu_text.get_rect(center=main_menu_rect.center)
-        screen.blit(main_menu_text, main_menu_text_rect)
+        labels = {"continue": "Weiterspielen", "restart": "Neustart", "main_menu": "Hauptmenü"}
+        for name, rect in self._pause_menu_buttons().items():
+            self._draw_button(screen, rect, labels[name], self.font_small, 1)
+        
+    def _draw_button(self, screen, rect, text, font, border):
+        """Zeichnet einen Button mit Hover-Farbe, Rahmen und zentriertem Text."""
+        color = self.button_hover_color if self._is_mouse_over_button(rect) else self.button_color
+        pygame.draw.rect(screen, color, rect)
+        pygame.draw.rect(screen, (255, 255, 255), rect, border)
+        
+        text_surface = font.render(text, True, self.text_color)
+        text_rect = text_surface.get_rect(center=rect.center)
+        screen.blit(text_surface, text_rect)
         
     def handle_main_menu_events(self, events):
         """Behandelt Events im Hauptmenü."""
-        for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                
-                # Button-Positionen
-                button_y_start = self.height//2 + 50
-                
-                # Singleplayer Button
-                singleplayer_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start, self.button_width, self.button_height)
-                if singleplayer_rect.collidepoint(mouse_pos):
-                    return "singleplayer_menu"
-                
-                # Multiplayer Button
-                multiplayer_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start + self.button_height + self.button_spacing, self.button_width, self.button_height)
-                if multiplayer_rect.collidepoint(mouse_pos):
-                    return "multiplayer"
-                
-                # Quit Button
-                quit_rect = pygame.Rect(self.width//2 - self.button_width//2, button_y_start + 2 * (self.button_height + self.button_spacing), self.button_width, self.button_height)
-                if quit_rect.collidepoint(mouse_pos):
-                    return "quit"
-        return None
+        return self._clicked_button(events, self._main_menu_buttons())
         
     def handle_singleplayer_menu_events(self, events):
         """Behandelt Events im Singleplayer-Menü."""
@@ -248,33 +193,64 @@ class Menu:
         
     def handle_pause_menu_events(self, events):
         """Behandelt Events im Pause-Menü."""
+        return self._clicked_button(events, self._pause_menu_buttons())
+        
+    def _clicked_button(self, events, buttons):
+        """Name des angeklickten Buttons oder None."""
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
-                
-                # Button-Positionen
-                menu_width = 300
-                menu_height = 200
-                menu_x = self.width//2 - menu_width//2
-                menu_y = self.height//2 - menu_height//2
-                button_y = menu_y + 80
-                
-                # Continue Button
-                continue_rect = pygame.Rect(menu_x + 50, button_y, 200, 30)
-                if continue_rect.collidepoint(mouse_pos):
-                    return "continue"
-                
-                # Restart Button
-                restart_rect = pygame.Rect(menu_x + 50, button_y + 40, 200, 30)
-                if restart_rect.collidepoint(mouse_pos):
-                    return "restart"
-                
-                # Main Menu Button
-                main_menu_rect = pygame.Rect(menu_x + 50, button_y + 80, 200, 30)
-                if main_menu_rect.collidepoint(mouse_pos):
-                    return "main_menu"
+                for name, rect in buttons.items():
+                    if rect.collidepoint(mouse_pos):
+                        return name
         return None
         
+    def _main_menu_buttons(self):
+        """Gibt die Buttons des Hauptmenüs zurück (einzige Quelle für Zeichnen, Klicks und Hover)."""
+        button_y_start = self.height//2 + 50
+        x = self.width//2 - self.button_width//2
+        step = self.button_height + self.button_spacing
+        return {
+            "singleplayer_menu": pygame.Rect(x, button_y_start, self.button_width, self.button_height),
+            "multiplayer": pygame.Rect(x, button_y_start + step, self.button_width, self.button_height),
+            "quit": pygame.Rect(x, button_y_start + 2 * step, self.button_width, self.button_height)
+        }
+        
+    def _pause_menu_rect(self):
+        """Box des Pause-Menüs (300x200, zentriert)."""
+        return pygame.Rect(self.width//2 - 300//2, self.height//2 - 200//2, 300, 200)
+        
+    def _pause_menu_buttons(self):
+        """Gibt die Buttons des Pause-Menüs zurück (einzige Quelle für Zeichnen, Klicks und Hover)."""
+        menu_rect = self._pause_menu_rect()
+        button_y = menu_rect.y + 80
+        return {
+            "continue": pygame.Rect(menu_rect.x + 50, button_y, 200, 30),
+            "restart": pygame.Rect(menu_rect.x + 50, button_y + 40, 200, 30),
+            "main_menu": pygame.Rect(menu_rect.x + 50, button_y + 80, 200, 30)
+        }
+        
+    def needs_redraw(self, events, game_state):
+        """Prüft, ob das Menü neu gezeichnet werden muss (Hover-Wechsel oder Klick)."""
+        if game_state == GameState.MAIN_MENU:
+            buttons = self._main_menu_buttons()
+        elif game_state == GameState.SINGLEPLAYER_MENU:
+            buttons = self.difficulty_buttons
+        else:
+            buttons = self._pause_menu_buttons()
+            
+        mouse_pos = pygame.mouse.get_pos()
+        hovered = None
+        for name, rect in buttons.items():
+            if rect.collidepoint(mouse_pos):
+                hovered = (game_state, name)
+                break
+                
+        changed = hovered != self._hovered_button
+        self._hovered_button = hovered
+        clicked = any(event.type == pygame.MOUSEBUTTONDOWN for event in events)
+        return changed or clicked
+        
     def _is_mouse_over_button(self, button_rect):
         """Prüft, ob die Maus über einem Button ist."""
         mouse_pos = pygame.mouse.get_pos()
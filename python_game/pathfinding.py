@@ -0,0 +1,148 @@
+import heapq
+
+from .unit_defs import MOVE_ORTHOGONAL, MOVE_DIAGONAL_COST
+
+# Gewichtete Bewegung: Einheiten ziehen schrittweise in alle 8 Richtungen.
+# Ein orthogonaler Schritt kostet 1, ein diagonaler MOVE_DIAGONAL_COST des Einheitentyps,
+# dazu kommt beim Betreten eines Feldes dessen Terrain-Strafe (Terrain.get_movement_penalty).
+# Das Budget ist die orthogonale Reichweite. Einheiten und unpassierbares Terrain blockieren.
+
+ORTHOGONAL_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+def _entry_cost(board, unit, x, y):
+    """Zusatzkosten für das Betreten von (x, y) oder None, wenn das Feld nicht betreten werden kann."""
+    if board.grid[y][x] is not None:
+        return None
+    terrain = board.terrain[y][x]
+    if not terrain.is_passable(unit):
+        return None
+    return terrain.get_movement_penalty(unit)
+
+def _steps(unit):
+    diagonal_cost = MOVE_DIAGONAL_COST[unit.type_index]
+    return [(dx, dy, 1) for dx, dy in ORTHOGONAL_STEPS] + [(dx, dy, diagonal_cost) for dx, dy in DIAGONAL_STEPS]
+
+class MovementField:
+    """Ergebnis einer Flutfüllung: minimale Kosten und Vorgänger aller erreichbaren Felder."""
+
+    def __init__(self, start, costs, parents):
+        self.start = start
+        self.costs = costs  # Feld -> minimale Kosten (inklusive Start mit 0)
+        self.parents = parents  # Feld -> Vorgängerfeld auf dem günstigsten Weg
+
+    def positions(self):
+        """Alle erreichbaren Zielfelder (ohne Startfeld)."""
+        return [position for position in self.costs if position != self.start]
+
+    def path_to(self, x, y):
+        """Günstigster Weg zum Feld (x, y) ohne Startfeld, oder None wenn es nicht erreichbar ist."""
+        position = (x, y)
+        if position not in self.costs or position == self.start:
+            return None
+        path = []
+        while position != self.start:
+            path.append(position)
+            position = self.parents[position]
+        path.reverse()
+        return path
+
+def flood_fill(board, unit, budget=None):
+    """Dijkstra-Flutfüllung ab der Position der Einheit bis zum Bewegungsbudget."""
+    if unit.position is None:
+        return MovementField(None, {}, {})
+    if budget is None:
+        budget = MOVE_ORTHOGONAL[unit.type_index]
+    start = unit.position
+    size = board.size
+    steps = _steps(unit)
+    costs = {start: 0}
+    parents = {}
+    settled = {}
+    queue = [(0, start)]
+    while queue:
+        cost, position = heapq.heappop(queue)
+        if position in settled:
+            continue
+        settled[position] = cost
+        x, y = position
+        for dx, dy, step_cost in steps:
+            next_x = x + dx
+            next_y = y + dy
+            if not (0 <= next_x < size and 0 <= next_y < size):
+                continue
+            next_position = (next_x, next_y)
+            if next_position in settled:
+                continue
+            penalty = _entry_cost(board, unit, next_x, next_y)
+            if penalty is None:
+                continue
+            next_cost = cost + step_cost + penalty
+            if next_cost > budget or next_cost >= costs.get(next_position, next_cost + 1):
+                continue
+            costs[next_position] = next_cost
+            parents[next_position] = position
+            heapq.heappush(queue, (next_cost, next_position))
+    return MovementField(start, settled, parents)
+
+def _heuristic(dx, dy, diagonal_cost):
+    # Ein Diagonalschritt lässt sich immer durch zwei orthogonale ersetzen
+    diagonal = min(dx, dy)
+    return diagonal * min(diagonal_cost, 2) + (max(dx, dy) - diagonal)
+
+def find_path(board, unit, goal, budget=None):
+    """
+    A*-Suche zum Zielfeld. Gibt den günstigsten Weg (ohne Startfeld) zurück,
+    oder None, wenn das Ziel nicht (innerhalb des Budgets) erreichbar ist.
+    budget=None: unbegrenzt.
+    """
+    if unit.position is None:
+        return None
+    start = unit.position
+    goal = tuple(goal)
+    if goal == start:
+        return []
+    size = board.size
+    goal_x, goal_y = goal
+    if not (0 <= goal_x < size and 0 <= goal_y < size) or _entry_cost(board, unit, goal_x, goal_y) is None:
+        return None
+    steps = _steps(unit)
+    diagonal_cost = MOVE_DIAGONAL_COST[unit.type_index]
+    costs = {start: 0}
+    parents = {}
+    closed = set()
+    queue = [(_heuristic(abs(goal_x - start[0]), abs(goal_y - start[1]), diagonal_cost), 0, start)]
+    while queue:
+        _, cost, position = heapq.heappop(queue)
+        if position == goal:
+            path = []
+            while position != start:
+                path.append(position)
+                position = parents[position]
+            path.reverse()
+            return path
+        if position in closed:
+            continue
+        closed.add(position)
+        x, y = position
+        for dx, dy, step_cost in steps:
+            next_x = x + dx
+            next_y = y + dy
+            if not (0 <= next_x < size and 0 <= next_y < size):
+                continue
+            next_position = (next_x, next_y)
+            if next_position in closed:
+                continue
+            penalty = _entry_cost(board, unit, next_x, next_y)
+            if penalty is None:
+                continue
+            next_cost = cost + step_cost + penalty
+            if budget is not None and next_cost > budget:
+                continue
+            if next_cost >= costs.get(next_position, next_cost + 1):
+                continue
+            costs[next_position] = next_cost
+            parents[next_position] = position
+            estimate = next_cost + _heuristic(abs(goal_x - next_x), abs(goal_y - next_y), diagonal_cost)
+            heapq.heappush(queue, (estimate, next_cost, next_position))
+    return None
@@ -1,12 +1,54 @@
 class Player:
+    __slots__ = ("id", "name", "_units", "_removed_slots")
+
     def __init__(self, id, name):
         self.id = id
         self.name = name
-        self.units = []
+        # unit_id -> Einheit; dicts behalten die Einfügereihenfolge, Iteration bleibt also stabil
+        self._units = {}
+        # unit_id -> Platz im Register beim Entfernen, in Reihenfolge des Entfernens (für Rückgängig)
+        self._removed_slots = {}
+
+    @property
+    def units(self):
+        """Lebende Einheiten in Einfügereihenfolge (Ansicht auf das Register, nicht während der Iteration ändern)."""
+        return self._units.values()
 
     def add_unit(self, unit):
-        self.units.append(unit)
+        if unit.unit_id is None:
+            raise ValueError("Einheit braucht eine unit_id, bevor sie einem Spieler zugeordnet wird.")
+        self._units[unit.unit_id] = unit
 
     def remove_unit(self, unit):
-        if unit in self.units:
-            self.units.remove(unit)
+        # O(1) über die unit_id; nur entfernen, wenn wirklich diese Einheit registriert ist.
+        # Der Platz wird nur hier bestimmt (O(Einheiten)), Entfernen ist selten.
+        if self._units.get(unit.unit_id) is unit:
+            self._removed_slots.pop(unit.unit_id, None)
+            self._removed_slots[unit.unit_id] = list(self._units).index(unit.unit_id)
+            del self._units[unit.unit_id]
+
+    def restore_units(self, units):
+        """
+        Registriert entfernte Einheiten wieder an ihrem alten Platz (Rückgängig, siehe history.py).
+        Eingefügt wird in umgekehrter Reihenfolge des Entfernens, dann stimmen die gemerkten Plätze.
+        """
+        missing = {unit.unit_id: unit for unit in units if not self.has_unit(unit)}
+        if not missing:
+            return
+        registered = list(self._units.values())
+        for unit_id in reversed(list(self._removed_slots)):
+            unit = missing.pop(unit_id, None)
+            if unit is not None:
+                registered.insert(self._removed_slots.pop(unit_id), unit)
+        registered.extend(missing.values())  # Nie über remove_unit entfernt: hinten anhängen
+        self._units = {unit.unit_id: unit for unit in registered}
+
+    def get_unit(self, unit_id):
+        return self._units.get(unit_id)
+
+    def has_unit(self, unit):
+        return self._units.get(unit.unit_id) is unit
+
+    def clear_units(self):
+        self._units.clear()
+        self._removed_slots.clear()
@@ -0,0 +1,303 @@
+import struct
+
+from .board import Board
+from .player import Player
+from .units import Swordsman, Archer, Rider
+from .unit_defs import UNIT_TYPES
+
+# Binärprotokoll für die Synchronisation von Spielen über das Netzwerk.
+# Jeder Frame beginnt mit einem Header (Typ, Sequenznummer, Anzahl Einträge).
+# Delta-Frames enthalten nur Regel-Ereignisse seit dem letzten Frame,
+# Keyframes den vollständigen Zustand (für Beitritt und Resynchronisation)
+# einschließlich der Karte (Brettgröße und Seed), damit Empfänger das richtige Terrain aufbauen.
+
+FRAME_DELTA = 0
+FRAME_KEYFRAME = 1
+
+EVENT_MOVE = 1            # Einheit bewegt: x, y
+EVENT_HP = 2              # HP geändert: hp
+EVENT_REMOVE = 3          # Einheit entfernt
+EVENT_STORM_QUEUED = 4    # Pfeilregen vorbereitet: x, y
+EVENT_STORM_RESOLVED = 5  # Pfeilregen ausgeführt
+EVENT_SHIELD = 6          # Schild-Zustand: Bits (aktiv, verbraucht)
+EVENT_SPECIAL_USED = 7    # Spezialfähigkeit verbraucht
+EVENT_TURN = 8            # Spieler am Zug (statt Einheiten-ID)
+
+# Typ-Codes entsprechen dem Typindex aus unit_defs
+UNIT_CLASSES = sorted((Swordsman, Archer, Rider), key=lambda cls: cls.type_index)
+UNIT_TYPE_CODES = {name: code for code, name in enumerate(UNIT_TYPES)}
+NO_TARGET = 255
+SEQUENCE_MASK = 0xFFFF
+
+_HEADER = struct.Struct("!BHB")
+_EVENT = struct.Struct("!BB")
+_EVENT_PAYLOADS = {
+    EVENT_MOVE: struct.Struct("!BB"),
+    EVENT_HP: struct.Struct("!H"),
+    EVENT_REMOVE: None,
+    EVENT_STORM_QUEUED: struct.Struct("!BB"),
+    EVENT_STORM_RESOLVED: None,
+    EVENT_SHIELD: struct.Struct("!B"),
+    EVENT_SPECIAL_USED: None,
+    EVENT_TURN: None
+}
+_KEY_TURN = struct.Struct("!B")
+_KEY_MAP = struct.Struct("!BBq")  # Brettgröße, Seed vorhanden, Seed (prozedurale Karte)
+_KEY_UNIT = struct.Struct("!BBBBBHBBB")  # id, Typ, Besitzer, x, y, hp, Flags, Pfeilregen x, y
+
+FLAG_SPECIAL_USED = 1
+FLAG_SHIELD_ACTIVE = 2
+FLAG_SHIELD_USED = 4
+
+def _shield_bits(unit):
+    if not isinstance(unit, Swordsman):
+        return 0
+    return (FLAG_SHIELD_ACTIVE if unit.shield_active else 0) | (FLAG_SHIELD_USED if unit.shield_used else 0)
+
+def capture_units(game):
+    """Erfasst den kompakten Zustand aller Einheiten: id -> (Typ, Besitzer, x, y, hp, Flags, Pfeilregen-Ziel)."""
+    units = {}
+    for owner, player in enumerate(game.players):
+        for unit in player.units:
+            if unit.position is None:
+                continue
+            flags = _shield_bits(unit) | (FLAG_SPECIAL_USED if unit.special_ability_used else 0)
+            storm_target = getattr(unit, "arrow_storm_target", None)
+            units[unit.unit_id] = (unit.type_index, owner,
+                                   unit.position[0], unit.position[1], int(unit.health), flags, storm_target)
+    return units
+
+def diff_units(previous, current):
+    """Leitet die Regel-Ereignisse zwischen zwei Zuständen ab: Liste von (Ereignis, id, Werte)."""
+    events = []
+    for unit_id, old in previous.items():
+        new = current.get(unit_id)
+        if new is None:
+            events.append((EVENT_REMOVE, unit_id, ()))
+            continue
+        _, _, old_x, old_y, old_hp, old_flags, old_storm = old
+        _, _, x, y, hp, flags, storm = new
+        if (x, y) != (old_x, old_y):
+            events.append((EVENT_MOVE, unit_id, (x, y)))
+        if hp != old_hp:
+            events.append((EVENT_HP, unit_id, (hp,)))
+        if flags & FLAG_SPECIAL_USED and not old_flags & FLAG_SPECIAL_USED:
+            events.append((EVENT_SPECIAL_USED, unit_id, ()))
+        shield = flags & (FLAG_SHIELD_ACTIVE | FLAG_SHIELD_USED)
+        if shield != old_flags & (FLAG_SHIELD_ACTIVE | FLAG_SHIELD_USED):
+            events.append((EVENT_SHIELD, unit_id, (shield,)))
+        if storm != old_storm:
+            if storm is None:
+                events.append((EVENT_STORM_RESOLVED, unit_id, ()))
+            else:
+                events.append((EVENT_STORM_QUEUED, unit_id, storm))
+    return events
+
+def encode_delta(sequence, events):
+    parts = [_HEADER.pack(FRAME_DELTA, sequence, len(events))]
+    for event, unit_id, values in events:
+        parts.append(_EVENT.pack(event, unit_id))
+        payload = _EVENT_PAYLOADS[event]
+        if payload is not None:
+            parts.append(payload.pack(*values))
+    return b"".join(parts)
+
+def encode_keyframe(sequence, turn, units, board_size=9, map_seed=None):
+    """Keyframe mit Karte: map_seed=None ist die feste Standardkarte (siehe Board)."""
+    parts = [_HEADER.pack(FRAME_KEYFRAME, sequence, len(units)), _KEY_TURN.pack(turn),
+             _KEY_MAP.pack(board_size, map_seed is not None, map_seed or 0)]
+    for unit_id, (type_code, owner, x, y, hp, flags, storm) in sorted(units.items()):
+        storm_x, storm_y = storm if storm is not None else (NO_TARGET, NO_TARGET)
+        parts.append(_KEY_UNIT.pack(unit_id, type_code, owner, x, y, hp, flags, storm_x, storm_y))
+    return b"".join(parts)
+
+def decode_frame(frame):
+    """
+    Dekodiert einen Frame. Gibt (Typ, Sequenz, Inhalt) zurück:
+    Delta -> Liste von (Ereignis, id, Werte), Keyframe -> (Zug, {id: Zustand}, Brettgröße, Seed).
+    """
+    kind, sequence, count = _HEADER.unpack_from(frame, 0)
+    offset = _HEADER.size
+    if kind == FRAME_KEYFRAME:
+        turn = _KEY_TURN.unpack_from(frame, offset)[0]
+        offset += _KEY_TURN.size
+        board_size, has_seed, map_seed = _KEY_MAP.unpack_from(frame, offset)
+        offset += _KEY_MAP.size
+        units = {}
+        for _ in range(count):
+            unit_id, type_code, owner, x, y, hp, flags, storm_x, storm_y = _KEY_UNIT.unpack_from(frame, offset)
+            offset += _KEY_UNIT.size
+            storm = None if storm_x == NO_TARGET else (storm_x, storm_y)
+            units[unit_id] = (type_code, owner, x, y, hp, flags, storm)
+        return kind, sequence, (turn, units, board_size, map_seed if has_seed else None)
+
+    events = []
+    for _ in range(count):
+        event, unit_id = _EVENT.unpack_from(frame, offset)
+        offset += _EVENT.size
+        payload = _EVENT_PAYLOADS[event]
+        values = ()
+        if payload is not None:
+            values = payload.unpack_from(frame, offset)
+            offset += payload.size
+        events.append((event, unit_id, values))
+    return kind, sequence, events
+
+class DeltaEncoder:
+    """Erzeugt pro Aktion einen kompakten Delta-Frame und in regelmäßigen Abständen Keyframes."""
+
+    def __init__(self, game, keyframe_interval=64):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.sequence = 0
+        self._units = None
+        self._turn = None
+        self._frames_since_keyframe = 0
+        # Statistik
+        self.bytes_encoded = 0
+        self.frames_encoded = 0
+        self.keyframes_encoded = 0
+
+    def encode(self, force_keyframe=False):
+        """Gibt den Frame für alle Änderungen seit dem letzten Aufruf zurück (None ohne Änderungen)."""
+        units = capture_units(self.game)
+        turn = self.game.current_turn
+        if force_keyframe or self._units is None or self._frames_since_keyframe >= self.keyframe_interval:
+            frame = self._next_frame(units, turn, None)
+        else:
+            events = diff_units(self._units, units)
+            if turn != self._turn:
+                events.append((EVENT_TURN, turn, ()))
+            if not events:
+                return None
+            if len(events) > 255:
+                frame = self._next_frame(units, turn, None)
+            else:
+                frame = self._next_frame(units, turn, events)
+        self.bytes_encoded += len(frame)
+        self.frames_encoded += 1
+        return frame
+
+    def _next_frame(self, units, turn, events):
+        self.sequence = (self.sequence + 1) & SEQUENCE_MASK
+        self._units = units
+        self._turn = turn
+        if events is None:
+            self._frames_since_keyframe = 0
+            self.keyframes_encoded += 1
+            return self._keyframe(self.sequence, turn, units)
+        self._frames_since_keyframe += 1
+        return encode_delta(self.sequence, events)
+
+    def current_keyframe(self):
+        """Keyframe des zuletzt kodierten Zustands (für Resynchronisation, ändert die Sequenz nicht)."""
+        if self._units is None:
+            return None
+        return self._keyframe(self.sequence, self._turn, self._units)
+
+    def _keyframe(self, sequence, turn, units):
+        board = self.game.board
+        return encode_keyframe(sequence, turn, units, board.size, board.terrain_seed)
+
+    def attach(self, sink):
+        """Kodiert nach jeder Zustandsänderung des Spiels automatisch und übergibt den Frame an sink."""
+        def on_change(game):
+            frame = self.encode()
+            if frame is not None:
+                sink(frame)
+        self.game.add_listener(on_change)
+        return on_change
+
+    def bytes_per_turn(self):
+        return self.bytes_encoded / max(1, self.game.turn_switch_count)
+
+class DeltaApplier:
+    """Client-Seite: wendet Frames auf ein lokales Board an (Karte laut Keyframe)."""
+
+    def __init__(self, board_size=9, map_seed=None):
+        self.board = Board(board_size, terrain_seed=map_seed)
+        self.players = [Player(1, "Player 1"), Player(2, "Player 2")]
+        self.units = {}
+        self.turn = 0
+        self.sequence = None  # Sequenz des zuletzt angewendeten Frames
+
+    @property
+    def needs_keyframe(self):
+        return self.sequence is None
+
+    def apply(self, frame):
+        """Wendet einen Frame an. Gibt False zurück, wenn ein Keyframe zur Resynchronisation nötig ist."""
+        kind, sequence, content = decode_frame(frame)
+        if kind == FRAME_KEYFRAME:
+            self._load_keyframe(*content)
+        else:
+            if self.sequence is None or sequence != (self.sequence + 1) & SEQUENCE_MASK:
+                self.sequence = None  # Lücke erkannt: auf Keyframe warten
+                return False
+            for event, unit_id, values in content:
+                self._apply_event(event, unit_id, values)
+        self.sequence = sequence
+        self.board.mark_changed()
+        return True
+
+    def _load_keyframe(self, turn, units, board_size, map_seed):
+        for unit in self.units.values():
+            if unit.position is not None:
+                self.board.grid[unit.position[1]][unit.position[0]] = None
+        if (self.board.size, self.board.terrain_seed) != (board_size, map_seed):
+            self.board = Board(board_size, terrain_seed=map_seed)
+        self.units = {}
+        for player in self.players:
+            player.clear_units()
+        self.turn = turn
+        for unit_id, (type_code, owner, x, y, hp, flags, storm) in units.items():
+            player = self.players[owner]
+            unit = UNIT_CLASSES[type_code](player)
+            unit.unit_id = unit_id
+            unit.health = hp
+            unit.special_ability_used = bool(flags & FLAG_SPECIAL_USED)
+            self._set_shield(unit, flags)
+            if storm is not None:
+                unit.arrow_storm_target = storm
+            player.add_unit(unit)
+            self.units[unit_id] = unit
+            self._place(unit, x, y)
+
+    def _apply_event(self, event, unit_id, values):
+        if event == EVENT_TURN:
+            self.turn = unit_id
+            return
+        unit = self.units.get(unit_id)
+        if unit is None:
+            return
+        if event == EVENT_MOVE:
+            self._place(unit, *values)
+        elif event == EVENT_HP:
+            unit.health = values[0]
+        elif event == EVENT_REMOVE:
+            if unit.position is not None:
+                if self.board.grid[unit.position[1]][unit.position[0]] is unit:
+                    self.board.grid[unit.position[1]][unit.position[0]] = None
+                unit.position = None
+            unit.player.remove_unit(unit)
+            del self.units[unit_id]
+        elif event == EVENT_STORM_QUEUED:
+            unit.arrow_storm_target = tuple(values)
+        elif event == EVENT_STORM_RESOLVED:
+            unit.arrow_storm_target = None
+        elif event == EVENT_SHIELD:
+            self._set_shield(unit, values[0])
+        elif event == EVENT_SPECIAL_USED:
+            unit.special_ability_used = True
+
+    def _place(self, unit, x, y):
+        # Direkt setzen statt move_unit: der Server hat Heilung usw. bereits angewendet
+        if unit.position is not None and self.board.grid[unit.position[1]][unit.position[0]] is unit:
+            self.board.grid[unit.position[1]][unit.position[0]] = None
+        self.board.grid[y][x] = unit
+        unit.position = (x, y)
+
+    def _set_shield(self, unit, flags):
+        if isinstance(unit, Swordsman):
+            unit.shield_active = bool(flags & FLAG_SHIELD_ACTIVE)
+            unit.shield_used = bool(flags & FLAG_SHIELD_USED)
@@ -0,0 +1,144 @@
+import pygame
+from .fonts import get_font
+
+GRID_COLOR = (80, 80, 80)  # Dunkleres Grau
+PLAYER1_COLOR = (0, 150, 255)  # Blau
+PLAYER2_COLOR = (255, 50, 50)   # Rot
+
+# Farben für Einheitentypen als Fallback
+UNIT_COLORS = {
+    "Swordsman": (200, 200, 200), # Grau
+    "Archer": (0, 255, 0),       # Grün
+    "Rider": (255, 165, 0)      # Orange
+}
+
+class Layout:
+    """Berechnet Feldgröße und Positionen aus der aktuellen Fenstergröße."""
+
+    def __init__(self, board_size, ui_height, width, height, min_square_size=24):
+        self.board_size = board_size
+        self.ui_height = ui_height
+        self.min_square_size = min_square_size
+        self.update(width, height)
+
+    def update(self, width, height):
+        """Passt das Layout an eine neue Fenstergröße an. Gibt True zurück, wenn sich die Feldgröße ändert."""
+        old_square_size = getattr(self, "square_size", None)
+        self.width = width
+        self.height = height
+        self.square_size = max(self.min_square_size,
+                               min(width // self.board_size, (height - self.ui_height) // self.board_size))
+        self.board_pixels = self.square_size * self.board_size
+        # Brett horizontal zentrieren, UI-Bereich direkt darunter
+        self.board_x = max(0, (width - self.board_pixels) // 2)
+        self.board_y = 0
+        self.ui_y = self.board_y + self.board_pixels
+        return self.square_size != old_square_size
+
+    def screen_to_cell(self, pos):
+        """Wandelt eine Bildschirmposition in Feldkoordinaten um (None außerhalb des Bretts)."""
+        x = pos[0] - self.board_x
+        y = pos[1] - self.board_y
+        if not (0 <= x < self.board_pixels and 0 <= y < self.board_pixels):
+            return None
+        return x // self.square_size, y // self.square_size
+
+    def cell_rect(self, x, y):
+        """Gibt das Rechteck eines Feldes relativ zum Brett zurück."""
+        return pygame.Rect(x * self.square_size, y * self.square_size, self.square_size, self.square_size)
+
+class BoardRenderer:
+    """Zeichnet das Brett mit vorgerenderten Oberflächen, die pro Feldgröße gecached werden."""
+
+    def __init__(self, asset_manager, square_size):
+        self.asset_manager = asset_manager
+        self.square_size = square_size
+        self._board_surface = None
+        self._terrain_surface = None
+        self._terrain_board = None  # Brett, für das die Terrain-Oberfläche gilt
+        self._overlays = {}  # (Farbe, Alpha) -> Surface
+        self._unit_sprites = {}  # (Einheitentyp, Spieler-ID) -> Surface
+
+    def set_square_size(self, square_size):
+        """Setzt eine neue Feldgröße und verwirft alle gecachten Oberflächen einmalig."""
+        if square_size == self.square_size:
+            return
+        self.square_size = square_size
+        self.invalidate()
+
+    def invalidate(self):
+        self._board_surface = None
+        self._terrain_surface = None
+        self._terrain_board = None
+        self._overlays.clear()
+        self._unit_sprites.clear()
+
+    def get_board_surface(self, board):
+        """Gibt das Render-Ziel für das Brett zurück (wird pro Feldgröße wiederverwendet)."""
+        size = board.size * self.square_size
+        if self._board_surface is None or self._board_surface.get_width() != size:
+            self._board_surface = pygame.Surface((size, size))
+        return self._board_surface
+
+    def draw_terrain(self, surface, board):
+        """Blittet das vorgerenderte Terrain (inklusive Symbole und Gitter)."""
+        if self._terrain_surface is None or self._terrain_board is not board:
+            self._terrain_surface = self._render_terrain(board)
+            self._terrain_board = board
+        surface.blit(self._terrain_surface, (0, 0))
+
+    def _render_terrain(self, board):
+        square_size = self.square_size
+        terrain_surface = pygame.Surface((board.size * square_size, board.size * square_size))
+        font = get_font(max(12, square_size * 36 // 60))
+        symbols = {}
+        for y in range(board.size):
+            for x in range(board.size):
+                rect = pygame.Rect(x * square_size, y * square_size, square_size, square_size)
+                terrain = board.get_terrain_at(x, y)
+
+                # Terrain-Hintergrund
+                pygame.draw.rect(terrain_surface, terrain.color, rect)
+
+                # Terrain-Symbol
+                if terrain.symbol:
+                    if terrain.symbol not in symbols:
+                        symbols[terrain.symbol] = font.render(terrain.symbol, True, (255, 255, 255))
+                    text = symbols[terrain.symbol]
+                    terrain_surface.blit(text, text.get_rect(center=rect.center))
+
+                # Gitterlinien
+                pygame.draw.rect(terrain_surface, GRID_COLOR, rect, 1)
+        return terrain_surface
+
+    def get_overlay(self, color, alpha):
+        """Gibt eine halbtransparente Feld-Markierung mit Rahmen zurück."""
+        key = (color, alpha)
+        overlay = self._overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface((self.square_size, self.square_size), pygame.SRCALPHA)
+            overlay.fill(color + (alpha,))
+            pygame.draw.rect(overlay, color, overlay.get_rect(), 3)  # Dickerer Rahmen
+            self._overlays[key] = overlay
+        return overlay
+
+    def get_unit_sprite(self, unit):
+        """Gibt das fertig zusammengesetzte Bild einer Einheit (Bild + Spielerrahmen) zurück."""
+        unit_name = unit.__class__.__name__
+        key = (unit_name, unit.player.id)
+        sprite = self._unit_sprites.get(key)
+        if sprite is None:
+            square_size = self.square_size
+            sprite = pygame.Surface((square_size, square_size), pygame.SRCALPHA)
+            rect = sprite.get_rect()
+            image = self.asset_manager.get_image(unit_name, square_size)
+            if image:
+                sprite.blit(image, (0, 0))
+            else:
+                # Fallback: Farbiges Rechteck
+                base_color = UNIT_COLORS.get(unit_name, (255, 255, 255))
+                pygame.draw.rect(sprite, base_color, rect.inflate(-8, -8))
+            player_color = PLAYER1_COLOR if unit.player.id == 1 else PLAYER2_COLOR
+            pygame.draw.rect(sprite, player_color, rect, 4)
+            self._unit_sprites[key] = sprite
+        return sprite
@@ -0,0 +1,488 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import struct
+
+from .ai_service import AIService, apply_action, snapshot_game, think
+from .game import Game
+from .spectators import SpectatorHub
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_MESSAGE_SIZE = 64 * 1024  # Nachrichten sind klein; schützt vor übergroßen Frames und Zeilen
+TOO_LARGE_RESPONSE = json.dumps({"ok": False, "message": f"Nachricht zu groß (maximal {MAX_MESSAGE_SIZE} Bytes)."})
+
+class MessageTooLarge(Exception):
+    """Zeile länger als MAX_MESSAGE_SIZE; sie wurde bis zum Zeilenende verworfen."""
+
+async def read_line(reader):
+    """
+    Wie reader.readline(), aber eine zu lange Zeile wird bis zum Zeilenende überlesen und als
+    MessageTooLarge gemeldet, damit die nächste Zeile wieder sauber beginnt.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial  # Verbindungsende
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+            continue
+        raise MessageTooLarge()
+
+def game_state(game):
+    """Gibt den Spielzustand als JSON-kompatibles Dictionary zurück."""
+    units = []
+    for player_index, player in enumerate(game.players):
+        for unit in player.units:
+            if unit.position is None:
+                continue
+            units.append({
+                "type": unit.__class__.__name__,
+                "player": player_index,
+                "x": unit.position[0],
+                "y": unit.position[1],
+                "hp": unit.health,
+                "special_used": unit.special_ability_used
+            })
+    game_over = game._check_game_over()
+    winner = None
+    if game_over:
+        winner = 0 if game.players[0].units else 1
+    return {
+        "turn": game.current_turn,
+        "units": units,
+        "arrow_storms": [list(unit.arrow_storm_target) for _, unit, _ in game.delayed_arrow_storm_effects
+                         if unit.arrow_storm_target],
+        "game_over": game_over,
+        "winner": winner
+    }
+
+class Match:
+    """Ein laufendes Spiel auf dem Server (headless Regelkern plus Sitzplätze)."""
+    __slots__ = ("match_id", "game", "seats", "ai_running", "hub", "spectators")
+
+    def __init__(self, match_id, game):
+        self.match_id = match_id
+        self.game = game
+        self.seats = [None, None]  # Verbindung pro Spieler (None = frei bzw. KI)
+        self.ai_running = False
+        self.hub = None  # SpectatorHub, wird beim ersten Zuschauer angelegt
+        self.spectators = {}  # Verbindung -> Subscriber
+
+class LineConnection:
+    """TCP-Verbindung mit zeilenweise getrennten JSON-Nachrichten."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def receive(self):
+        line = await read_line(self.reader)
+        if not line:
+            return None
+        return line.decode("utf-8")
+
+    async def send(self, text):
+        self.writer.write(text.encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def send_frame(self, match_id, frame):
+        # Binärframes als Base64 in einer JSON-Zeile (Base64 wird pro Frame nur einmal erzeugt)
+        await self.send(f'{{"event": "frame", "match": {match_id}, "data": "{frame.as_text()}"}}')
+
+    def close(self):
+        self.writer.close()
+
+class WebSocketConnection:
+    """Minimale WebSocket-Verbindung (RFC 6455, nur Text-Frames)."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def accept(cls, reader, writer, request_line):
+        """Führt den HTTP-Handshake durch. Gibt None zurück, wenn er ungültig ist."""
+        headers = {}
+        while True:
+            try:
+                line = await read_line(reader)
+            except MessageTooLarge:
+                headers = {}  # Übergroßer Header: Handshake ablehnen
+                break
+            if not line or line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if not key or headers.get("upgrade", "").lower() != "websocket":
+            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            await writer.drain()
+            return None
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode("ascii"))
+        await writer.drain()
+        return cls(reader, writer)
+
+    async def receive(self):
+        message = b""
+        while True:
+            try:
+                header = await self.reader.readexactly(2)
+                fin = header[0] & 0x80
+                opcode = header[0] & 0x0F
+                masked = header[1] & 0x80
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+                if length + len(message) > MAX_MESSAGE_SIZE:
+                    return None
+                mask = await self.reader.readexactly(4) if masked else b"\x00\x00\x00\x00"
+                payload = await self.reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return None
+            payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+            if opcode == 0x8:  # Close
+                return None
+            if opcode == 0x9:  # Ping -> Pong
+                await self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:  # Pong ignorieren
+                continue
+            message += payload
+            if fin:
+                return message.decode("utf-8")
+
+    async def send(self, text):
+        await self._send_frame(0x1, text.encode("utf-8"))
+
+    async def send_frame(self, match_id, frame):
+        await self._send_frame(0x2, frame.data)
+
+    async def _send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.writer.write(header + payload)
+        await self.writer.drain()
+
+    def close(self):
+        self.writer.close()
+
+class GameServer:
+    """
+    Asyncio-Server, der viele Spiele gleichzeitig hostet.
+    Clients verbinden sich per TCP (JSON pro Zeile) oder WebSocket.
+    KI-Züge berechnet ein AIService im Prozess-Pool, damit die Event-Loop nie blockiert.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, ai_service=None, max_matches=10000):
+        self.host = host
+        self.port = port
+        self.ai_service = ai_service if ai_service is not None else AIService()
+        self.max_matches = max_matches
+        self.matches = {}
+        self._match_ids = itertools.count(1)
+        self._connection_seats = {}  # Verbindung -> Liste von (Match-ID, Spieler)
+        self._connection_spectating = {}  # Verbindung -> Liste von Match-IDs
+        self._tasks = set()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=MAX_MESSAGE_SIZE)
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle_client(self, reader, writer):
+        too_large = False
+        try:
+            first_line = await read_line(reader)
+        except MessageTooLarge:
+            first_line, too_large = b"", True
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            return
+        if first_line.startswith(b"GET "):
+            connection = await WebSocketConnection.accept(reader, writer, first_line)
+            if connection is None:
+                writer.close()
+                return
+            pending = None
+        else:
+            connection = LineConnection(reader, writer)
+            pending = first_line.decode("utf-8") if first_line else None
+            if pending is None and not too_large:
+                writer.close()
+                return
+
+        try:
+            if too_large:
+                await connection.send(TOO_LARGE_RESPONSE)
+            while True:
+                try:
+                    text = pending if pending is not None else await connection.receive()
+                except MessageTooLarge:
+                    await connection.send(TOO_LARGE_RESPONSE)
+                    continue
+                pending = None
+                if text is None:
+                    break
+                if not text.strip():
+                    continue
+                try:
+                    message = json.loads(text)
+                    if not isinstance(message, dict):
+                        raise ValueError
+                except ValueError:
+                    await connection.send(json.dumps({"ok": False, "message": "Ungültiges JSON."}))
+                    continue
+                response = await self.handle_message(connection, message)
+                await connection.send(json.dumps(response))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._disconnect(connection)
+            connection.close()
+
+    async def handle_message(self, connection, message):
+        """Verarbeitet eine Client-Nachricht und gibt die Antwort zurück."""
+        op = message.get("op")
+        try:
+            if op == "create":
+                return self._create_match(connection, message)
+            if op == "join":
+                return self._join_match(connection, message)
+            if op == "stats":
+                return {"ok": True, "matches": len(self.matches), "ai": self.ai_service.stats()}
+
+            match = self.matches.get(message.get("match"))
+            if match is None:
+                return {"ok": False, "message": "Spiel nicht gefunden."}
+            if op == "state":
+                return {"ok": True, "state": game_state(match.game)}
+            if op == "spectate":
+                return self._spectate(connection, match)
+            if op in ("move", "attack", "special", "pass"):
+                return await self._handle_action(connection, match, op, message)
+            if op == "leave":
+                self._leave(connection, match)
+                return {"ok": True}
+        except (KeyError, TypeError, ValueError, IndexError):
+            return {"ok": False, "message": "Ungültige Nachricht."}
+        return {"ok": False, "message": f"Unbekannte Operation: {op}"}
+
+    def _create_match(self, connection, message):
+        if len(self.matches) >= self.max_matches:
+            return {"ok": False, "message": "Server ist voll."}
+        mode = message.get("mode", "multiplayer")
+        if mode not in ("multiplayer", "singleplayer"):
+            return {"ok": False, "message": "Unbekannter Spielmodus."}
+        difficulty = message.get("difficulty", "medium")
+        if difficulty not in ("easy", "medium", "hard"):
+            return {"ok": False, "message": "Unbekannte Schwierigkeit."}
+
+        game = Game(game_mode=mode, ai_difficulty=difficulty, headless=True, history_depth=0)
+        if game.ai:
+            game.ai.debug = False
+        match_id = next(self._match_ids)
+        match = Match(match_id, game)
+        self.matches[match_id] = match
+        self._take_seat(connection, match, 0)
+        return {"ok": True, "match": match_id, "player": 0, "state": game_state(game)}
+
+    def _join_match(self, connection, message):
+        match = self.matches.get(message["match"])
+        if match is None:
+            return {"ok": False, "message": "Spiel nicht gefunden."}
+        if match.game.game_mode != "multiplayer" or match.seats[1] is not None:
+            return {"ok": False, "message": "Kein freier Platz."}
+        self._take_seat(connection, match, 1)
+        self._broadcast(match, exclude=connection)
+        return {"ok": True, "match": match.match_id, "player": 1, "state": game_state(match.game)}
+
+    def _take_seat(self, connection, match, seat):
+        match.seats[seat] = connection
+        self._connection_seats.setdefault(connection, []).append((match.match_id, seat))
+
+    def _spectate(self, connection, match):
+        if connection in match.spectators:
+            return {"ok": False, "message": "Schaut bereits zu."}
+        if match.hub is None:
+            match.hub = SpectatorHub(match.game)
+        wakeup = asyncio.Event()
+        subscriber = match.hub.subscribe(notify=wakeup.set)
+        match.spectators[connection] = subscriber
+        self._connection_spectating.setdefault(connection, []).append(match.match_id)
+        self._spawn(self._spectator_loop(connection, match, subscriber, wakeup))
+        return {"ok": True, "match": match.match_id, "state": game_state(match.game)}
+
+    async def _spectator_loop(self, connection, match, subscriber, wakeup):
+        """Sendet die geteilten Frames an einen Zuschauer. Ist er zu langsam, verwirft der Hub seinen Rückstand."""
+        hub = match.hub
+        try:
+            while subscriber in hub.subscribers:
+                for frame in hub.take(subscriber):
+                    await connection.send_frame(match.match_id, frame)
+                wakeup.clear()
+                if not subscriber.queue and not subscriber.needs_keyframe:
+                    await wakeup.wait()
+        except ConnectionError:
+            pass
+
+    def _stop_spectating(self, connection, match):
+        subscriber = match.spectators.pop(connection, None)
+        if subscriber is not None:
+            match.hub.unsubscribe(subscriber)
+            subscriber.notify()  # Sendeschleife aufwecken, damit sie endet
+
+    async def _handle_action(self, connection, match, op, message):
+        game = match.game
+        if connection not in match.seats:
+            return {"ok": False, "message": "Nicht Teil dieses Spiels."}
+        seat = match.seats.index(connection)
+        if match.ai_running:
+            return {"ok": False, "message": "KI ist am Zug."}
+        if game._check_game_over():
+            return {"ok": False, "message": "Spiel ist beendet."}
+        if game.current_turn != seat:
+            return {"ok": False, "message": "Nicht am Zug."}
+
+        if op == "pass":
+            success, text = True, "Zug beendet."
+        else:
+            unit_x, unit_y = (int(value) for value in message["unit"])
+            target_x, target_y = (int(value) for value in message["target"])
+            unit = game.board.get_unit_at(unit_x, unit_y)
+            if unit is None or unit.player != game.players[seat]:
+                return {"ok": False, "message": "Ungültige Einheit."}
+            if op == "move":
+                success, text = game.attempt_move(unit, target_x, target_y)
+            elif op == "attack":
+                success, text = game.attempt_attack(unit, target_x, target_y)
+            else:
+                success, text = game.attempt_special_ability(unit, target_x, target_y)
+
+        if success:
+            game.end_turn()
+            self._broadcast(match, exclude=connection)
+            if game.ai and game.current_turn == 1 and not game._check_game_over():
+                self._spawn(self._run_ai_turn(match))
+        return {"ok": success, "message": text, "state": game_state(game)}
+
+    async def _run_ai_turn(self, match):
+        """
+        Lässt den KI-Dienst rechnen und wendet den Zug danach in der Event-Loop an.
+        Fällt der Dienst aus, rechnet die KI lokal in einem Thread; scheitert auch das, passt sie.
+        Der Zug endet in jedem Fall, damit das Spiel nicht bei der KI hängen bleibt.
+        """
+        match.ai_running = True
+        game = match.game
+        try:
+            try:
+                action = await self.ai_service.request(game, game.ai_difficulty)
+            except Exception as error:
+                print(f"KI-Dienst fehlgeschlagen (Spiel {match.match_id}): {error!r}, rechne lokal")
+                action = await self._local_ai_action(match)
+            if match.match_id in self.matches and game.current_turn == 1 and not game._check_game_over():
+                try:
+                    apply_action(game, action)
+                except Exception as error:
+                    print(f"KI-Zug nicht anwendbar (Spiel {match.match_id}): {error!r}, KI passt")
+                game.end_turn()
+        finally:
+            match.ai_running = False
+            self._broadcast(match)
+
+    async def _local_ai_action(self, match):
+        """
+        KI-Zug ohne Prozess-Pool (auf einer Kopie der Stellung). None (Passen), wenn auch das scheitert.
+        think ist threadsicher (keine Umleitung von stdout), deshalb reicht der Standard-Thread-Pool.
+        """
+        game = match.game
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, think, snapshot_game(game), game.ai_difficulty)
+        except Exception as error:
+            print(f"Lokale KI fehlgeschlagen (Spiel {match.match_id}): {error!r}, KI passt")
+            return None
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _broadcast(self, match, exclude=None):
+        """Sendet den aktuellen Zustand an alle Spieler des Spiels."""
+        text = json.dumps({"event": "state", "match": match.match_id, "state": game_state(match.game)})
+        for connection in match.seats:
+            if connection is not None and connection is not exclude:
+                self._spawn(self._safe_send(connection, text))
+        # Zuschauer: einmal kodieren, an alle verteilen
+        if match.hub is not None:
+            match.hub.update()
+
+    async def _safe_send(self, connection, text):
+        try:
+            await connection.send(text)
+        except ConnectionError:
+            pass
+
+    def _leave(self, connection, match):
+        self._stop_spectating(connection, match)
+        if connection in match.seats:
+            match.seats[match.seats.index(connection)] = None
+        if connection in self._connection_seats:
+            seats = self._connection_seats[connection]
+            self._connection_seats[connection] = [entry for entry in seats if entry[0] != match.match_id]
+        # Spiele ohne menschliche Spieler werden entfernt
+        if all(seat is None for seat in match.seats):
+            self.matches.pop(match.match_id, None)
+            for spectator in list(match.spectators):
+                self._stop_spectating(spectator, match)
+
+    def _disconnect(self, connection):
+        for match_id in self._connection_spectating.pop(connection, []):
+            match = self.matches.get(match_id)
+            if match is not None:
+                self._stop_spectating(connection, match)
+        for match_id, _ in self._connection_seats.pop(connection, []):
+            match = self.matches.get(match_id)
+            if match is not None:
+                self._leave(connection, match)
+
+def main():
+    parser = argparse.ArgumentParser(description="Blade Horse Bow Spielserver")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ai-workers", type=int, default=4, help="Prozesse für KI-Züge")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, ai_service=AIService(max_workers=args.ai_workers))
+    print(f"Server läuft auf {args.host}:{args.port}")
+    asyncio.run(server.serve_forever())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import base64
+from collections import deque
+
+from .protocol import DeltaEncoder, FRAME_KEYFRAME
+
+# Zuschauer-Verteilung: jede Zustandsänderung wird genau einmal kodiert und
+# derselbe unveränderliche Frame an alle Zuschauer weitergereicht.
+# Langsame Zuschauer, deren Warteschlange voll läuft, verlieren ihre Deltas
+# und bekommen beim nächsten Abholen stattdessen einen Keyframe.
+
+class SharedFrame:
+    """Ein kodierter Frame, den sich alle Zuschauer teilen."""
+    __slots__ = ("data", "keyframe", "_text")
+
+    def __init__(self, data, keyframe=False):
+        self.data = data  # bytes sind unveränderlich und werden nie kopiert
+        self.keyframe = keyframe
+        self._text = None
+
+    def as_text(self):
+        """Base64-Darstellung für Text-Verbindungen (wird nur einmal pro Frame erzeugt)."""
+        if self._text is None:
+            self._text = base64.b64encode(self.data).decode("ascii")
+        return self._text
+
+class Subscriber:
+    """Ein Zuschauer mit begrenzter Warteschlange."""
+    __slots__ = ("queue", "limit", "needs_keyframe", "dropped", "frames_delivered", "notify")
+
+    def __init__(self, limit, notify=None):
+        self.queue = deque()
+        self.limit = limit
+        self.needs_keyframe = True  # Neue Zuschauer starten immer mit einem Keyframe
+        self.dropped = 0
+        self.frames_delivered = 0
+        self.notify = notify  # Optional: wird aufgerufen, wenn neue Frames bereitliegen
+
+    def offer(self, frame):
+        if self.needs_keyframe:
+            return  # Deltas sind bis zur Resynchronisation wertlos
+        if len(self.queue) >= self.limit:
+            # Zu langsam: Rückstand verwerfen und später per Keyframe aufholen
+            self.queue.clear()
+            self.needs_keyframe = True
+            self.dropped += 1
+        else:
+            self.queue.append(frame)
+        if self.notify is not None:
+            self.notify()
+
+class SpectatorHub:
+    """Verteilt die Delta-Frames eines Spiels an beliebig viele Zuschauer."""
+
+    def __init__(self, game, queue_limit=64, keyframe_interval=64):
+        self.game = game
+        self.encoder = DeltaEncoder(game, keyframe_interval)
+        self.queue_limit = queue_limit
+        self.subscribers = []
+        self._keyframe = None  # (Sequenz, SharedFrame) für Resynchronisationen
+        self._listener = None
+        # Statistik
+        self.updates = 0
+        self.frames_published = 0
+        self.keyframes_built = 0
+
+    def subscribe(self, notify=None):
+        if self.encoder.frames_encoded == 0:
+            self.update()
+        subscriber = Subscriber(self.queue_limit, notify)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def attach(self):
+        """Kodiert automatisch nach jeder Zustandsänderung des Spiels."""
+        if self._listener is None:
+            self._listener = lambda game: self.update()
+            self.game.add_listener(self._listener)
+
+    def detach(self):
+        if self._listener is not None:
+            self.game.remove_listener(self._listener)
+            self._listener = None
+
+    def update(self):
+        """Kodiert die Änderungen seit dem letzten Aufruf einmal und verteilt sie. Gibt den Frame zurück."""
+        self.updates += 1
+        data = self.encoder.encode()
+        if data is None:
+            return None
+        frame = SharedFrame(data, keyframe=data[0] == FRAME_KEYFRAME)
+        if frame.keyframe:
+            self._keyframe = (self.encoder.sequence, frame)
+        self.frames_published += 1
+        for subscriber in self.subscribers:
+            subscriber.offer(frame)
+        return frame
+
+    def current_keyframe(self):
+        """Keyframe des aktuellen Stands; wird für alle wartenden Zuschauer nur einmal kodiert."""
+        sequence = self.encoder.sequence
+        if self._keyframe is None or self._keyframe[0] != sequence:
+            data = self.encoder.current_keyframe()
+            if data is None:
+                return None
+            self._keyframe = (sequence, SharedFrame(data, keyframe=True))
+            self.keyframes_built += 1
+        return self._keyframe[1]
+
+    def take(self, subscriber):
+        """Gibt die Frames zurück, die an den Zuschauer gesendet werden sollen, und leert seine Warteschlange."""
+        if subscriber.needs_keyframe:
+            keyframe = self.current_keyframe()
+            if keyframe is None:
+                return []
+            subscriber.needs_keyframe = False
+            subscriber.queue.clear()
+            frames = [keyframe]
+        else:
+            frames = list(subscriber.queue)
+            subscriber.queue.clear()
+        subscriber.frames_delivered += len(frames)
+        return frames
+
+    def encodes_per_update(self):
+        """Kodiervorgänge pro Zustandsänderung (unabhängig von der Zuschauerzahl)."""
+        return (self.encoder.frames_encoded + self.keyframes_built) / max(1, self.frames_published)
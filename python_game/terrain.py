@@ -1,4 +1,5 @@
 from enum import Enum
+from .unit_defs import PASSABLE, MOVEMENT_PENALTY, ALL_PASSABLE, NO_PENALTY
 
 class TerrainType(Enum):
     GRASS = "grass"      # Normales Gras
@@ -7,67 +8,76 @@ class TerrainType(Enum):
     FOREST = "forest"    # Wald
     HEALING = "healing"  # Heilquelle
 
+# Terrain-Codes: ein Byte pro Feld (Board.terrain_codes), Index in die Tabellen unten
+TERRAIN_TYPES = list(TerrainType)
+TERRAIN_CODE = {terrain_type: code for code, terrain_type in enumerate(TERRAIN_TYPES)}
+GRASS = TERRAIN_CODE[TerrainType.GRASS]
+
+# Eigenschaften pro Terrain-Code, einmal beim Import berechnet
+TERRAIN_COLOR = [{
+    TerrainType.GRASS: (34, 139, 34),      # Dunkelgrün
+    TerrainType.MOUNTAIN: (128, 128, 128),  # Grau
+    TerrainType.WATER: (0, 0, 255),        # Blau
+    TerrainType.FOREST: (0, 100, 0),       # Dunkelgrün
+    TerrainType.HEALING: (135, 206, 235)   # Hellblau
+}[terrain_type] for terrain_type in TERRAIN_TYPES]
+TERRAIN_SYMBOL = ["X" if terrain_type == TerrainType.MOUNTAIN else "+" if terrain_type == TerrainType.HEALING else ""
+                  for terrain_type in TERRAIN_TYPES]
+TERRAIN_PASSABLE = [PASSABLE.get(terrain_type.value, ALL_PASSABLE) for terrain_type in TERRAIN_TYPES]  # [Code][Typindex]
+TERRAIN_PENALTY = [MOVEMENT_PENALTY.get(terrain_type.value, NO_PENALTY) for terrain_type in TERRAIN_TYPES]  # [Code][Typindex]
+TERRAIN_DEFENSE = [0.75 if terrain_type == TerrainType.FOREST else 1.0 for terrain_type in TERRAIN_TYPES]  # Forest: 25% weniger Schaden
+TERRAIN_BLOCKS_SIGHT = [terrain_type == TerrainType.MOUNTAIN for terrain_type in TERRAIN_TYPES]
+TERRAIN_HEALING = [0.15 if terrain_type == TerrainType.HEALING else 0.0 for terrain_type in TERRAIN_TYPES]  # Anteil der max HP
+
 class Terrain:
-    def __init__(self, terrain_type):
-        self.terrain_type = terrain_type
-        self.color = self._get_color()
-        self.symbol = self._get_symbol()
-        
-    def _get_color(self):
-        """Gibt die Farbe für das Terrain zurück."""
-        colors = {
-            TerrainType.GRASS: (34, 139, 34),      # Dunkelgrün
-            TerrainType.MOUNTAIN: (128, 128, 128),  # Grau
-            TerrainType.WATER: (0, 0, 255),        # Blau
-            TerrainType.FOREST: (0, 100, 0),       # Dunkelgrün
-            TerrainType.HEALING: (135, 206, 235)   # Hellblau
-        }
-        return colors.get(self.terrain_type, (34, 139, 34))
-        
-    def _get_symbol(self):
-        """Gibt das Symbol für das Terrain zurück."""
-        symbols = {
-            TerrainType.GRASS: "",
-            TerrainType.MOUNTAIN: "X",
-            TerrainType.WATER: "",
-            TerrainType.FOREST: "",
-            TerrainType.HEALING: "+"
-        }
-        return symbols.get(self.terrain_type, "")
+    """
+    Unveränderliches Fliegengewicht: pro Terrain-Typ gibt es genau ein Objekt,
+    Terrain(TerrainType.X) liefert immer dasselbe. Eigenschaften kommen aus den Tabellen oben.
+    """
+    __slots__ = ("terrain_type", "code", "color", "symbol", "passable", "movement_penalty",
+                 "defense_bonus", "blocks_sight", "healing_fraction")
+    _instances = {}
+
+    def __new__(cls, terrain_type):
+        instance = cls._instances.get(terrain_type)
+        if instance is None:
+            instance = super().__new__(cls)
+            code = TERRAIN_CODE[terrain_type]
+            instance.terrain_type = terrain_type
+            instance.code = code
+            instance.color = TERRAIN_COLOR[code]
+            instance.symbol = TERRAIN_SYMBOL[code]
+            # Zeilen der Einheiten-Tabellen für dieses Terrain (pro Typindex)
+            instance.passable = TERRAIN_PASSABLE[code]
+            instance.movement_penalty = TERRAIN_PENALTY[code]
+            instance.defense_bonus = TERRAIN_DEFENSE[code]
+            instance.blocks_sight = TERRAIN_BLOCKS_SIGHT[code]
+            instance.healing_fraction = TERRAIN_HEALING[code]
+            cls._instances[terrain_type] = instance
+        return instance
+
+    def __reduce__(self):
+        return (Terrain, (self.terrain_type,))
         
     def is_passable(self, unit):
-        """Prüft, ob eine Einheit das Terrain betreten kann."""
-        if self.terrain_type == TerrainType.MOUNTAIN:
-            return False  # Berge sind unpassierbar
-        elif self.terrain_type == TerrainType.WATER:
-            # Bogenschützen können Gewässer nicht betreten
-            from .units import Archer
-            if isinstance(unit, Archer):
-                return False
-        return True
+        """Prüft, ob eine Einheit das Terrain betreten kann (Berge: niemand, Gewässer: keine Bogenschützen)."""
+        return self.passable[unit.type_index]
         
     def get_movement_penalty(self, unit):
-        """Gibt die Bewegungsstrafe für eine Einheit zurück."""
-        if self.terrain_type == TerrainType.WATER:
-            from .units import Rider
-            if isinstance(unit, Rider):
-                return 2  # Pferde werden um 2 Felder eingeschränkt
-            else:
-                return 1  # Andere Einheiten um 1 Feld
-        return 0
+        """Gibt die Bewegungsstrafe für eine Einheit zurück (Gewässer: Pferde 2 Felder, andere 1 Feld)."""
+        return self.movement_penalty[unit.type_index]
         
     def get_defense_bonus(self):
         """Gibt den Verteidigungsbonus zurück."""
-        if self.terrain_type == TerrainType.FOREST:
-            return 0.75  # 3/4 des Schadens (25% weniger Schaden)
-        return 1.0
+        return self.defense_bonus
         
     def get_healing_amount(self, unit):
         """Gibt die Heilungsmenge zurück."""
-        if self.terrain_type == TerrainType.HEALING:
-            return int(unit.max_health * 0.15)  # 15% der max HP
-        return 0
+        return int(unit.max_health * self.healing_fraction)
         
     def blocks_line_of_sight(self):
         """Prüft, ob das Terrain die Sichtlinie blockiert."""
-        return self.terrain_type == TerrainType.MOUNTAIN 
\ No newline at end of file
+        return self.blocks_sight
+
+# Fliegengewichte nach Code (TERRAINS[board.terrain_codes[i]])
+TERRAINS = [Terrain(terrain_type) for terrain_type in TERRAIN_TYPES]
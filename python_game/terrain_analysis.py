@@ -0,0 +1,202 @@
+import os
+import pickle
+import threading
+from collections import deque
+from .terrain import TerrainType
+from .unit_defs import ATTACK_RANGE
+from .mapgen import GENERATOR_VERSION, is_open
+
+# Statische Terrain-Analyse einer Karte: hängt nur vom Terrain ab, wird daher einmal pro
+# (Seed, Größe) berechnet, im Speicher gehalten und als Pickle auf der Festplatte abgelegt.
+# Wichtig: Terrain nach dem Anhängen an ein Brett (board.analysis) nicht mehr verändern.
+
+ANALYSIS_VERSION = 1  # Erhöhen, wenn sich Aufbau oder Berechnung der Analyse ändern
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_CACHE_DIR = os.path.join(os.path.dirname(PACKAGE_DIR), ".cache", "terrain")
+ATTRACTION_RADIUS = 3  # Reichweite der Anziehungskarten in Schritten
+
+_memory_cache = {}  # (Seed, Größe) -> TerrainAnalysis
+
+class TerrainAnalysis:
+    """Vorberechnete Karten für Regeln und KI (alle Karten als Reihen: karte[y][x])."""
+
+    def __init__(self, size, terrain_codes, los_range, line_of_sight, chokepoints,
+                 healing_distance, home_distance, healing_attraction, forest_attraction):
+        self.size = size
+        self.terrain_codes = terrain_codes  # bytes, ein Terrain-Code pro Feld (zum Prüfen beim Laden)
+        self.los_range = los_range
+        self.line_of_sight = line_of_sight  # bytearray, siehe has_line_of_sight
+        self.chokepoints = chokepoints  # frozenset der Engstellen (Artikulationspunkte)
+        self.healing_distance = healing_distance  # Schritte zur nächsten Heilquelle
+        self.home_distance = home_distance  # [Spielerindex] -> Schritte zur eigenen Startreihe
+        self.healing_attraction = healing_attraction  # 1.0 auf Heilquellen, nach außen abfallend
+        self.forest_attraction = forest_attraction  # 1.0 auf Wäldern, nach außen abfallend
+
+    def has_line_of_sight(self, start_x, start_y, end_x, end_y):
+        """Sichtlinie aus der Tabelle, oder None, wenn die Entfernung außerhalb der Tabelle liegt."""
+        dx = end_x - start_x
+        dy = end_y - start_y
+        los_range = self.los_range
+        if abs(dx) > los_range or abs(dy) > los_range:
+            return None
+        width = 2 * los_range + 1
+        index = ((start_y * self.size + start_x) * width + dy + los_range) * width + dx + los_range
+        return bool(self.line_of_sight[index])
+
+def _compute_line_of_sight(board, los_range):
+    # Gleiche Regel wie Board._has_line_of_sight, aber ohne Tabelle
+    size = board.size
+    blocks = [[board.terrain[y][x].blocks_line_of_sight() for x in range(size)] for y in range(size)]
+    width = 2 * los_range + 1
+    table = bytearray(size * size * width * width)
+    index = 0
+    for start_y in range(size):
+        for start_x in range(size):
+            for dy in range(-los_range, los_range + 1):
+                for dx in range(-los_range, los_range + 1):
+                    end_x = start_x + dx
+                    end_y = start_y + dy
+                    if (0 <= end_x < size and 0 <= end_y < size
+                            and not blocks[start_y][start_x] and not blocks[end_y][end_x]):
+                        step_x = (dx > 0) - (dx < 0)
+                        step_y = (dy > 0) - (dy < 0)
+                        x, y = start_x, start_y
+                        visible = True
+                        while x != end_x or y != end_y:
+                            if x != end_x:
+                                x += step_x
+                            if y != end_y:
+                                y += step_y
+                            if blocks[y][x]:
+                                visible = False
+                                break
+                        table[index] = visible
+                    index += 1
+    return table
+
+def _neighbors(size, x, y):
+    for next_y in range(max(0, y - 1), min(size, y + 2)):
+        for next_x in range(max(0, x - 1), min(size, x + 2)):
+            if next_x != x or next_y != y:
+                yield next_x, next_y
+
+def _distance_field(board, sources):
+    """Schritte (8 Nachbarn, ohne Berge) von der nächsten Quelle; None für unerreichbare Felder."""
+    size = board.size
+    distance = [[None] * size for _ in range(size)]
+    queue = deque()
+    for x, y in sources:
+        distance[y][x] = 0
+        queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for next_x, next_y in _neighbors(size, x, y):
+            if distance[next_y][next_x] is None and board.terrain[next_y][next_x].terrain_type != TerrainType.MOUNTAIN:
+                distance[next_y][next_x] = distance[y][x] + 1
+                queue.append((next_x, next_y))
+    return distance
+
+def _attraction(distance):
+    """Linear abfallende Anziehung: 1.0 auf der Quelle, 0 ab ATTRACTION_RADIUS Schritten."""
+    return [[0.0 if value is None else max(0.0, 1.0 - value / ATTRACTION_RADIUS) for value in row]
+            for row in distance]
+
+def _chokepoints(board):
+    """Artikulationspunkte des Bewegungsgraphen der offenen Felder (iterativer Tarjan)."""
+    size = board.size
+    open_cells = {(x, y) for y in range(size) for x in range(size) if is_open(board.terrain[y][x].terrain_type)}
+    discovery = {}
+    low = {}
+    articulation = set()
+    counter = 0
+    for root in sorted(open_cells):
+        if root in discovery:
+            continue
+        discovery[root] = low[root] = counter
+        counter += 1
+        root_children = 0
+        stack = [(root, None, iter(list(_neighbors(size, *root))))]
+        while stack:
+            cell, parent, neighbors = stack[-1]
+            advanced = False
+            for neighbor in neighbors:
+                if neighbor not in open_cells or neighbor == parent:
+                    continue
+                if neighbor in discovery:
+                    low[cell] = min(low[cell], discovery[neighbor])
+                else:
+                    discovery[neighbor] = low[neighbor] = counter
+                    counter += 1
+                    if cell == root:
+                        root_children += 1
+                    stack.append((neighbor, cell, iter(list(_neighbors(size, *neighbor)))))
+                    advanced = True
+                    break
+            if advanced:
+                continue
+            stack.pop()
+            if parent is not None:
+                low[parent] = min(low[parent], low[cell])
+                if parent != root and low[cell] >= discovery[parent]:
+                    articulation.add(parent)
+        if root_children > 1:
+            articulation.add(root)
+    return frozenset(articulation)
+
+def analyze(board):
+    """Berechnet die komplette Analyse für das Terrain eines Bretts."""
+    size = board.size
+    los_range = max(ATTACK_RANGE)
+    healing = [(x, y) for y in range(size) for x in range(size)
+               if board.terrain[y][x].terrain_type == TerrainType.HEALING]
+    forest = [(x, y) for y in range(size) for x in range(size)
+              if board.terrain[y][x].terrain_type == TerrainType.FOREST]
+    healing_distance = _distance_field(board, healing)
+    home_distance = [_distance_field(board, [(x, 0) for x in range(size)]),
+                     _distance_field(board, [(x, size - 1) for x in range(size)])]
+    return TerrainAnalysis(
+        size, board.terrain_codes, los_range, _compute_line_of_sight(board, los_range), _chokepoints(board),
+        healing_distance, home_distance, _attraction(healing_distance), _attraction(_distance_field(board, forest)))
+
+def _cache_path(cache_dir, seed, size):
+    name = "default" if seed is None else str(seed)
+    return os.path.join(cache_dir, f"terrain_{name}_{size}_v{GENERATOR_VERSION}.{ANALYSIS_VERSION}.pickle")
+
+def get_analysis(board, cache_dir=ANALYSIS_CACHE_DIR):
+    """
+    Gibt die Analyse für das Brett zurück: aus dem Speicher, von der Festplatte oder neu berechnet.
+    Schlüssel ist (board.terrain_seed, board.size); cache_dir=None: nur im Speicher cachen.
+    """
+    key = (board.terrain_seed, board.size)
+    codes = board.terrain_codes
+    analysis = _memory_cache.get(key)
+    if analysis is not None and analysis.terrain_codes == codes:
+        return analysis
+
+    path = _cache_path(cache_dir, *key) if cache_dir else None
+    analysis = None
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as cache_file:
+                analysis = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            analysis = None
+        # Nur verwenden, wenn das Terrain wirklich übereinstimmt
+        if not isinstance(analysis, TerrainAnalysis) or analysis.terrain_codes != codes:
+            analysis = None
+
+    if analysis is None:
+        analysis = analyze(board)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Eigene Datei pro Prozess und Thread (die Server-KI kann auch im Thread-Pool rechnen)
+                temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temporary_path, "wb") as cache_file:
+                    pickle.dump(analysis, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary_path, path)
+            except OSError as error:
+                print(f"Warnung: Terrain-Analyse konnte nicht gespeichert werden: {error}")
+
+    _memory_cache[key] = analysis
+    return analysis
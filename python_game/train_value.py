@@ -0,0 +1,169 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from .ai import AI
+from .dataset import DATASET_DIR, DRAW, Dataset
+from .game import Game
+from .tuner import MAP_POOL, MAX_TURNS
+from .value_net import VALUE_NET_PATH, ValueNet, featurize
+
+# Training des Bewertungsnetzes (value_net.py) auf der Stellungsdatenbank (dataset.py).
+# Ziel pro Stellung: Ausgang aus Sicht des Spielers am Zug (1 Sieg, -1 Niederlage, 0 Remis),
+# abgezinst mit discount ** (verbleibende Halbzüge), damit frühe Stellungen weniger sicher gelten.
+# Partien mit Spielnummer % 10 == 0 dienen der Validierung. Vergleichswert ist die Heuristik
+# (IncrementalEvaluator, im Datensatz gespeichert) als tanh(a * Bewertung) mit bestem a.
+# Optional spielt die KI mit dem Netz danach gegen die KI "hard" (beide Seiten auf jeder Karte).
+#
+# Aufruf: python3 -m python_game.train_value --epochs 20 --match 64
+
+ADAM_BETAS = (0.9, 0.999)
+ADAM_EPSILON = 1e-8
+
+def targets(records, discount):
+    """Zielwerte aus Sicht des Spielers am Zug."""
+    winner = records["winner"].astype(numpy.int64)
+    sign = numpy.where(winner == DRAW, 0.0, numpy.where(winner == records["turn"], 1.0, -1.0))
+    return (sign * discount ** records["plies_left"].astype(numpy.float64)).astype(numpy.float32)
+
+def load_records(source):
+    """Alle Datensätze als ein Array im Speicher, aufgeteilt in (Training, Validierung)."""
+    dataset = Dataset(source)
+    if not len(dataset):
+        raise ValueError(f"Keine Datensätze in {source} (zuerst python3 -m python_game.dataset).")
+    records = numpy.concatenate(dataset.shards)
+    validation = records["game"] % 10 == 0
+    return records[~validation], records[validation]
+
+def gradients(net, features, target):
+    """Mittlerer quadratischer Fehler und Gradienten je Schicht (Rückwärtsrechnung von Hand)."""
+    activations = [features]
+    for weights, bias in net.layers[:-1]:
+        activations.append(numpy.maximum(activations[-1] @ weights + bias, 0))
+    weights, bias = net.layers[-1]
+    output = numpy.tanh(activations[-1] @ weights + bias)[:, 0]
+    error = output - target
+    delta = (2 / len(target) * error * (1 - output * output))[:, None]
+    grads = []
+    for index in range(len(net.layers) - 1, -1, -1):
+        grads.append((activations[index].T @ delta, delta.sum(axis=0)))
+        if index:
+            delta = (delta @ net.layers[index][0].T) * (activations[index] > 0)
+    grads.reverse()
+    return float(numpy.mean(error * error)), grads
+
+def validation_loss(net, records, discount, batch_size=4096):
+    total = 0.0
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        error = net.forward(featurize(batch)) - targets(batch, discount)
+        total += float(numpy.sum(error * error))
+    return total / len(records)
+
+def heuristic_baseline(train, validation, discount):
+    """Validierungsfehler von tanh(a * Bewertung) mit dem auf dem Training besten a: (Fehler, a)."""
+    train_target = targets(train, discount)
+    scales = numpy.geomspace(1e-4, 1, 81)
+    losses = [numpy.mean((numpy.tanh(scale * train["evaluation"]) - train_target) ** 2) for scale in scales]
+    scale = float(scales[int(numpy.argmin(losses))])
+    error = numpy.tanh(scale * validation["evaluation"]) - targets(validation, discount)
+    return float(numpy.mean(error * error)), scale
+
+def train(train_records, validation_records, epochs=20, batch_size=256, learning_rate=1e-3, hidden=(64, 32),
+          discount=0.98, weight_decay=1e-5, seed=1):
+    """Adam über Mini-Batches; gibt das Netz mit dem kleinsten Validierungsfehler zurück."""
+    rng = numpy.random.default_rng(seed)
+    net = ValueNet.random(hidden, int(round(train_records["terrain"].shape[1] ** 0.5)), rng)
+    moments = [[numpy.zeros_like(array) for array in layer] for layer in net.layers]
+    squares = [[numpy.zeros_like(array) for array in layer] for layer in net.layers]
+    best = (validation_loss(net, validation_records, discount), [tuple(array.copy() for array in layer) for layer in net.layers])
+    step = 0
+    for epoch in range(epochs):
+        started = time.perf_counter()
+        order = rng.permutation(len(train_records))
+        train_loss = 0.0
+        for start in range(0, len(order), batch_size):
+            batch = train_records[numpy.sort(order[start:start + batch_size])]
+            loss, grads = gradients(net, featurize(batch), targets(batch, discount))
+            train_loss += loss * len(batch)
+            step += 1
+            correction = (1 - ADAM_BETAS[0] ** step, 1 - ADAM_BETAS[1] ** step)
+            for layer, layer_grads, layer_moments, layer_squares in zip(net.layers, grads, moments, squares):
+                for array, grad, moment, square in zip(layer, layer_grads, layer_moments, layer_squares):
+                    grad = grad + weight_decay * array
+                    moment *= ADAM_BETAS[0]
+                    moment += (1 - ADAM_BETAS[0]) * grad
+                    square *= ADAM_BETAS[1]
+                    square += (1 - ADAM_BETAS[1]) * grad * grad
+                    array -= learning_rate * (moment / correction[0]) / (numpy.sqrt(square / correction[1]) + ADAM_EPSILON)
+        loss = validation_loss(net, validation_records, discount)
+        if loss < best[0]:
+            best = (loss, [tuple(array.copy() for array in layer) for layer in net.layers])
+        print(f"Epoche {epoch + 1}/{epochs}: Training {train_loss / len(order):.4f}, "
+              f"Validierung {loss:.4f}, {time.perf_counter() - started:.1f}s")
+    net.layers = best[1]
+    return net, best[0]
+
+def play_value_game(task):
+    """
+    Ein Spiel (läuft im Worker): Bewertungsnetz auf Seite net_side gegen die KI "hard".
+    Gibt 1 zurück, wenn das Netz gewinnt, -1 bei Niederlage, 0 bei Remis.
+    """
+    net_path, net_side, seed = task
+    net = ValueNet.load(net_path)
+    random.seed(seed)
+    game = Game(game_mode="multiplayer", headless=True, map_seed=seed % MAP_POOL, history_depth=0)
+    ais = [AI(player, "hard") for player in game.players]
+    ais[net_side] = AI(game.players[net_side], "hard", value_net=net)
+    for ai in ais:
+        ai.debug = False
+        ai.set_game(game)
+    for _ in range(MAX_TURNS):
+        if game._check_game_over():
+            break
+        ais[game.current_turn].make_turn()
+        game.end_turn()
+    if not game.players[1 - net_side].units:
+        return 1
+    if not game.players[net_side].units:
+        return -1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Bewertungsnetz auf der Stellungsdatenbank trainieren")
+    parser.add_argument("--data", default=DATASET_DIR, help="Verzeichnis mit den Shards")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--hidden", type=int, nargs="+", default=[64, 32], help="Größen der verdeckten Schichten")
+    parser.add_argument("--discount", type=float, default=0.98, help="Abzinsung pro verbleibendem Halbzug")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=VALUE_NET_PATH, help="Zieldatei (npz)")
+    parser.add_argument("--match", type=int, default=0, help="Abschlussspiele gegen die KI \"hard\"")
+    parser.add_argument("--workers", type=int, default=4, help="Prozesse für die Abschlussspiele")
+    args = parser.parse_args()
+
+    train_records, validation_records = load_records(args.data)
+    print(f"{len(train_records)} Trainings-, {len(validation_records)} Validierungsstellungen")
+    baseline, scale = heuristic_baseline(train_records, validation_records, args.discount)
+    print(f"Heuristik tanh({scale:.4g} * Bewertung): Validierung {baseline:.4f}")
+    net, loss = train(train_records, validation_records, args.epochs, args.batch, args.learning_rate,
+                      tuple(args.hidden), args.discount, seed=args.seed)
+    net.save(args.output)
+    print(f"Netz gespeichert: {args.output} (Validierung {loss:.4f}, Heuristik {baseline:.4f})")
+
+    if args.match:
+        tasks = [(os.path.abspath(args.output), index % 2, args.seed + index // 2) for index in range(args.match)]
+        # spawn statt fork, wie im KI-Dienst
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(play_value_game, tasks))
+        print(f"Netz gegen \"hard\": {results.count(1)} Siege, {results.count(-1)} Niederlagen, "
+              f"{results.count(0)} Remis ({sum(results) / len(results):+.3f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .ai import AI
+from .ai_weights import AI_WEIGHTS_PATH, HARD_WEIGHTS, MEDIUM_WEIGHTS, AIWeights, load_weights, save_weights
+from .dataset import DRAW, GameRecorder, worker_writer
+from .game import Game
+
+# Offline-Tuner für die KI-Gewichte (SPSA, simultaneous perturbation stochastic approximation).
+# Pro Iteration wird der Gewichtsvektor in einer zufälligen ±-Richtung gestört und die beiden
+# Varianten spielen headless gegeneinander (Prozess-Pool, beide Seiten pro Karte). Das Ergebnis
+# schätzt die Steigung entlang der Richtung; der Vektor wandert in die bessere Richtung.
+# Fortschritt wird nach jeder Iteration gespeichert, ein Abbruch verliert höchstens eine Iteration.
+#
+# Aufruf: python3 -m python_game.tuner --iterations 100 --games 32 --workers 4
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIR = os.path.join(os.path.dirname(PACKAGE_DIR), ".cache", "tuning")
+TUNABLE = {"hard": HARD_WEIGHTS, "medium": MEDIUM_WEIGHTS}  # Schwierigkeit -> optimierte Gewichte
+MAX_TURNS = 200  # Danach gilt ein Spiel als unentschieden
+MAP_POOL = 16  # Anzahl verschiedener Karten (Seeds) für die Spiele
+WEIGHT_STEP = 1 / 64  # Ausgabe wird darauf gerundet: Summen in IncrementalEvaluator bleiben exakt
+
+def play_game(task):
+    """
+    Ein Selbstspiel (läuft im Worker). Gibt 1 zurück, wenn Spieler 1 gewinnt, -1 für Spieler 2, 0 bei Remis.
+    Mit record_dir werden alle Stellungen in die Stellungsdatenbank dieses Prozesses geschrieben (dataset.py).
+    """
+    first_values, second_values, difficulty, seed, record_dir = task
+    random.seed(seed)
+    map_seed = seed % MAP_POOL
+    game = Game(game_mode="multiplayer", headless=True, map_seed=map_seed, history_depth=0)
+    ais = [AI(game.players[0], difficulty, AIWeights(first_values)),
+           AI(game.players[1], difficulty, AIWeights(second_values))]
+    for ai in ais:
+        ai.debug = False
+        ai.set_game(game)
+    recorder = GameRecorder(game, seed, map_seed) if record_dir else None
+    for _ in range(MAX_TURNS):
+        if game._check_game_over():
+            break
+        if recorder:
+            recorder.before_turn()
+        ais[game.current_turn].make_turn()
+        if recorder:
+            recorder.after_turn()
+        game.end_turn()
+    if not game.players[1].units:
+        result = 1
+    elif not game.players[0].units:
+        result = -1
+    else:
+        result = 0
+    if recorder:
+        worker_writer(record_dir).write(recorder.records({1: 0, -1: 1, 0: DRAW}[result]))
+    return result
+
+def play_match(executor, weights, opponent, difficulty, games, seed, record_dir=None):
+    """Mittleres Ergebnis von weights gegen opponent in [-1, 1]; jede Karte wird mit beiden Seiten gespielt."""
+    tasks = []
+    for index in range(max(1, games // 2)):
+        game_seed = seed + index
+        tasks.append((weights.values, opponent.values, difficulty, game_seed, record_dir))
+        tasks.append((opponent.values, weights.values, difficulty, game_seed, record_dir))
+    results = list(executor.map(play_game, tasks, chunksize=max(1, len(tasks) // 32)))
+    # Ungerade Aufgaben: weights spielt als Spieler 2, Ergebnis umdrehen
+    return sum(result if index % 2 == 0 else -result for index, result in enumerate(results)) / len(results)
+
+def _round_weights(vector):
+    return [round(value / WEIGHT_STEP) * WEIGHT_STEP for value in vector]
+
+def _load_checkpoint(path, difficulty, names):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+    if checkpoint.get("difficulty") != difficulty or checkpoint.get("names") != names:
+        raise ValueError(f"Checkpoint {path} passt nicht zu den Gewichten für '{difficulty}' (--restart verwenden).")
+    return checkpoint
+
+def _save_checkpoint(path, checkpoint):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file, indent=2)
+    os.replace(temporary_path, path)
+
+def tune(executor, start_weights, difficulty="hard", iterations=100, games=32, checkpoint_path=None,
+         seed=1, step=0.2, perturbation=0.2, restart=False, record_dir=None):
+    """
+    SPSA über die Gewichte TUNABLE[difficulty]. Gibt den besten Gewichtssatz (AIWeights) zurück.
+    step/perturbation sind relativ zur Größe der Startgewichte (mindestens 1).
+    record_dir: Selbstspiele zusätzlich als Stellungsdatenbank aufzeichnen.
+    """
+    names = TUNABLE[difficulty]
+    start_vector = start_weights.to_vector(names)
+    scale = [max(abs(value), 1.0) for value in start_vector]
+    checkpoint = None if restart or checkpoint_path is None else _load_checkpoint(checkpoint_path, difficulty, names)
+    if checkpoint is None:
+        checkpoint = {"difficulty": difficulty, "names": names, "seed": seed, "iteration": 0,
+                      "start": start_vector, "theta": start_vector, "history": []}
+    theta = checkpoint["theta"]
+    stability = iterations / 10  # Übliche SPSA-Konstante A
+
+    for iteration in range(checkpoint["iteration"], iterations):
+        started = time.perf_counter()
+        rng = random.Random(f"{checkpoint['seed']}:{iteration}")  # Reproduzierbar auch nach Fortsetzen
+        direction = [rng.choice((-1, 1)) for _ in names]
+        step_size = step / (iteration + 1 + stability) ** 0.602
+        perturbation_size = perturbation / (iteration + 1) ** 0.101
+        plus = [value + perturbation_size * size * sign for value, size, sign in zip(theta, scale, direction)]
+        minus = [value - perturbation_size * size * sign for value, size, sign in zip(theta, scale, direction)]
+        result = play_match(executor, start_weights.with_vector(plus, names), start_weights.with_vector(minus, names),
+                            difficulty, games, rng.randrange(1 << 30), record_dir)
+        # Gradientenschätzung entlang der Richtung (in Einheiten von scale)
+        theta = [value + step_size * size * result / (2 * perturbation_size * sign)
+                 for value, size, sign in zip(theta, scale, direction)]
+        checkpoint["theta"] = theta
+        checkpoint["iteration"] = iteration + 1
+        checkpoint["history"].append({"iteration": iteration + 1, "result": result})
+        if checkpoint_path:
+            _save_checkpoint(checkpoint_path, checkpoint)
+        print(f"Iteration {iteration + 1}/{iterations}: Ergebnis {result:+.3f}, "
+              f"{time.perf_counter() - started:.1f}s, Gewichte {[round(value, 3) for value in theta]}")
+
+    return start_weights.with_vector(_round_weights(theta), names)
+
+def main():
+    parser = argparse.ArgumentParser(description="SPSA-Tuner für die KI-Gewichte (Selbstspiele)")
+    parser.add_argument("--difficulty", choices=sorted(TUNABLE), default="hard")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--games", type=int, default=32, help="Spiele pro Iteration (gerade Anzahl)")
+    parser.add_argument("--workers", type=int, default=4, help="Prozesse für die Selbstspiele")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--step", type=float, default=0.2, help="SPSA-Schrittweite a (relativ)")
+    parser.add_argument("--perturbation", type=float, default=0.2, help="SPSA-Störung c (relativ)")
+    parser.add_argument("--weights", default=AI_WEIGHTS_PATH, help="Startgewichte")
+    parser.add_argument("--output", default=AI_WEIGHTS_PATH, help="Zieldatei (wird beim Start der KI geladen)")
+    parser.add_argument("--checkpoint", default=None, help="Standard: .cache/tuning/spsa_<Schwierigkeit>.json")
+    parser.add_argument("--restart", action="store_true", help="Vorhandenen Checkpoint ignorieren")
+    parser.add_argument("--validate", type=int, default=64, help="Abschlussspiele gegen die Startgewichte")
+    parser.add_argument("--record", default=None, help="Verzeichnis: Selbstspiele als Stellungsdatenbank aufzeichnen")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or os.path.join(CHECKPOINT_DIR, f"spsa_{args.difficulty}.json")
+    start_weights = load_weights(args.weights)
+    # spawn statt fork, wie im KI-Dienst
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        tuned = tune(executor, start_weights, args.difficulty, args.iterations, args.games, checkpoint_path,
+                     args.seed, args.step, args.perturbation, args.restart,
+                     os.path.abspath(args.record) if args.record else None)
+        score = None
+        if args.validate:
+            score = play_match(executor, tuned, start_weights, args.difficulty, args.validate, 1 << 30)
+            print(f"Getunte gegen Startgewichte: {score:+.3f} über {args.validate} Spiele")
+
+    save_weights(tuned, args.output, info={"difficulty": args.difficulty, "iterations": args.iterations,
+                                           "games_per_iteration": args.games, "validation": score})
+    print(f"Gewichte gespeichert: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+import os
+
+# Einheitendefinitionen aus data/units.json, beim Import in flache Tabellen übersetzt.
+# Alle Tabellen werden über den Typindex einer Einheit (unit.type_index) adressiert,
+# damit Regeln, KI und Oberfläche ohne isinstance-Ketten auskommen.
+
+UNIT_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "units.json")
+
+def load_unit_data(path=UNIT_DATA_PATH):
+    with open(path, encoding="utf-8") as data_file:
+        return json.load(data_file)
+
+_data = load_unit_data()
+
+UNIT_TYPES = [unit["name"] for unit in _data["units"]]  # Typindex -> Name
+TYPE_INDEX = {name: index for index, name in enumerate(UNIT_TYPES)}
+
+# Grundwerte für die Konstruktoren
+UNIT_STATS = [
+    {"health": unit["health"], "attack_power": unit["attack_power"], "movement_speed": unit["movement_speed"]}
+    for unit in _data["units"]
+]
+
+ATTACK_RANGE = [unit["attack_range"] for unit in _data["units"]]
+# Grundschaden der Spezialfähigkeit (Pfeilregen pro Feld, Sturmangriff); 0 für Fähigkeiten ohne Schaden
+SPECIAL_DAMAGE = [unit.get("special_damage", 0) for unit in _data["units"]]
+MOVE_ORTHOGONAL = [unit["movement"]["orthogonal"] for unit in _data["units"]]
+MOVE_DIAGONAL = [unit["movement"]["diagonal"] for unit in _data["units"]]
+# Gewichtete Bewegung (pathfinding): Kosten eines Diagonalschritts, Budget = orthogonale Reichweite
+MOVE_DIAGONAL_COST = [unit["movement"]["diagonal_cost"] for unit in _data["units"]]
+NEEDS_LINE_OF_SIGHT = [unit["line_of_sight"] for unit in _data["units"]]
+
+# Modus "mehrere Einheiten pro Zug": Bewegungen und Aktionen (Angriff/Spezial) pro Einheit und Zug
+MOVES_PER_TURN = _data["turn_budget"]["moves"]
+ACTIONS_PER_TURN = _data["turn_budget"]["actions"]
+
+# Schadensmatrix: DAMAGE_MODIFIER[Angreifer][Ziel] (fehlende Paarungen: 1.0)
+DAMAGE_MODIFIER = [[1.0] * len(UNIT_TYPES) for _ in UNIT_TYPES]
+for attacker_name, modifiers in _data["damage_modifiers"].items():
+    for target_name, modifier in modifiers.items():
+        DAMAGE_MODIFIER[TYPE_INDEX[attacker_name]][TYPE_INDEX[target_name]] = modifier
+
+# KI: Bonus für Paarungen, in denen der Angreifer stark ist
+TYPE_ADVANTAGE_BONUS = [
+    [_data["type_advantage_bonus"] if modifier > 1 else 0 for modifier in row]
+    for row in DAMAGE_MODIFIER
+]
+AI_SELECT_BONUS = [unit["ai"]["select_bonus"] for unit in _data["units"]]
+THREAT_RANGE = [unit["ai"]["threat_range"] for unit in _data["units"]]
+
+# Terrain: Name des Terrain-Typs -> Liste pro Typindex (nicht aufgeführtes Terrain: passierbar, keine Strafe)
+ALL_PASSABLE = [True] * len(UNIT_TYPES)
+NO_PENALTY = [0] * len(UNIT_TYPES)
+PASSABLE = {}
+MOVEMENT_PENALTY = {}
+for terrain_name, rules in _data["terrain"].items():
+    impassable = rules.get("impassable", [])
+    PASSABLE[terrain_name] = [name not in impassable for name in UNIT_TYPES]
+    penalties = rules.get("movement_penalty", {})
+    MOVEMENT_PENALTY[terrain_name] = [penalties.get(name, 0) for name in UNIT_TYPES]
@@ -1,5 +1,11 @@
+import logging
 from abc import ABC, abstractmethod
 from enum import Enum
+from .combat import ATTACK, ARROW_STORM, CHARGE, base_damage, damage_taken, damage_event, resolve_attack, apply_events
+from .unit_defs import TYPE_INDEX, UNIT_STATS, ATTACK_RANGE, DAMAGE_MODIFIER, MOVES_PER_TURN, ACTIONS_PER_TURN, \
+    SPECIAL_DAMAGE
+
+log = logging.getLogger(__name__)  # Spielmeldungen: nur sichtbar, wenn die Oberfläche logging einrichtet (main_gui, run_game)
 
 class UnitType(Enum):
     SWORDSMAN = "Swordsman"
@@ -7,6 +13,11 @@ class UnitType(Enum):
     RIDER = "Rider"
 
 class Unit(ABC):
+    # __slots__ statt __dict__: pro Einheit nur feste Felder (große Karten haben viele Einheiten)
+    __slots__ = ("player", "health", "max_health", "attack_power", "movement_speed", "position",
+                 "special_ability_used", "unit_id", "moves_left", "actions_left")
+    type_index = None  # Index in die Tabellen aus unit_defs (pro Unterklasse gesetzt)
+
     def __init__(self, player, health, attack_power, movement_speed):
         self.player = player
         self.health = health
@@ -15,95 +26,101 @@ class Unit(ABC):
         self.movement_speed = movement_speed
         self.position = None
         self.special_ability_used = False
+        self.unit_id = None  # Wird vom Spiel vergeben (z.B. für Netzwerk-Synchronisation)
+        # Verbleibendes Budget im aktuellen Zug (nur im Modus "multi" durchgesetzt)
+        self.moves_left = MOVES_PER_TURN
+        self.actions_left = ACTIONS_PER_TURN
 
     @property
     @abstractmethod
     def unit_type(self):
         pass
 
-    @abstractmethod
     def attack(self, target_unit, board):
-        pass
+        if self.position is None or target_unit.position is None:
+            return False
+        dist_x = abs(self.position[0] - target_unit.position[0])
+        dist_y = abs(self.position[1] - target_unit.position[1])
+        distance = max(dist_x, dist_y)  # Diagonale Distanz
+        if distance <= ATTACK_RANGE[self.type_index]:
+            event, = apply_events(resolve_attack(board, self, target_unit, ATTACK))
+            log.info("%s attacked %s for %s damage.", self.__class__.__name__, target_unit.__class__.__name__, event.raw_damage)
+            return True
+        log.info("Target is not in range.")
+        return False
 
     @abstractmethod
     def use_special_ability(self, **kwargs):
         pass
+
+    def reset_turn_budget(self):
+        """Setzt Bewegungs- und Aktionsbudget zu Beginn des eigenen Zugs zurück."""
+        self.moves_left = MOVES_PER_TURN
+        self.actions_left = ACTIONS_PER_TURN
+
+    def has_turn_budget(self):
+        return self.moves_left > 0 or self.actions_left > 0
     
     def take_damage(self, damage, board=None):
-        # Berücksichtige Terrain-Verteidigungsbonus
-        if self.position is not None and board is not None:
-            terrain = board.get_terrain_at(self.position[0], self.position[1])
-            terrain_defense = terrain.get_defense_bonus()
-            damage = int(damage * terrain_defense)
-            
-        self.health -= damage
+        # Schild und Terrain-Verteidigung berechnet combat.damage_event
+        self.apply_damage_event(damage_event(board, self, damage))
+
+    def apply_damage_event(self, event):
+        """Wendet ein Schadensereignis aus combat.resolve_attack an."""
+        self.health -= event.damage
         if self.health <= 0:
             self.health = 0
             # Let the game handle removal of the unit
-            print(f"{self.__class__.__name__} from Player {self.player.id} has been defeated.")
+            log.info("%s from Player %s has been defeated.", self.__class__.__name__, self.player.id)
 
-    def get_damage_modifier(self, target_unit):
-        if self.unit_type == UnitType.SWORDSMAN and target_unit.unit_type == UnitType.RIDER:
-            return 1.5 # Strong against Rider
-        if self.unit_type == UnitType.SWORDSMAN and target_unit.unit_type == UnitType.ARCHER:
-            return 0.75 # Weak against Archer
-            
-        if self.unit_type == UnitType.ARCHER and target_unit.unit_type == UnitType.SWORDSMAN:
-            return 1.5 # Strong against Swordsman
-        if self.unit_type == UnitType.ARCHER and target_unit.unit_type == UnitType.RIDER:
-            return 0.75 # Weak against Rider
+    def shield_ready(self):
+        """Halbiert ein Schild den nächsten Treffer? (nur Schwertkämpfer)"""
+        return False
 
-        if self.unit_type == UnitType.RIDER and target_unit.unit_type == UnitType.ARCHER:
-            return 1.5 # Strong against Archer
-        if self.unit_type == UnitType.RIDER and target_unit.unit_type == UnitType.SWORDSMAN:
-            return 0.75 # Weak against Swordsman
-            
-        return 1.0
+    def predict_damage_taken(self, damage, board=None, shield=None):
+        """Berechnet den tatsächlich erlittenen Schaden ohne Seiteneffekte (wie take_damage)."""
+        # shield=None: aktuellen Schild-Zustand verwenden
+        return damage_taken(self, damage, board, shield)
+
+    def get_attack_damage(self, target_unit):
+        """Gibt den Grundschaden eines normalen Angriffs gegen target_unit zurück."""
+        return base_damage(self, target_unit, ATTACK)
+
+    def get_damage_modifier(self, target_unit):
+        return DAMAGE_MODIFIER[self.type_index][target_unit.type_index]
 
 class Swordsman(Unit):
+    __slots__ = ("shield_active", "shield_used")
+    type_index = TYPE_INDEX["Swordsman"]
+
     @property
     def unit_type(self):
         return UnitType.SWORDSMAN
 
     def __init__(self, player):
-        super().__init__(player, health=100, attack_power=30, movement_speed=2)  # 2 Felder Bewegung
+        super().__init__(player, **UNIT_STATS[self.type_index])
         self.shield_active = False
         self.shield_used = False
 
-    def attack(self, target_unit, board):
-        if self.position is None or target_unit.position is None:
-            return False
-        # Attack range is 2 (Lanze)
-        dist_x = abs(self.position[0] - target_unit.position[0])
-        dist_y = abs(self.position[1] - target_unit.position[1])
-        distance = max(dist_x, dist_y)  # Diagonale Distanz
-        if distance <= 2:
-            damage_modifier = self.get_damage_modifier(target_unit)
-            damage = self.attack_power * damage_modifier
-            target_unit.take_damage(damage, board)
-            print(f"Swordsman attacked {target_unit.__class__.__name__} for {damage} damage.")
-            return True
-        print("Target is not in range.")
-        return False
-
     def use_special_ability(self, **kwargs):
         # Shield Wall: Halve incoming damage for 1 attack
         if not self.special_ability_used:
             self.shield_active = True
             self.shield_used = False
             self.special_ability_used = True
-            print("Swordsman used Shield Wall!")
+            log.info("Swordsman used Shield Wall!")
             return True
         return False
         
-    def take_damage(self, damage, board=None):
-        if self.shield_active and not self.shield_used:
-            original_damage = damage
-            damage = damage // 2  # Halbiere den Schaden
+    def apply_damage_event(self, event):
+        if event.shield_consumed:
             self.shield_used = True
             self.shield_active = False  # Schild ist nach einem Angriff verbraucht
-            print(f"Shield absorbed damage! Reduced from {original_damage} to {damage}")
-        super().take_damage(damage, board)
+            log.info("Shield absorbed damage! Reduced from %s to %s", event.raw_damage, event.raw_damage // 2)
+        super().apply_damage_event(event)
+
+    def shield_ready(self):
+        return self.shield_active and not self.shield_used
         
     def end_turn(self):
         """Wird am Ende des Spielerzugs aufgerufen"""
@@ -111,30 +128,17 @@ class Swordsman(Unit):
         pass
 
 class Archer(Unit):
+    __slots__ = ("arrow_storm_target",)
+    type_index = TYPE_INDEX["Archer"]
+    arrow_storm_damage = SPECIAL_DAMAGE[type_index]  # Reduzierter Schaden für AOE
+
     @property
     def unit_type(self):
         return UnitType.ARCHER
 
     def __init__(self, player):
-        super().__init__(player, health=80, attack_power=25, movement_speed=1)  # 1 Feld Bewegung
+        super().__init__(player, **UNIT_STATS[self.type_index])
         self.arrow_storm_target = None
-        self.arrow_storm_damage = 20  # Reduzierter Schaden für AOE
-
-    def attack(self, target_unit, board):
-        if self.position is None or target_unit.position is None:
-            return False
-        # Attack range 6 (Bogen)
-        dist_x = abs(self.position[0] - target_unit.position[0])
-        dist_y = abs(self.position[1] - target_unit.position[1])
-        distance = max(dist_x, dist_y)  # Diagonale Distanz
-        if distance <= 6:
-            damage_modifier = self.get_damage_modifier(target_unit)
-            damage = self.attack_power * damage_modifier
-            target_unit.take_damage(damage, board)
-            print(f"Archer attacked {target_unit.__class__.__name__} for {damage} damage.")
-            return True
-        print("Target is not in range.")
-        return False
 
     def use_special_ability(self, target_x, target_y, board):
         # Arrow Storm: Hit target and adjacent fields
@@ -143,66 +147,52 @@ class Archer(Unit):
             if 0 <= target_x < board.size and 0 <= target_y < board.size:
                 self.arrow_storm_target = (target_x, target_y)
                 self.special_ability_used = True
-                print(f"Archer used Arrow Storm on ({target_x}, {target_y})!")
+                log.info("Archer used Arrow Storm on (%s, %s)!", target_x, target_y)
                 return True
             else:
-                print("Arrow Storm target is outside the board!")
+                log.info("Arrow Storm target is outside the board!")
                 return False
         return False
         
+    def get_arrow_storm_damage(self, target_unit):
+        """Gibt den Grundschaden des Pfeilregens gegen target_unit zurück."""
+        return base_damage(self, target_unit, ARROW_STORM)
+
+    def arrow_storm_hits(self, x, y):
+        """Prüft, ob der vorbereitete Pfeilregen das Feld (x, y) treffen wird."""
+        if not self.arrow_storm_target:
+            return False
+        return abs(self.arrow_storm_target[0] - x) <= 1 and abs(self.arrow_storm_target[1] - y) <= 1
+
     def execute_arrow_storm(self, board):
         """Führt den Pfeilregen aus (wird nach dem Gegnerzug aufgerufen)"""
         if not self.arrow_storm_target:
             return []
             
-        target_x, target_y = self.arrow_storm_target
+        # Ziel und alle angrenzenden Felder (3x3 Bereich), reduzierter Schaden für AOE
         targets_hit = []
-        
-        # Ziel und alle angrenzenden Felder (3x3 Bereich)
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                check_x, check_y = target_x + dx, target_y + dy
-                
-                # Prüfe Grenzen
-                if 0 <= check_x < board.size and 0 <= check_y < board.size:
-                    target_unit = board.get_unit_at(check_x, check_y)
-                    if target_unit and target_unit.player != self.player:
-                        # Reduzierter Schaden für AOE
-                        damage_modifier = self.get_damage_modifier(target_unit)
-                        damage = int(self.arrow_storm_damage * damage_modifier)
-                        target_unit.take_damage(damage, board)
-                        targets_hit.append((check_x, check_y, target_unit, damage))
-                        print(f"Arrow Storm hit {target_unit.__class__.__name__} at ({check_x}, {check_y}) for {damage} damage!")
+        for event in resolve_attack(board, self, self.arrow_storm_target, ARROW_STORM):
+            event.target.apply_damage_event(event)
+            check_x, check_y = event.position
+            targets_hit.append((check_x, check_y, event.target, event.raw_damage))
+            log.info("Arrow Storm hit %s at (%s, %s) for %s damage!", event.target.__class__.__name__, check_x, check_y, event.raw_damage)
         
         self.arrow_storm_target = None
         return targets_hit
 
 class Rider(Unit):
+    __slots__ = ("charge_target", "charge_path")
+    type_index = TYPE_INDEX["Rider"]
+    charge_damage = SPECIAL_DAMAGE[type_index]  # Erhöhter Schaden für Sturmangriff
+
     @property
     def unit_type(self):
         return UnitType.RIDER
 
     def __init__(self, player):
-        super().__init__(player, health=120, attack_power=35, movement_speed=4)  # 4 Felder Bewegung
+        super().__init__(player, **UNIT_STATS[self.type_index])
         self.charge_target = None
-        self.charge_path = []
-        self.charge_damage = 50  # Erhöhter Schaden für Sturmangriff
-
-    def attack(self, target_unit, board):
-        if self.position is None or target_unit.position is None:
-            return False
-        # Attack range 1 (Radius)
-        dist_x = abs(self.position[0] - target_unit.position[0])
-        dist_y = abs(self.position[1] - target_unit.position[1])
-        distance = max(dist_x, dist_y)  # Diagonale Distanz
-        if distance <= 1:
-            damage_modifier = self.get_damage_modifier(target_unit)
-            damage = self.attack_power * damage_modifier
-            target_unit.take_damage(damage, board)
-            print(f"Rider attacked {target_unit.__class__.__name__} for {damage} damage.")
-            return True
-        print("Target is not in range.")
-        return False
+        self.charge_path = ()  # Leeres Tupel statt Liste: keine Allokation pro Reiter
 
     def use_special_ability(self, target_x, target_y, board):
         # Charge: move unlimited distance and attack
@@ -211,10 +201,10 @@ class Rider(Unit):
                 self.charge_target = (target_x, target_y)
                 self.charge_path = self._calculate_charge_path(target_x, target_y, board)
                 self.special_ability_used = True
-                print(f"Rider used Charge on ({target_x}, {target_y})!")
+                log.info("Rider used Charge on (%s, %s)!", target_x, target_y)
                 return True
             else:
-                print("Charge target is outside the board!")
+                log.info("Charge target is outside the board!")
                 return False
         return False
         
@@ -259,17 +249,15 @@ class Rider(Unit):
         if self.charge_path:
             final_x, final_y = self.charge_path[-1]
             board.move_unit(self, final_x, final_y)
-            print(f"Rider charged to ({final_x}, {final_y})!")
+            log.info("Rider charged to (%s, %s)!", final_x, final_y)
         
         # Führe Angriff aus, falls eine gegnerische Einheit am Ziel ist
         if target_unit and target_unit.player != self.player:
-            damage_modifier = self.get_damage_modifier(target_unit)
-            damage = int(self.charge_damage * damage_modifier)
-            target_unit.take_damage(damage, board)
-            print(f"Charge hit {target_unit.__class__.__name__} for {damage} damage!")
+            event, = apply_events(resolve_attack(board, self, target_unit, CHARGE))
+            log.info("Charge hit %s for %s damage!", target_unit.__class__.__name__, event.raw_damage)
         else:
-            print("Charge completed - no enemy at target position.")
+            log.info("Charge completed - no enemy at target position.")
         
         self.charge_target = None
-        self.charge_path = []
+        self.charge_path = ()
         return True
@@ -0,0 +1,182 @@
+import os
+
+import numpy
+
+from .actions import legal_actions
+from .dataset import MAX_UNITS, NO_UNIT, position_values, record_struct, record_dtype
+from .protocol import FLAG_SPECIAL_USED, FLAG_SHIELD_ACTIVE, NO_TARGET
+from .terrain import TERRAIN_TYPES
+from .unit_defs import UNIT_TYPES, UNIT_STATS
+
+# Gelernte Stellungsbewertung (optional, braucht NumPy): ein kleines MLP schätzt aus Sicht des Spielers
+# am Zug den Ausgang (-1 Verlust bis 1 Gewinn). Die Eingabe sind Ebenen über alle Felder:
+# eigene/gegnerische Einheiten pro Typ, HP-Anteil, verfügbare Spezialfähigkeit, aktiver Schild,
+# Bereich vorbereiteter Pfeilregen und Terrain (one-hot), dazu die HP-Summen beider Seiten.
+# Für den Spieler 2 wird das Brett punktgespiegelt (die Karten sind punktsymmetrisch), damit beide
+# Seiten dieselben Gewichte nutzen. Inferenz ist reine Matrixmultiplikation über alle Kandidaten eines Zugs.
+# Training: python3 -m python_game.train_value (liest die Stellungsdatenbank aus dataset.py).
+
+VALUE_NET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "value_net.npz")
+
+TYPE_COUNT = len(UNIT_TYPES)
+# Ebenen: [Seite * TYPE_COUNT + Typ] Einheiten, danach je zwei (eigene, gegnerische) pro Eigenschaft
+HP_PLANE = 2 * TYPE_COUNT
+SPECIAL_PLANE = HP_PLANE + 2
+SHIELD_PLANE = SPECIAL_PLANE + 2
+STORM_PLANE = SHIELD_PLANE + 2
+TERRAIN_PLANE = STORM_PLANE + 2
+PLANE_COUNT = TERRAIN_PLANE + len(TERRAIN_TYPES)
+SCALAR_COUNT = 2  # HP-Summe eigene, gegnerische Einheiten (in Einheiten voller HP)
+
+MAX_HEALTH = numpy.array([stats["health"] for stats in UNIT_STATS] + [1], dtype=numpy.float32)  # + leerer Slot
+
+def feature_count(board_size=9):
+    return PLANE_COUNT * board_size * board_size + SCALAR_COUNT
+
+def featurize(records):
+    """Merkmale für ein Array von Datensätzen (dataset.record_dtype): float32 (Anzahl, feature_count)."""
+    count = len(records)
+    cells = records["terrain"].shape[1]
+    size = int(round(cells ** 0.5))
+    turn = records["turn"].astype(numpy.intp)[:, None]
+    flip = turn == 1
+    types = records["unit_type"].astype(numpy.intp)
+    valid = types != NO_UNIT
+    side = (records["unit_owner"] != turn).astype(numpy.intp)  # 0 eigene, 1 gegnerische Einheit
+    cell = records["unit_y"].astype(numpy.intp) * size + records["unit_x"]
+    cell = numpy.where(flip, cells - 1 - cell, cell)  # Punktspiegelung
+    health = records["unit_hp"] / MAX_HEALTH[numpy.where(valid, types, -1)]
+    flags = records["unit_flags"]
+
+    planes = numpy.zeros((count, PLANE_COUNT, cells), dtype=numpy.float32)
+    rows, slots = numpy.nonzero(valid)
+    unit_side = side[rows, slots]
+    unit_cell = cell[rows, slots]
+    planes[rows, unit_side * TYPE_COUNT + types[rows, slots], unit_cell] = 1
+    planes[rows, HP_PLANE + unit_side, unit_cell] = health[rows, slots]
+    planes[rows, SPECIAL_PLANE + unit_side, unit_cell] = (flags[rows, slots] & FLAG_SPECIAL_USED) == 0
+    planes[rows, SHIELD_PLANE + unit_side, unit_cell] = (flags[rows, slots] & FLAG_SHIELD_ACTIVE) != 0
+
+    # Pfeilregen: 3x3-Bereich um das Ziel
+    storm_rows, storm_slots = numpy.nonzero(valid & (records["storm_x"] != NO_TARGET))
+    if len(storm_rows):
+        storm_x = records["storm_x"][storm_rows, storm_slots].astype(numpy.intp)
+        storm_y = records["storm_y"][storm_rows, storm_slots].astype(numpy.intp)
+        storm_side = side[storm_rows, storm_slots]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                x, y = storm_x + dx, storm_y + dy
+                inside = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+                hit = numpy.where(flip[storm_rows, 0], cells - 1 - (y * size + x), y * size + x)
+                planes[storm_rows[inside], STORM_PLANE + storm_side[inside], hit[inside]] = 1
+
+    terrain = numpy.where(flip, records["terrain"][:, ::-1], records["terrain"]).astype(numpy.intp)
+    numpy.put_along_axis(planes.reshape(count, -1), TERRAIN_PLANE * cells + terrain * cells + numpy.arange(cells), 1, axis=1)
+
+    features = numpy.empty((count, feature_count(size)), dtype=numpy.float32)
+    features[:, :-SCALAR_COUNT] = planes.reshape(count, -1)
+    features[:, -2] = numpy.where(valid & (side == 0), health, 0).sum(axis=1)
+    features[:, -1] = numpy.where(valid & (side == 1), health, 0).sum(axis=1)
+    return features
+
+def position_record(game, layout):
+    """Datensatz (ohne Zug und Ausgang) der aktuellen Stellung; layout: dataset.record_struct."""
+    return layout.pack(0, 0, game.current_turn, -1, *position_values(game, MAX_UNITS), 0.0, 0, 0, 0, -1, 0)
+
+def game_records(games):
+    """Datensätze für eine Liste von Spielen, als Array für featurize."""
+    size = games[0].board.size
+    layout = record_struct(size, MAX_UNITS)
+    return numpy.frombuffer(b"".join(position_record(game, layout) for game in games), dtype=record_dtype(size, MAX_UNITS))
+
+class ValueNet:
+    """MLP mit ReLU-Schichten und tanh-Ausgang; layers: Liste von (Gewichte, Bias) als float32."""
+
+    def __init__(self, layers, board_size=9):
+        self.layers = layers
+        self.board_size = board_size
+
+    @classmethod
+    def random(cls, hidden=(64, 32), board_size=9, rng=None):
+        """Neues Netz mit He-Initialisierung (für das Training)."""
+        rng = rng or numpy.random.default_rng()
+        sizes = [feature_count(board_size), *hidden, 1]
+        layers = [((rng.standard_normal((inputs, outputs)) * numpy.sqrt(2 / inputs)).astype(numpy.float32),
+                   numpy.zeros(outputs, dtype=numpy.float32))
+                  for inputs, outputs in zip(sizes, sizes[1:])]
+        return cls(layers, board_size)
+
+    def forward(self, features):
+        """Bewertungen (Anzahl,) für eine Merkmalsmatrix, alle Stellungen in einem Durchgang."""
+        values = features
+        for weights, bias in self.layers[:-1]:
+            values = numpy.maximum(values @ weights + bias, 0)
+        weights, bias = self.layers[-1]
+        return numpy.tanh(values @ weights + bias)[:, 0]
+
+    def evaluate_records(self, records):
+        """Bewertung aus Sicht des jeweiligen Spielers am Zug."""
+        return self.forward(featurize(records))
+
+    def evaluate_games(self, games):
+        return self.evaluate_records(game_records(games))
+
+    def best_action(self, game):
+        """Aktion mit der besten Bewertung nach einem Halbzug (None: Passen), siehe search_action."""
+        return search_action(game, self.evaluate_records)
+
+    def save(self, path=VALUE_NET_PATH):
+        arrays = {"board_size": numpy.array(self.board_size)}
+        for index, (weights, bias) in enumerate(self.layers):
+            arrays[f"w{index}"] = weights
+            arrays[f"b{index}"] = bias
+        temporary_path = f"{path}.{os.getpid()}.tmp.npz"
+        numpy.savez_compressed(temporary_path, **arrays)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path=VALUE_NET_PATH):
+        with numpy.load(path) as arrays:
+            layers = []
+            while f"w{len(layers)}" in arrays:
+                layers.append((arrays[f"w{len(layers)}"], arrays[f"b{len(layers)}"]))
+            board_size = int(arrays["board_size"])
+        if layers[0][0].shape[0] != feature_count(board_size):
+            raise ValueError(f"{path} passt nicht zu den Merkmalen (neu trainieren).")
+        return cls(layers, board_size)
+
+def load_value_net(path=VALUE_NET_PATH):
+    """Gespeichertes Netz oder None, wenn keins trainiert wurde."""
+    if not os.path.exists(path):
+        return None
+    return ValueNet.load(path)
+
+def search_action(game, evaluate_records):
+    """
+    Probiert jede Aktion (und Passen) des Spielers am Zug per make/unmake auf dem Spiel selbst aus
+    und bewertet alle Folgestellungen gemeinsam: evaluate_records(Datensätze) liefert Werte aus Sicht
+    des dann ziehenden Gegners. Gibt die beste Action zurück, None für Passen.
+    """
+    size = game.board.size
+    layout = record_struct(size, MAX_UNITS)
+    mover = game.current_turn
+    history = game.history
+    candidates = legal_actions(game) + [None]
+    values = numpy.empty(len(candidates), dtype=numpy.float32)
+    open_games = []
+    records = []
+    with history.simulation():
+        for index, action in enumerate(candidates):
+            history.make(action)
+            if not game.players[1 - mover].units:
+                values[index] = 2  # Gewinn: besser als jede Bewertung
+            elif not game.players[mover].units:
+                values[index] = -2
+            else:
+                open_games.append(index)
+                records.append(position_record(game, layout))
+            history.unmake()
+    if open_games:
+        values[open_games] = -numpy.asarray(evaluate_records(
+            numpy.frombuffer(b"".join(records), dtype=record_dtype(size, MAX_UNITS))))
+    return candidates[int(numpy.argmax(values))]
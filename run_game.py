@@ -1,5 +1,7 @@
+import logging
 from python_game.game import Game
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     game = Game()
     game.start_game() 
\ No newline at end of file